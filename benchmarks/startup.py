@@ -0,0 +1,104 @@
+"""Startup-time benchmark for DataCoolSim.
+
+Measures, each in a fresh interpreter:
+
+- cold import of the compute core (must not load PyQt6),
+- time to the first window from the source tree,
+- time to the first window when resources come from a PyInstaller bundle
+  (``sys._MEIPASS`` pointing at a directory holding the images).
+
+Run with ``python benchmarks/startup.py``. The GUI runs use the offscreen Qt
+platform unless QT_QPA_PLATFORM is already set. Pass ``--max-core-import`` or
+``--max-first-window`` (seconds) to fail when a median exceeds a budget.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_IMPORT = """
+import sys, time
+t = time.perf_counter()
+import main
+import datacool.batch
+elapsed = time.perf_counter() - t
+assert not any(name.startswith("PyQt6") for name in sys.modules), "core import loaded PyQt6"
+print(elapsed)
+"""
+
+FIRST_WINDOW = """
+import sys, time
+t = time.perf_counter()
+meipass = {meipass!r}
+if meipass:
+    sys._MEIPASS = meipass
+from PyQt6.QtWidgets import QApplication
+from datacool.gui import DataCenterSimulator
+app = QApplication([])
+window = DataCenterSimulator()
+app.processEvents()
+elapsed = time.perf_counter() - t
+pixmap = window.pixmaps.get(window.current_image_path)
+assert pixmap is not None and not pixmap.isNull(), "image not loaded from " + window.current_image_path
+print(elapsed)
+"""
+
+
+def run_snippet(code, repeat):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", code], cwd=tempfile.gettempdir(), env=env,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--max-core-import", type=float)
+    parser.add_argument("--max-first-window", type=float)
+    args = parser.parse_args(argv)
+
+    results = {"core_import": run_snippet(CORE_IMPORT, args.repeat)}
+    results["first_window"] = run_snippet(FIRST_WINDOW.format(meipass=""), args.repeat)
+    bundle = tempfile.mkdtemp(prefix="datacool_meipass_")
+    try:
+        for name in ("image.png", "image_air.png"):
+            shutil.copy(os.path.join(ROOT, name), bundle)
+        results["first_window_bundle"] = run_snippet(FIRST_WINDOW.format(meipass=bundle), args.repeat)
+    finally:
+        shutil.rmtree(bundle)
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for name, seconds in results.items():
+            print(f"{name:22s} {seconds * 1000:8.1f} ms")
+
+    failed = False
+    if args.max_core_import is not None and results["core_import"] > args.max_core_import:
+        print(f"core import exceeded {args.max_core_import} s", file=sys.stderr)
+        failed = True
+    if args.max_first_window is not None:
+        for name in ("first_window", "first_window_bundle"):
+            if results[name] > args.max_first_window:
+                print(f"{name} exceeded {args.max_first_window} s", file=sys.stderr)
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
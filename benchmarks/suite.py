@@ -0,0 +1,251 @@
+"""Benchmark suite for the cooling calculators and the GUI hot paths.
+
+Each benchmark reports the best time per operation over several repeats and
+is compared against ``baselines.json`` next to this file. A benchmark more
+than ``--threshold`` slower than its baseline is flagged and the run exits
+with status 1, so a nightly job can fail on physics changes that slow the
+fleet runs down.
+
+    python benchmarks/suite.py                 # compare against the baselines
+    python benchmarks/suite.py --save          # record new baselines
+    python benchmarks/suite.py -k scalar       # only benchmarks matching "scalar"
+
+GUI benchmarks use the offscreen Qt platform unless QT_QPA_PLATFORM is set,
+and are skipped when PyQt6 is not installed. Baselines are machine specific:
+record them on the machine that runs the comparison.
+"""
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from datacool.calculations import CoolingCalculations  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+BENCHMARKS = {}
+
+IMMERSION_RACK = dict(tCoolant=25, n=20, SA=0.5, L=200, tau=0, D=5, insulation="Standard Fiberglass",
+                      fluidType="3M Novec 7000", Q=0.05, Aflow=0.00785, Lchar=0.01, val=1)
+AIR_RACK = dict(tAmbient=25, n=20, l=200, fanAirflow=0.085, fanEfficiency=0.55, dustAmount=0.1,
+                heatSinkEfficiency=0.75, heatSinkSA=1.2)
+
+
+def benchmark(name, number=1, repeat=5, gui=False, factory=False):
+    """Register ``func(state)`` as a benchmark; ``number`` operations per timed call.
+
+    With ``factory`` the decorated function is instead called once before
+    timing and returns ``(setup, func)``; ``setup()`` builds the state passed
+    to each timed ``func(state)`` call.
+    """
+    def register(func):
+        prepare = func if factory else (lambda: (None, func))
+        BENCHMARKS[name] = {"prepare": prepare, "number": number, "repeat": repeat, "gui": gui}
+        return func
+    return register
+
+
+def measure(func, setup, number, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        func(state)
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+@benchmark("scalar_immersion_energy", number=2000)
+def scalar_immersion_energy(_):
+    for _ in range(2000):
+        CoolingCalculations.calculateICoolingEnergy(L_pipe=20, **IMMERSION_RACK)
+
+
+@benchmark("scalar_air_energy", number=2000)
+def scalar_air_energy(_):
+    for _ in range(2000):
+        CoolingCalculations.calculateACoolingEnergy(duct_length=20, duct_diameter=0.1, **AIR_RACK)
+
+
+@benchmark("scalar_server_temp", number=20000)
+def scalar_server_temp(_):
+    for _ in range(20000):
+        CoolingCalculations.calculateServerTemp(**IMMERSION_RACK)
+
+
+@benchmark("scalar_ac_server_temp", number=20000)
+def scalar_ac_server_temp(_):
+    for _ in range(20000):
+        CoolingCalculations.calculateACServerTemp(**AIR_RACK)
+
+
+def _random_racks(count, cooling_type, seed=0):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    if cooling_type == "Immersion":
+        return {"load": rng.uniform(50, 500, count), "coolant_temp": rng.uniform(15, 40, count),
+                "flow_rate": rng.uniform(0.01, 0.1, count), "val": rng.integers(1, 13, count)}
+    return {"load": rng.uniform(50, 500, count), "ambient_temp": rng.uniform(15, 40, count),
+            "fan_efficiency": rng.uniform(0.3, 0.9, count)}
+
+
+def _batch(cooling_type):
+    from datacool.batch import evaluate_racks
+    racks = _random_racks(100000, cooling_type)
+    return (lambda: racks), (lambda racks: evaluate_racks(racks, cooling_type))
+
+
+@benchmark("batch_immersion_100k", factory=True)
+def batch_immersion_100k():
+    return _batch("Immersion")
+
+
+@benchmark("batch_air_100k", factory=True)
+def batch_air_100k():
+    return _batch("Air")
+
+
+class _Gui:
+    app = None
+
+    @classmethod
+    def window(cls, rows, columns):
+        from PyQt6.QtWidgets import QApplication
+        from datacool.gui import DataCenterSimulator
+        if cls.app is None:
+            cls.app = QApplication.instance() or QApplication([])
+        window = DataCenterSimulator()
+        window.rows_spin.setValue(rows)
+        window.columns_spin.setValue(columns)
+        window.resize_floor()
+        cls.app.processEvents()
+        return window
+
+    @classmethod
+    def settle(cls):
+        from PyQt6.QtCore import QThreadPool
+        QThreadPool.globalInstance().waitForDone()
+        cls.app.processEvents()
+
+
+def _calculate_efficiency(count, rows, columns):
+    from datacool.layout import rack_id
+    from datacool.cache import ResultCache
+    window = _Gui.window(rows, columns)
+    rng = random.Random(count)
+    for i in range(count):
+        col, row = divmod(i, rows)
+        window.rack_data[rack_id(col, row)] = {"load": rng.uniform(50, 500), "coolant_temp": rng.uniform(15, 40)}
+
+    def setup():
+        # Start every repeat cold: nothing cached, every rack needing a result.
+        window.result_cache = ResultCache(maxsize=max(4096, count))
+        window.result_table.invalidate()
+        return window
+
+    def run(window):
+        window.calculate_efficiency()
+        _Gui.settle()
+    return setup, run
+
+
+for _count, _rows, _columns in ((60, 12, 5), (1000, 100, 10), (100000, 1000, 100)):
+    benchmark(f"gui_calculate_efficiency_{_count}", repeat=3 if _count > 1000 else 5, gui=True, factory=True)(
+        functools.partial(_calculate_efficiency, _count, _rows, _columns))
+
+
+@benchmark("gui_apply_to_all_100k", gui=True, factory=True)
+def _apply_to_all():
+    window = _Gui.window(1000, 100)
+    window.rack_clicked("B7")
+    window.save_data()
+    return (lambda: window), (lambda window: window.apply_to_all())
+
+
+@benchmark("gui_resize_drag", number=50, repeat=3, gui=True, factory=True)
+def _resize():
+    window = _Gui.window(12, 5)
+    window.showNormal()
+    _Gui.app.processEvents()
+
+    def run(window):
+        for i in range(50):
+            window.resize(900 + 6 * i, 700 + 4 * i)
+            _Gui.app.processEvents()
+        window.resize_timer.stop()
+        window.update_image()
+    return (lambda: window), run
+
+
+def run_benchmarks(pattern=None):
+    results = {}
+    for name, spec in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        if spec["gui"]:
+            try:
+                import PyQt6.QtWidgets  # noqa: F401
+            except ImportError:
+                print(f"{name:32s} skipped (PyQt6 not installed)")
+                continue
+        setup, func = spec["prepare"]()
+        results[name] = measure(func, setup, spec["number"], spec["repeat"])
+    return results
+
+
+def compare(results, baselines, threshold):
+    """Print each result against its baseline; returns the names that regressed."""
+    regressions = []
+    for name, seconds in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            print(f"{name:32s} {seconds * 1e3:12.4f} ms   (no baseline)")
+            continue
+        ratio = seconds / baseline
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:32s} {seconds * 1e3:12.4f} ms   {ratio:6.2f}x baseline{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DataCoolSim benchmark suite")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baselines")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown that counts as a regression (default 0.25)")
+    parser.add_argument("--baselines", default=BASELINE_FILE)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.pattern)
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+    regressions = compare(results, baselines, args.threshold)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.save:
+        baselines.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
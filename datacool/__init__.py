@@ -0,0 +1,9 @@
+"""Compute core of DataCoolSim.
+
+Nothing in this package imports PyQt except datacool.gui, which only the
+desktop launcher (main.py) loads.
+"""
+from datacool.batch import BatchCoolingCalculations, evaluate_racks
+from datacool.store import RackStore
+
+__all__ = ["BatchCoolingCalculations", "RackStore", "evaluate_racks"]
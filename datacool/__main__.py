@@ -0,0 +1,5 @@
+import sys
+
+from datacool.cli import main
+
+sys.exit(main())
@@ -0,0 +1,215 @@
+"""Vectorized versions of the CoolingCalculations formulas.
+
+Every argument may be a scalar or an array. Arrays broadcast against each
+other, so a single call evaluates a whole hall of racks in one pass.
+"""
+import numpy as np
+
+from datacool.friction import friction_factor
+from datacool.instrument import count, span
+from datacool.layout import parse_rack_id
+from datacool.properties import CP, MU, RHO, get_registry
+
+# rack_data key -> (keyword of the calculation, default used by calculate_efficiency)
+IMMERSION_FIELDS = {
+    "coolant_temp": ("tCoolant", 25),
+    "server_count": ("n", 20),
+    "surface_area": ("SA", 0.5),
+    "load": ("L", 200),
+    "run_time": ("tau", 0),
+    "distance": ("D", 5),
+    "insulation_type": ("insulation", "Standard Fiberglass"),
+    "fluid_type": ("fluidType", "3M Novec 7000"),
+    "flow_rate": ("Q", 0.05),
+    "flow_area": ("Aflow", 0.00785),
+}
+AIR_FIELDS = {
+    "ambient_temp": ("tAmbient", 25),
+    "server_count": ("n", 20),
+    "load": ("l", 200),
+    "fan_airflow": ("fanAirflow", 0.085),
+    "fan_efficiency": ("fanEfficiency", 0.55),
+    "dust_amount": ("dustAmount", 0.1),
+    "heat_sink_efficiency": ("heatSinkEfficiency", 0.75),
+    "heat_sink_sa": ("heatSinkSA", 1.2),
+}
+IMMERSION_CONSTANTS = {"Lchar": 0.01, "L_pipe": 20}
+AIR_CONSTANTS = {"duct_length": 20, "duct_diameter": 0.1, "safety_margin": True,
+                 "chiller_cop": 3.0, "electricity_cost": 0.15}
+
+IMMERSION_OUTPUTS = ("server_temp", "pump_power", "heat_exchanger_power", "total_cooling_energy", "annual_cost")
+AIR_OUTPUTS = ("server_temp", "fan_power", "chiller_power", "total_cooling_energy", "annual_cost")
+_DECIMALS = {"server_temp": 1}
+
+
+def rack_row(rack_ids):
+    """Row numbers from rack ids such as "A12" or "AB3"."""
+    ids = np.asarray(rack_ids)
+    if ids.dtype.kind in "iuf":
+        return ids
+    return np.array([parse_rack_id(r)[1] + 1 for r in ids.ravel()], dtype=np.int64).reshape(ids.shape)
+
+
+def wrap_row(val):
+    """Position within a 12-rack column, which is what the immersion model sees."""
+    val = np.asarray(val)
+    return np.where(val > 12, (val - 1) % 12 + 1, val)
+
+
+def finish_results(results, outputs, rounded):
+    """Mask every output of racks with any non-finite output as NaN, add ``valid`` and round if asked."""
+    valid = np.ones(np.shape(results[outputs[0]]), dtype=bool)
+    for key in outputs:
+        valid &= np.isfinite(results[key])
+    for key in outputs:
+        value = np.where(valid, results[key], np.nan)
+        results[key] = np.round(value, _DECIMALS.get(key, 2)) if rounded else value
+    results["valid"] = valid
+    return results
+
+
+class BatchCoolingCalculations:
+    """Array counterparts of CoolingCalculations.
+
+    The energy functions return a dict of arrays with the same keys as the
+    scalar versions plus a boolean ``valid`` mask. Rows the scalar code would
+    raise on are NaN and marked invalid.
+    """
+
+    @staticmethod
+    def calculateServerTemp(tCoolant, n, SA, L, tau, D, insulation, fluidType, Q, Aflow, Lchar, val):
+        registry = get_registry()
+        with span("batch.properties"):
+            Cp = registry.lookup(registry.fluid_code(fluidType), tCoolant, CP)
+        fAgeT = 1 + 0.03 + np.asarray(tau) / 8760
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return tCoolant + (L / (Q * 100 * Cp)) * fAgeT + wrap_row(val) / 2
+
+    @staticmethod
+    def calculateACServerTemp(tAmbient, n, l, fanAirflow, fanEfficiency, dustAmount, heatSinkEfficiency, heatSinkSA):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ((tAmbient + (n * l)) / (1232.5 * (l * fanAirflow) * fanEfficiency * (1 - dustAmount))) * (heatSinkEfficiency * l * heatSinkSA)
+
+    @staticmethod
+    def calculateICoolingEnergy(tCoolant, n, SA, L, tau, D, insulation, fluidType, Q, Aflow, Lchar, val, L_pipe, epsilon=0.0001, pump_efficiency=0.65, safety_margin=True, electricity_cost=0.15, rounded=True):
+        server_temp = BatchCoolingCalculations.calculateServerTemp(
+            tCoolant, n, SA, L, tau, D, insulation,
+            fluidType, Q, Aflow, Lchar, val
+        )
+        registry = get_registry()
+        with span("batch.properties"):
+            fluid = registry.fluid_code(fluidType)
+            p = registry.lookup(fluid, tCoolant, RHO)
+            mu = registry.lookup(fluid, tCoolant, MU)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            velocity = np.asarray(Q) / Aflow
+            Re = (p * velocity * Lchar) / mu
+            Re = np.where(Re == 0, np.nan, Re)
+            with span("batch.friction"):
+                f = friction_factor(Re, epsilon / np.asarray(D, dtype=float))
+            deltaP = f * (L_pipe / np.asarray(D, dtype=float)) * 0.5 * p * velocity**2
+            pump_power = (Q * deltaP) / (pump_efficiency * 1000)
+        total_heat = np.asarray(n) * L
+        heat_exchanger_power = total_heat * 0.10
+        total_energy = pump_power + heat_exchanger_power
+        total_energy = np.where(safety_margin, total_energy * 1.25, total_energy)
+        annual_cost = total_energy * 24 * 365 * electricity_cost
+        results = {
+            'server_temp': server_temp,
+            'pump_power': pump_power,
+            'heat_exchanger_power': heat_exchanger_power,
+            'total_cooling_energy': total_energy,
+            'annual_cost': annual_cost,
+        }
+        results = {key: np.broadcast_to(value, np.broadcast_shapes(*(np.shape(v) for v in results.values())))
+                   for key, value in results.items()}
+        return finish_results(results, IMMERSION_OUTPUTS, rounded)
+
+    @staticmethod
+    def calculateACoolingEnergy(tAmbient, n, l, fanAirflow, fanEfficiency, dustAmount, heatSinkEfficiency, heatSinkSA, duct_length, duct_diameter, duct_roughness=0.0001, safety_margin=True, chiller_cop=3.0, electricity_cost=0.15, rounded=True):
+        server_temp = BatchCoolingCalculations.calculateACServerTemp(tAmbient, n, l, fanAirflow, fanEfficiency, dustAmount, heatSinkEfficiency, heatSinkSA)
+        duct_diameter = np.asarray(duct_diameter, dtype=float)
+        registry = get_registry()
+        air = registry.codes["Air"]
+        with span("batch.properties"):
+            rho_air = registry.lookup(air, tAmbient, RHO)
+            mu_air = registry.lookup(air, tAmbient, MU)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            A_duct = np.pi * (duct_diameter / 2)**2
+            velocity = fanAirflow / A_duct
+            Re = (rho_air * velocity * duct_diameter) / mu_air
+            Re = np.where(Re == 0, np.nan, Re)
+            with span("batch.friction"):
+                f = friction_factor(Re, duct_roughness / duct_diameter)
+            delta_p = f * (duct_length / duct_diameter) * 0.5 * rho_air * velocity**2
+            fan_power = (fanAirflow * delta_p) / fanEfficiency
+            total_heat = np.asarray(n) * l
+            chiller_power = total_heat / chiller_cop
+        total_energy = fan_power + chiller_power
+        total_energy = np.where(safety_margin, total_energy * 1.25, total_energy)
+        annual_cost = total_energy * 24 * 365 * electricity_cost
+        results = {
+            'server_temp': server_temp,
+            'fan_power': fan_power,
+            'chiller_power': chiller_power,
+            'total_cooling_energy': total_energy,
+            'annual_cost': annual_cost,
+        }
+        results = {key: np.broadcast_to(value, np.broadcast_shapes(*(np.shape(v) for v in results.values())))
+                   for key, value in results.items()}
+        return finish_results(results, AIR_OUTPUTS, rounded)
+
+
+def _column(racks, name, default):
+    try:
+        return np.asarray(racks[name])
+    except (KeyError, ValueError, IndexError):
+        return default
+
+
+def rack_arguments(racks, cooling_type):
+    """Keyword arguments for the batch energy functions from rack columns.
+
+    ``racks`` may be a dict of columns, a NumPy structured array or a pandas
+    DataFrame using the rack_data field names. Missing columns fall back to the
+    defaults used by calculate_efficiency.
+    """
+    if cooling_type == "Immersion":
+        kwargs = {param: _column(racks, field, default) for field, (param, default) in IMMERSION_FIELDS.items()}
+        val = _column(racks, "val", None)
+        if val is None:
+            rack_ids = _column(racks, "rack_id", None)
+            if rack_ids is None:
+                raise ValueError("Immersion racks need a 'rack_id' or 'val' column")
+            val = rack_row(rack_ids)
+        kwargs["val"] = val
+        kwargs.update(IMMERSION_CONSTANTS)
+    else:
+        kwargs = {param: _column(racks, field, default) for field, (param, default) in AIR_FIELDS.items()}
+        kwargs.update(AIR_CONSTANTS)
+    return kwargs
+
+
+def default_arguments(cooling_type, rack=None):
+    """Model keyword arguments for a single rack, defaulting to an untouched rack A1."""
+    racks = {"rack_id": "A1"}
+    racks.update(rack or {})
+    return rack_arguments(racks, cooling_type)
+
+
+def evaluate_arguments(arguments, cooling_type, rounded=True):
+    """Run the batch energy function for ``cooling_type`` on model keyword arguments."""
+    with span("batch.evaluate"):
+        if cooling_type == "Immersion":
+            results = BatchCoolingCalculations.calculateICoolingEnergy(rounded=rounded, **arguments)
+        else:
+            results = BatchCoolingCalculations.calculateACoolingEnergy(rounded=rounded, **arguments)
+    count("racks_evaluated", results["valid"].size)
+    return results
+
+
+def evaluate_racks(racks, cooling_type, rounded=True, **overrides):
+    """Evaluate every rack in ``racks`` with one vectorized call."""
+    kwargs = rack_arguments(racks, cooling_type)
+    kwargs.update(overrides)
+    return evaluate_arguments(kwargs, cooling_type, rounded)
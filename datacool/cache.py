@@ -0,0 +1,84 @@
+"""Result cache for rack evaluations.
+
+Racks are keyed by their normalized inputs plus cooling type, so racks with
+identical configurations (e.g. after "Apply Current Rack to All") are computed
+once and share one cached result.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from datacool.batch import AIR_FIELDS, AIR_OUTPUTS, IMMERSION_FIELDS, IMMERSION_OUTPUTS, wrap_row, evaluate_racks
+from datacool.instrument import count
+from datacool.store import CATEGORICAL_FIELDS
+
+def column_keys(columns, cooling_type):
+    """Hashable normalized inputs of every rack in ``columns``.
+
+    ``columns`` is the output of RackStore.columns: numbers are compared as
+    floats and fluid and insulation as registry codes. Immersion racks also
+    depend on their row within a 12-rack column, so that position is part of
+    the key.
+    """
+    fields = IMMERSION_FIELDS if cooling_type == "Immersion" else AIR_FIELDS
+    values = [np.asarray(columns[field], dtype=float if field not in CATEGORICAL_FIELDS else None).tolist()
+              for field in fields]
+    if cooling_type == "Immersion":
+        values.append(wrap_row(columns["val"]).tolist())
+    return [(cooling_type,) + key for key in zip(*values)]
+
+
+class ResultCache:
+    """Least-recently-used mapping from column_keys entries to result dicts."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+def evaluate_cached(columns, cooling_type, cache):
+    """Result dicts for the racks in ``columns``, computing only uncached configurations.
+
+    All misses are evaluated together in one batch call, once per distinct key.
+    Returns one dict with the model outputs and ``valid`` per rack, in order.
+    """
+    outputs = IMMERSION_OUTPUTS if cooling_type == "Immersion" else AIR_OUTPUTS
+    keys = column_keys(columns, cooling_type)
+    results = [cache.get(key) for key in keys]
+    missing = {}
+    for i, key in enumerate(keys):
+        if results[i] is None:
+            missing.setdefault(key, i)
+    count("racks_from_cache", len(keys) - len(missing))
+    if missing:
+        index = np.fromiter(missing.values(), dtype=np.intp, count=len(missing))
+        batch = evaluate_racks({name: np.asarray(column)[index] for name, column in columns.items()}, cooling_type)
+        values = {key: batch[key].tolist() for key in outputs + ("valid",)}
+        for i, key in enumerate(missing):
+            result = {name: column[i] for name, column in values.items()}
+            cache.put(key, result)
+            missing[key] = result
+    return [result if result is not None else missing[key] for key, result in zip(keys, results)]
@@ -0,0 +1,108 @@
+"""Scalar cooling models, one rack per call.
+
+See datacool.batch for the vectorized counterparts used for whole halls.
+"""
+import math
+
+from datacool.friction import friction_factor
+from datacool.instrument import count, span, timed
+from datacool.properties import fluid_properties, material_property
+
+
+class CoolingCalculations:
+    @staticmethod
+    def calculateServerTemp(tCoolant, n, SA, L, tau, D, insulation, fluidType, Q, Aflow, Lchar, val):
+        if val > 12:
+            mult = (val - (val % 12))/12
+            val = val - 12 * (mult)
+            if val == 0:
+                val = 12
+        else:
+            val = val
+        with span("properties"):
+            fluid = fluid_properties(fluidType, tCoolant)
+            D0 = material_property(insulation, "D0")
+        k = fluid["k"]
+        Cp = fluid["Cp"]
+        p = fluid["rho"]
+        mu = fluid["mu"]
+        if D0 is not None:
+            FdD = math.exp(-D/D0)
+        FaN = 0.75
+        A0 = SA * 2
+        AeFF = FaN * A0 * n
+        fAgeT = 1 + 0.03 + (tau/8760)
+        Lchar = A0 * 0.1
+        return tCoolant + (L/(Q*100*Cp))*(fAgeT) + (val/2)
+
+    @staticmethod
+    def calculateACServerTemp(tAmbient, n, l, fanAirflow, fanEfficiency, dustAmount, heatSinkEfficiency, heatSinkSA):
+        return ((tAmbient + (n*l))/(1232.5 * (l*fanAirflow) * fanEfficiency * (1-dustAmount))) * (heatSinkEfficiency * l * heatSinkSA)
+
+    @staticmethod
+    @timed("calculateICoolingEnergy", "compute")
+    def calculateICoolingEnergy(tCoolant, n, SA, L, tau, D, insulation, fluidType, Q, Aflow, Lchar, val, L_pipe, epsilon=0.0001, pump_efficiency=0.65, safety_margin=True):
+        server_temp = CoolingCalculations.calculateServerTemp(
+            tCoolant, n, SA, L, tau, D, insulation, 
+            fluidType, Q, Aflow, Lchar, val
+        )
+        count("racks_evaluated")
+        with span("properties"):
+            fluid = fluid_properties(fluidType, tCoolant)
+        p = fluid["rho"]
+        mu = fluid["mu"]
+        velocity = Q / Aflow
+        Re = (p * velocity * Lchar) / mu
+        if Re == 0:
+            raise ValueError("Reynolds number cannot be zero")
+        with span("friction"):
+            f = float(friction_factor(Re, epsilon/D))
+        deltaP = f * (L_pipe/D) * 0.5 * p * velocity**2
+        pump_power = (Q * deltaP) / (pump_efficiency * 1000)
+        total_heat = n * L  
+        heat_exchanger_power = total_heat * 0.10
+        total_energy = pump_power + heat_exchanger_power
+        if safety_margin:
+            total_energy *= 1.25
+        annual_cost = total_energy * 24 * 365 * 0.15
+        
+        return {
+            'server_temp': round(server_temp, 1),
+            'pump_power': round(pump_power, 2),
+            'heat_exchanger_power': round(heat_exchanger_power, 2),
+            'total_cooling_energy': round(total_energy, 2),
+            'annual_cost': round(annual_cost, 2)
+        }
+
+    @staticmethod
+    @timed("calculateACoolingEnergy", "compute")
+    def calculateACoolingEnergy(tAmbient, n, l, fanAirflow, fanEfficiency, dustAmount, heatSinkEfficiency, heatSinkSA, duct_length, duct_diameter, duct_roughness=0.0001, safety_margin=True, chiller_cop=3.0, electricity_cost=0.15):
+        server_temp = CoolingCalculations.calculateACServerTemp(tAmbient, n, l, fanAirflow, fanEfficiency, dustAmount, heatSinkEfficiency, heatSinkSA)
+        count("racks_evaluated")
+        with span("properties"):
+            air = fluid_properties("Air", tAmbient)
+        rho_air = air["rho"]
+        mu_air = air["mu"]
+        A_duct = math.pi * (duct_diameter/2)**2
+        velocity = fanAirflow / A_duct
+        Re = (rho_air * velocity * duct_diameter) / mu_air
+        if Re == 0:
+            raise ValueError("Reynolds number cannot be zero")
+        with span("friction"):
+            f = float(friction_factor(Re, duct_roughness/duct_diameter))
+        delta_p = f * (duct_length/duct_diameter) * 0.5 * rho_air * velocity**2
+        fan_power = (fanAirflow * delta_p) / (fanEfficiency)
+        total_heat = n * l
+        chiller_power = total_heat / chiller_cop
+        total_energy = fan_power + chiller_power
+        if safety_margin:
+            total_energy *= 1.25
+        annual_cost = total_energy * 24 * 365 * electricity_cost
+        
+        return {
+            'server_temp': round(server_temp, 1),
+            'fan_power': round(fan_power, 2),
+            'chiller_power': round(chiller_power, 2),
+            'total_cooling_energy': round(total_energy, 2),
+            'annual_cost': round(annual_cost, 2)
+        }
@@ -0,0 +1,325 @@
+"""Headless command line entry point: ``python -m datacool run racks.csv``.
+
+Rack inventories are streamed in fixed-size chunks, so memory stays constant
+no matter how many rows the input has. This module must never import PyQt.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+
+import numpy as np
+
+from datacool import instrument
+from datacool.batch import AIR_FIELDS, AIR_OUTPUTS, IMMERSION_FIELDS, IMMERSION_OUTPUTS, evaluate_racks
+from datacool.export import FORMATS, detect_format, open_writer
+from datacool.layout import parse_rack_id
+from datacool.scenario import SITE, Scenario, run_scenarios
+
+TEXT_FIELDS = ("insulation_type", "fluid_type")
+COOLING_TYPES = {"immersion": "Immersion", "air": "Air"}
+DEFAULT_SCENARIOS = ("air:air", "immersion:immersion")
+
+
+def numbered_rows(stream, fmt):
+    """Yield ``(line number, row dict)`` per rack; a JSON line that is not an object gives ``None``."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+
+
+def read_rows(stream, fmt):
+    """Yield one dict per rack from a CSV or JSON Lines stream."""
+    for _, row in numbered_rows(stream, fmt):
+        yield row
+
+
+def iter_chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def row_error(row, cooling_type):
+    """Why ``row`` cannot be evaluated under ``cooling_type``, or None if it can."""
+    if not isinstance(row, dict):
+        return "not a JSON object"
+    fields = IMMERSION_FIELDS if cooling_type == "Immersion" else AIR_FIELDS
+    for field in [*fields, "val"]:
+        value = row.get(field)
+        if field in TEXT_FIELDS or value is None or value == "":
+            continue
+        try:
+            float(value)
+        except (TypeError, ValueError):
+            return f"{field} is not a number: {value!r}"
+    if cooling_type == "Immersion" and row.get("val") in (None, "") and row.get("rack_id") not in (None, ""):
+        try:
+            parse_rack_id(row["rack_id"])
+        except ValueError as e:
+            return str(e)
+    return None
+
+
+def _row_position(row):
+    """Row number the immersion model sees: ``val``, else the rack id's row, else 1."""
+    if row.get("val") not in (None, ""):
+        return row["val"]
+    if row.get("rack_id") not in (None, ""):
+        return parse_rack_id(row["rack_id"])[1] + 1
+    return 1
+
+
+def chunk_columns(chunk, cooling_type):
+    """Turn a list of row dicts into the column dict expected by evaluate_racks.
+
+    Immersion rows without ``val`` take the row of their ``rack_id``, or 1
+    when they have neither. A row that cannot be read raises ValueError
+    naming its (one-based) position in ``chunk``.
+    """
+    try:
+        return _columns(chunk, cooling_type)
+    except (AttributeError, TypeError, ValueError):
+        for index, row in enumerate(chunk):
+            error = row_error(row, cooling_type)
+            if error:
+                raise ValueError(f"Rack {index + 1}: {error}") from None
+        raise
+
+
+def _columns(chunk, cooling_type):
+    fields = IMMERSION_FIELDS if cooling_type == "Immersion" else AIR_FIELDS
+    columns = {}
+    for field, (_, default) in fields.items():
+        values = [row.get(field) for row in chunk]
+        values = [default if v is None or v == "" else v for v in values]
+        if field in TEXT_FIELDS:
+            columns[field] = values
+        else:
+            columns[field] = np.array(values, dtype=float)
+    if all(row.get("rack_id") not in (None, "") for row in chunk):
+        columns["rack_id"] = [row["rack_id"] for row in chunk]
+    if cooling_type == "Immersion":
+        columns["val"] = np.array([_row_position(row) for row in chunk], dtype=float)
+    elif all(row.get("val") not in (None, "") for row in chunk):
+        columns["val"] = np.array([row["val"] for row in chunk], dtype=float)
+    return columns
+
+
+def _evaluate_chunk(rows, cooling_type, outputs):
+    """Output columns of ``rows`` (None where invalid) and ``{index: error}`` of the rows that cannot be read."""
+    errors = {}
+    good = rows
+    try:
+        columns = chunk_columns(rows, cooling_type)
+    except ValueError:
+        # Only a chunk that fails as a whole is checked row by row.
+        errors = {index: error for index, row in enumerate(rows) if (error := row_error(row, cooling_type))}
+        good = [row for index, row in enumerate(rows) if index not in errors]
+        columns = chunk_columns(good, cooling_type)
+    results = evaluate_racks(columns, cooling_type) if good else {"valid": False}
+    valid = np.broadcast_to(results["valid"], (len(good),))
+    output_columns = {}
+    for key in outputs:
+        values = np.where(valid, np.broadcast_to(results[key], (len(good),)), None).tolist() if good else []
+        if errors:
+            values = iter(values)
+            values = [None if index in errors else next(values) for index in range(len(rows))]
+        output_columns[key] = values
+    return output_columns, errors
+
+
+def run(input_stream, output_stream, cooling_type="Immersion", in_format="csv", out_format="csv", chunk_size=10000,
+        error_stream=None):
+    """Evaluate every rack in ``input_stream`` and write results as they are produced.
+
+    Rows that cannot be read get empty outputs and are reported with their
+    line number on ``error_stream`` (stderr by default). Returns the number
+    of rows written.
+    """
+    error_stream = sys.stderr if error_stream is None else error_stream
+    outputs = IMMERSION_OUTPUTS if cooling_type == "Immersion" else AIR_OUTPUTS
+    header = ["rack_id", *outputs]
+    writer = open_writer(output_stream, header, out_format)
+    count = 0
+    try:
+        for chunk in iter_chunks(numbered_rows(input_stream, in_format), chunk_size):
+            rows = [row for _, row in chunk]
+            columns, errors = _evaluate_chunk(rows, cooling_type, outputs)
+            for index, error in errors.items():
+                print(f"line {chunk[index][0]}: {error}", file=error_stream)
+            columns["rack_id"] = [row.get("rack_id", count + i) if row is not None else count + i
+                                  for i, row in enumerate(rows)]
+            writer.write_chunk(columns)
+            output_stream.flush()
+            count += len(chunk)
+    finally:
+        writer.close()
+    return count
+
+
+def parse_scenario(spec):
+    """``name:cooling[,key=value...]`` -> (name, cooling type, overrides, capital cost)."""
+    name, _, rest = spec.partition(":")
+    cooling, *settings = rest.split(",")
+    if not name or cooling.strip().lower() not in COOLING_TYPES:
+        raise ValueError(f"Scenario {spec!r} is not name:immersion or name:air")
+    overrides = {}
+    for setting in settings:
+        key, _, value = setting.partition("=")
+        key, value = key.strip(), value.strip()
+        if not key or not value:
+            raise ValueError(f"Scenario {name!r}: setting {setting.strip()!r} is not key=value")
+        try:
+            overrides[key] = float(value)
+        except ValueError:
+            overrides[key] = value
+    capital_cost = overrides.pop("capital_cost", 0.0)
+    if isinstance(capital_cost, str):
+        raise ValueError(f"Scenario {name!r}: capital_cost is not a number: {capital_cost!r}")
+    return name, COOLING_TYPES[cooling.strip().lower()], overrides, capital_cost
+
+
+def compare(input_stream, output_stream, specs=DEFAULT_SCENARIOS, baseline=None, in_format="csv", out_format="csv",
+            workers=None):
+    """Evaluate the inventory under every scenario and write the delta table; returns its row count.
+
+    Racks with a ``hall`` field are compared hall by hall, with a site total.
+    Raises ValueError for unreadable rows, bad scenarios and scenarios with
+    no rack valid in both it and the baseline.
+    """
+    parsed = [parse_scenario(spec) for spec in specs]
+    cooling_types = {p[1] for p in parsed}
+    rows = []
+    for line, row in numbered_rows(input_stream, in_format):
+        for cooling_type in cooling_types:
+            error = row_error(row, cooling_type)
+            if error:
+                raise ValueError(f"line {line}: {error}")
+        rows.append(row)
+    columns = {cooling_type: chunk_columns(rows, cooling_type) for cooling_type in cooling_types}
+    scenarios = [Scenario(name, cooling_type, columns[cooling_type], overrides, capital_cost)
+                 for name, cooling_type, overrides, capital_cost in parsed]
+    halls = [str(row.get("hall") or SITE) for row in rows] if any(row.get("hall") for row in rows) else None
+    table = run_scenarios(scenarios, halls, workers=workers).delta_table(baseline)
+    for row in table:
+        if row["hall"] == SITE and rows and row["invalid_racks"] == row["racks"]:
+            raise ValueError(f"Scenario {row['scenario']!r} has no rack valid in both it and {row['baseline']!r}")
+    header = list(table[0]) if table else ["scenario", "baseline", "hall"]
+    writer = open_writer(output_stream, header, out_format)
+    try:
+        writer.write_chunk({key: [row[key] for row in table] for key in header})
+    finally:
+        writer.close()
+    return len(table)
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m datacool", description="Headless DataCoolSim tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="evaluate a rack inventory")
+    run_parser.add_argument("input", help="CSV or JSON Lines rack inventory, '-' for stdin")
+    run_parser.add_argument("-o", "--output", default="-", help="result file, '-' for stdout (default)")
+    run_parser.add_argument("--cooling", choices=["immersion", "air"], default="immersion")
+    run_parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    run_parser.add_argument("--output-format", choices=FORMATS)
+    run_parser.add_argument("--chunk-size", type=positive_int, default=10000)
+    run_parser.add_argument("--profile", metavar="PATH",
+                            help="record timings and write them to PATH (Chrome trace if it ends in .trace.json)")
+    compare_parser = commands.add_parser("compare", help="compare cooling scenarios on the same racks")
+    compare_parser.add_argument("input", help="CSV or JSON Lines rack inventory, '-' for stdin")
+    compare_parser.add_argument("-o", "--output", default="-", help="delta table file, '-' for stdout (default)")
+    compare_parser.add_argument("-s", "--scenario", action="append", metavar="NAME:COOLING[,KEY=VALUE...]",
+                                help="scenario to evaluate, repeatable (default: air and immersion)")
+    compare_parser.add_argument("--baseline", help="scenario the others are compared with (default: the first)")
+    compare_parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    compare_parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    compare_parser.add_argument("--output-format", choices=FORMATS)
+    serve_parser = commands.add_parser("serve", help="answer calculation requests over local HTTP/JSON")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--workers", type=int, help="worker processes (default: one per core, 0: none)")
+    serve_parser.add_argument("--max-batch", type=int, default=4096, help="most racks evaluated in one batch")
+    serve_parser.add_argument("--max-delay", type=float, default=2.0,
+                              help="milliseconds a request may wait for others to batch with (default 2)")
+    return parser
+
+
+def _open(path, mode):
+    if path == "-":
+        stream = sys.stdin if "r" in mode else sys.stdout
+        return stream.buffer if "b" in mode else stream
+    return open(path, mode) if "b" in mode else open(path, mode, newline="")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "run":
+        cooling_type = COOLING_TYPES[args.cooling]
+        in_format = args.input_format or ("jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv")
+        out_format = detect_format(args.output, args.output_format)
+        input_stream = _open(args.input, "r")
+        output_stream = _open(args.output, "wb" if out_format == "parquet" else "w")
+        if args.profile:
+            instrument.enable()
+        try:
+            count = run(input_stream, output_stream, cooling_type, in_format, out_format, args.chunk_size)
+        except BrokenPipeError:
+            # The reader went away (e.g. piped into head). Point stdout at devnull
+            # so the interpreter does not complain again while flushing on exit.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        finally:
+            if input_stream is not sys.stdin:
+                input_stream.close()
+            if output_stream not in (sys.stdout, sys.stdout.buffer):
+                output_stream.close()
+        if args.profile:
+            instrument.dump(args.profile)
+        print(f"Evaluated {count} racks", file=sys.stderr)
+    elif args.command == "compare":
+        in_format = args.input_format or ("jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv")
+        out_format = detect_format(args.output, args.output_format)
+        input_stream = _open(args.input, "r")
+        output_stream = _open(args.output, "wb" if out_format == "parquet" else "w")
+        try:
+            count = compare(input_stream, output_stream, args.scenario or DEFAULT_SCENARIOS, args.baseline,
+                            in_format, out_format, args.workers)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        finally:
+            if input_stream is not sys.stdin:
+                input_stream.close()
+            if output_stream not in (sys.stdout, sys.stdout.buffer):
+                output_stream.close()
+        print(f"Compared {count} scenario rows", file=sys.stderr)
+    elif args.command == "serve":
+        from datacool.service import serve
+        serve(args.host, args.port, workers=args.workers, max_batch=args.max_batch, max_delay=args.max_delay / 1000)
+    return 0
@@ -0,0 +1,162 @@
+"""Facility-level thermal coupling between racks.
+
+The single-rack models see every rack in isolation; the only positional effect
+is the immersion model's row term. Here the temperature rise of each rack
+(server temperature above its coolant or ambient inlet) also picks up a share
+of its neighbours' rise:
+
+- ``neighbor``: the racks on either side in the same column (recirculation
+  over and around the rack);
+- ``aisle``: the rack facing it across the hot aisle, and half that for the
+  two diagonal ones. Columns face each other in pairs, A|B, C|D, ...;
+- ``loop``: the rack just upstream on a shared coolant loop. Loops run along a
+  column in segments of ``loop_length`` racks, which is what the row term
+  (row number wrapped at 12) stood in for.
+
+With rises ``x``, uncoupled rises ``x0`` and coupling weights ``W`` the hall
+satisfies ``x = x0 + W x``. W has a handful of entries per rack, so it is kept
+in coordinate form and the system is solved by fixed-point (Jacobi)
+iteration, one sparse product per step. Each rack's weights must sum to less
+than one, which makes the iteration converge geometrically.
+"""
+import numpy as np
+
+from datacool.batch import evaluate_arguments, rack_arguments
+from datacool.layout import parse_rack_id
+
+COUPLING_DEFAULTS = {
+    "Immersion": {"neighbor": 0.02, "aisle": 0.0, "loop": 0.15},
+    "Air": {"neighbor": 0.03, "aisle": 0.08, "loop": 0.0},
+}
+LOOP_LENGTH = 12
+
+
+def _keys(col, row):
+    return (np.asarray(col, dtype=np.int64) << 32) | np.asarray(row, dtype=np.int64)
+
+
+class CouplingMatrix:
+    """Sparse square matrix in coordinate form: ``weights[k]`` couples rack ``rows[k]`` to ``cols[k]``."""
+
+    def __init__(self, size, rows, cols, weights):
+        self.size = size
+        self.rows = rows
+        self.cols = cols
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.weights)
+
+    def dot(self, x):
+        return np.bincount(self.rows, weights=self.weights * x[self.cols], minlength=self.size)
+
+    def row_sums(self):
+        return np.bincount(self.rows, weights=self.weights, minlength=self.size)
+
+
+def coupling_matrix(col, row, neighbor=0.02, aisle=0.05, loop=0.1, loop_length=LOOP_LENGTH):
+    """Coupling between the racks at zero-based positions ``(col[i], row[i])``.
+
+    Positions without a rack simply contribute nothing, so any subset of a
+    floor of any size works.
+    """
+    col = np.asarray(col, dtype=np.int64)
+    row = np.asarray(row, dtype=np.int64)
+    size = len(col)
+    if not size:
+        return CouplingMatrix(0, np.zeros(0, np.intp), np.zeros(0, np.intp), np.zeros(0))
+    keys = _keys(col, row)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    partner = col + np.where(col % 2 == 0, 1, -1)
+    links = [(col, row - 1, neighbor), (col, row + 1, neighbor),
+             (partner, row, aisle), (partner, row - 1, aisle / 2), (partner, row + 1, aisle / 2)]
+    if loop:
+        # Upstream rack on the same loop; the first rack of a segment has none.
+        links.append((np.where(row % loop_length == 0, -1, col), row - 1, loop))
+
+    rows, cols, weights = [], [], []
+    for other_col, other_row, weight in links:
+        if not weight:
+            continue
+        other = _keys(other_col, other_row)
+        position = np.minimum(np.searchsorted(sorted_keys, other), size - 1)
+        found = (other_col >= 0) & (other_row >= 0) & (sorted_keys[position] == other)
+        rows.append(np.flatnonzero(found))
+        cols.append(order[position[found]])
+        weights.append(np.full(int(found.sum()), weight, dtype=float))
+    if not rows:
+        return CouplingMatrix(size, np.zeros(0, np.intp), np.zeros(0, np.intp), np.zeros(0))
+    return CouplingMatrix(size, np.concatenate(rows), np.concatenate(cols), np.concatenate(weights))
+
+
+def solve_coupling(matrix, rise, tolerance=1e-6, max_iterations=1000):
+    """Solve ``x = rise + matrix x``; returns ``(x, iterations)``.
+
+    Stops once no rack changes by more than ``tolerance`` kelvin. NaN rises
+    (invalid racks) are treated as zero for their neighbours.
+    """
+    if len(matrix) and matrix.row_sums().max() >= 1:
+        raise ValueError("Coupling weights of a rack must sum to less than 1")
+    rise = np.asarray(rise, dtype=float)
+    source = np.nan_to_num(rise)
+    x = source.copy()
+    for iteration in range(1, max_iterations + 1):
+        updated = source + matrix.dot(x)
+        change = np.max(np.abs(updated - x), initial=0.0)
+        x = updated
+        if change <= tolerance:
+            break
+    return np.where(np.isnan(rise), np.nan, x), iteration
+
+
+def rack_positions(racks, cooling_type):
+    """Zero-based ``(col, row, racks)`` of racks located by ``col``/``row`` columns or ``rack_id``.
+
+    ``racks`` may be a column dict, a NumPy structured array or a DataFrame,
+    as for ``rack_arguments``. Immersion racks located only by position get
+    the model's ``val`` row from it, so the returned racks are ready for
+    ``rack_arguments``.
+    """
+    names = getattr(getattr(racks, "dtype", None), "names", None)
+    if names is not None:
+        racks = {name: racks[name] for name in names}
+    if "col" in racks and "row" in racks:
+        col, row = np.asarray(racks["col"]), np.asarray(racks["row"])
+    else:
+        coords = np.array([parse_rack_id(r) for r in racks["rack_id"]], dtype=np.int64).reshape(-1, 2)
+        col, row = coords[:, 0], coords[:, 1]
+    if cooling_type == "Immersion" and "val" not in racks and "rack_id" not in racks:
+        racks = dict(racks, val=np.asarray(row) + 1)
+    return col, row, racks
+
+
+def coupled_temperatures(racks, cooling_type, row_term=False, tolerance=1e-6, **weights):
+    """Server temperatures of every rack with rack-to-rack coupling.
+
+    ``racks`` holds columns as for ``evaluate_racks`` and must locate each
+    rack (see ``rack_positions``), either by ``col``/``row`` columns (as
+    ``RackStore.columns()`` gives) or by ``rack_id``. Coupling weights default to COUPLING_DEFAULTS for the
+    cooling type. Unless ``row_term`` is set, the immersion model's own row
+    term is left out, since the loop coupling replaces it.
+
+    Returns a dict with ``server_temp``, ``uncoupled_temp``, ``valid`` and
+    the number of ``iterations`` taken.
+    """
+    col, row, racks = rack_positions(racks, cooling_type)
+    arguments = rack_arguments(racks, cooling_type)
+    if cooling_type == "Immersion":
+        if not row_term:
+            arguments["val"] = 0
+        inlet = arguments["tCoolant"]
+    else:
+        inlet = arguments["tAmbient"]
+    results = evaluate_arguments(arguments, cooling_type, rounded=False)
+    uncoupled = np.broadcast_to(results["server_temp"], (len(col),))
+    inlet = np.broadcast_to(np.asarray(inlet, dtype=float), (len(col),))
+
+    matrix = coupling_matrix(col, row, **dict(COUPLING_DEFAULTS[cooling_type], **weights))
+    rise, iterations = solve_coupling(matrix, uncoupled - inlet, tolerance)
+    valid = np.broadcast_to(results["valid"], (len(col),))
+    return {"server_temp": np.where(valid, inlet + rise, np.nan), "uncoupled_temp": uncoupled.copy(),
+            "valid": valid.copy(), "iterations": iterations}
@@ -0,0 +1,100 @@
+"""Chunked result writers for CSV, JSON Lines and Parquet.
+
+Writers take one chunk of columns at a time (a dict of equal-length lists),
+so callers never hold a whole document in memory. Parquet needs the optional
+pyarrow package, which is imported only when a Parquet file is written.
+"""
+import csv
+import json
+
+FORMATS = ("csv", "jsonl", "parquet")
+TEXT_COLUMNS = ("rack_id", "error", "scenario", "baseline", "hall")
+
+
+def detect_format(path, fmt=None):
+    """Output format from an explicit choice or the file extension; CSV otherwise."""
+    if fmt:
+        return fmt
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if path.endswith((".parquet", ".pq")):
+        return "parquet"
+    return "csv"
+
+
+class CsvWriter:
+    def __init__(self, stream, header):
+        self.header = list(header)
+        self.writer = csv.writer(stream)
+        self.writer.writerow(self.header)
+
+    def write_chunk(self, columns):
+        rows = zip(*(columns[name] for name in self.header))
+        self.writer.writerows(["" if v is None else v for v in row] for row in rows)
+
+    def close(self):
+        pass
+
+
+class JsonlWriter:
+    def __init__(self, stream, header):
+        self.header = list(header)
+        self.stream = stream
+
+    def write_chunk(self, columns):
+        rows = zip(*(columns[name] for name in self.header))
+        self.stream.writelines(json.dumps(dict(zip(self.header, row))) + "\n" for row in rows)
+
+    def close(self):
+        pass
+
+
+class ParquetWriter:
+    """Writes each chunk as one row group; text columns are strings, the rest float64."""
+
+    def __init__(self, stream, header):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs the pyarrow package") from None
+        self.pa = pa
+        self.header = list(header)
+        self.schema = pa.schema([(name, pa.string() if name in TEXT_COLUMNS else pa.float64())
+                                 for name in self.header])
+        self.writer = pq.ParquetWriter(stream, self.schema)
+
+    def write_chunk(self, columns):
+        arrays = []
+        for field in self.schema:
+            values = columns[field.name]
+            if field.name in TEXT_COLUMNS:
+                values = [None if v is None else str(v) for v in values]
+            arrays.append(self.pa.array(values, type=field.type))
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+def open_writer(stream, header, fmt):
+    """Writer for ``fmt``; Parquet needs a binary stream or a path, the others a text stream."""
+    return WRITERS[fmt](stream, header)
+
+
+def write_chunks(chunks, path, header, fmt=None):
+    """Stream an iterable of column chunks to ``path``; returns the number of rows written."""
+    fmt = detect_format(path, fmt)
+    count = 0
+    with open(path, "wb" if fmt == "parquet" else "w", newline=None if fmt == "parquet" else "") as stream:
+        writer = open_writer(stream, header, fmt)
+        try:
+            for columns in chunks:
+                writer.write_chunk(columns)
+                count += len(columns[header[0]])
+        finally:
+            writer.close()
+    return count
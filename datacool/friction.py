@@ -0,0 +1,128 @@
+"""Darcy friction factor for pipes and ducts.
+
+Regimes are handled explicitly: laminar flow (Re < 2300) uses 64/Re,
+turbulent flow (Re > 4000) the Colebrook equation, and the transitional band
+in between blends the two linearly in Re. Colebrook can be solved exactly by
+Newton iteration or read from a precomputed (Re, relative roughness) table for
+bulk work. Everything operates on whole arrays.
+"""
+import functools
+import math
+
+import numpy as np
+
+LAMINAR_RE = 2300.0
+TURBULENT_RE = 4000.0
+
+# Extent of the precomputed Colebrook table, in log10 units.
+TABLE_LOG_RE = (math.log10(TURBULENT_RE) - 0.1, 8.0)
+TABLE_LOG_RR = (-8.0, -1.0)
+TABLE_SHAPE = (512, 512)
+
+
+def swamee_jain(Re, rel_roughness):
+    """Explicit approximation of Colebrook, used as the starting guess."""
+    return 0.25 / np.log10(rel_roughness / 3.7 + 5.74 / Re**0.9) ** 2
+
+
+def colebrook(Re, rel_roughness, tol=1e-12, max_iter=20):
+    """Exact Colebrook friction factor by vectorized Newton iteration on 1/sqrt(f)."""
+    Re = np.asarray(Re, dtype=float)
+    a = np.asarray(rel_roughness, dtype=float) / 3.7
+    b = 2.51 / Re
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = 1 / np.sqrt(swamee_jain(Re, rel_roughness))
+        for _ in range(max_iter):
+            inner = a + b * x
+            g = x + 2 * np.log10(inner)
+            step = g / (1 + 2 * b / (inner * math.log(10)))
+            x = x - step
+            if not np.any(np.abs(step) > tol * np.abs(x)):
+                break
+        return 1 / x**2
+
+
+class ColebrookTable:
+    """Colebrook solutions on a log-spaced (Re, relative roughness) grid.
+
+    Values are stored as 1/sqrt(f), which is nearly linear in log10(Re), and
+    read back by bilinear interpolation. Inputs outside the grid are clamped;
+    relative roughness below 1e-8 is hydraulically smooth anyway.
+    """
+
+    def __init__(self, log_re=TABLE_LOG_RE, log_rr=TABLE_LOG_RR, shape=TABLE_SHAPE):
+        self.log_re = np.linspace(*log_re, shape[0])
+        self.log_rr = np.linspace(*log_rr, shape[1])
+        Re, rr = np.meshgrid(10**self.log_re, 10**self.log_rr, indexing="ij")
+        self.values = 1 / np.sqrt(colebrook(Re, rr))
+
+    def _position(self, values, axis):
+        x = (values - axis[0]) * ((len(axis) - 1) / (axis[-1] - axis[0]))
+        # fmax maps NaN to 0; those rows are blanked out by the caller.
+        x = np.fmin(np.fmax(x, 0), len(axis) - 1.000001)
+        i = x.astype(np.intp)
+        return i, x - i
+
+    def __call__(self, Re, rel_roughness):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_re = np.log10(np.asarray(Re, dtype=float))
+            log_rr = np.log10(np.maximum(np.asarray(rel_roughness, dtype=float), 10**self.log_rr[0]))
+        missing = ~np.isfinite(log_re) | np.isnan(log_rr)
+        i, x = self._position(log_re, self.log_re)
+        j, y = self._position(log_rr, self.log_rr)
+        flat = self.values.ravel()
+        width = self.values.shape[1]
+        k = i * width + j
+        v00 = flat[k]
+        v01 = flat[k + 1]
+        v10 = flat[k + width]
+        v11 = flat[k + width + 1]
+        low = v00 + (v01 - v00) * y
+        high = v10 + (v11 - v10) * y
+        f = 1 / (low + (high - low) * x) ** 2
+        if missing.any():
+            f = np.where(missing, np.nan, f)
+        return f
+
+
+@functools.lru_cache(maxsize=None)
+def get_table():
+    """The shared Colebrook table, built on first use."""
+    return ColebrookTable()
+
+
+def friction_factor(Re, rel_roughness, method="exact"):
+    """Darcy friction factor for any flow regime.
+
+    ``method`` selects how turbulent flow is solved: ``"exact"`` iterates
+    Colebrook, ``"table"`` interpolates the precomputed table. Reversed flow
+    (negative Re) uses |Re|; zero or non-finite inputs give NaN.
+    """
+    Re = np.abs(np.asarray(Re, dtype=float))
+    rel_roughness = np.asarray(rel_roughness, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        laminar = 64 / Re
+        turbulent_re = np.maximum(Re, LAMINAR_RE)
+        if method == "table":
+            turbulent = get_table()(turbulent_re, rel_roughness)
+        else:
+            turbulent = colebrook(turbulent_re, rel_roughness)
+        weight = np.clip((Re - LAMINAR_RE) / (TURBULENT_RE - LAMINAR_RE), 0, 1)
+        f = np.where(Re <= LAMINAR_RE, laminar, laminar * (1 - weight) + turbulent * weight)
+    valid = (Re > 0) & np.isfinite(Re) & np.isfinite(rel_roughness) & (rel_roughness >= 0)
+    return np.where(valid, f, np.nan)
+
+
+def pressure_drop(flow_rate, diameter, length, rho, mu, roughness=0.0001, method="table"):
+    """Darcy-Weisbach pressure drop (Pa) over circular pipe or duct segments.
+
+    All arguments broadcast, so thousands of segments are one call. Returns
+    ``(delta_p, velocity, Re, f)``.
+    """
+    diameter = np.asarray(diameter, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        velocity = np.asarray(flow_rate, dtype=float) / (np.pi * (diameter / 2)**2)
+        Re = rho * velocity * diameter / mu
+        f = friction_factor(Re, roughness / diameter, method)
+        delta_p = f * (length / diameter) * 0.5 * rho * velocity * np.abs(velocity)
+    return delta_p, velocity, Re, f
@@ -0,0 +1,317 @@
+"""The cooling models as dependency graphs of named intermediate quantities.
+
+Each node is a small vectorized formula whose parameter names are the nodes
+or inputs it depends on, e.g. ``velocity(Q, Aflow)``. A GraphState holds the
+value of every node for a whole hall of racks and only recomputes what an edit
+touches: changing ``electricity_cost`` redoes ``annual_cost`` and nothing
+else, and changing the flow rate of a few racks recomputes the hydraulics of
+just those racks. Intermediate values such as ``Re`` or ``friction`` can be
+read like any output.
+
+The formulas are the ones of BatchCoolingCalculations, written in the same
+order of operations, so ``results()`` matches ``evaluate_arguments`` exactly;
+tests/test_graph.py checks that for both cooling types.
+"""
+import inspect
+
+import numpy as np
+
+from datacool.batch import (AIR_OUTPUTS, IMMERSION_OUTPUTS, BatchCoolingCalculations, finish_results,
+                            rack_arguments, wrap_row)
+from datacool.friction import friction_factor
+from datacool.instrument import count, span
+from datacool.properties import CP, MU, RHO, get_registry
+
+
+class ModelGraph:
+    """Node definitions: name -> (function, names of its dependencies)."""
+
+    def __init__(self, outputs, defaults):
+        self.outputs = outputs
+        self.defaults = defaults
+        self.nodes = {}
+
+    def node(self, func=None, name=None):
+        """Register ``func`` as a node, named after it unless ``name`` is given.
+
+        The function's parameter names are the nodes and inputs it depends on.
+        """
+        if func is None:
+            return lambda func: self.node(func, name)
+        self.nodes[name or func.__name__] = (func, tuple(inspect.signature(func).parameters))
+        return func
+
+    @property
+    def inputs(self):
+        return sorted({dep for _, deps in self.nodes.values() for dep in deps if dep not in self.nodes})
+
+    def dependents(self):
+        """name -> every node downstream of it, in evaluation order."""
+        order = []
+        seen = set()
+
+        def visit(name):
+            if name in seen or name not in self.nodes:
+                return
+            seen.add(name)
+            for dep in self.nodes[name][1]:
+                visit(dep)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        direct = {}
+        for name in order:
+            for dep in self.nodes[name][1]:
+                direct.setdefault(dep, set()).add(name)
+        result = {}
+        for name in order[::-1] + self.inputs:
+            below = set(direct.get(name, ()))
+            for child in direct.get(name, ()):
+                below.update(result[child])
+            result[name] = below
+        return {name: [node for node in order if node in below] for name, below in result.items()}
+
+
+def _signature_defaults(func):
+    return {name: parameter.default for name, parameter in inspect.signature(func).parameters.items()
+            if parameter.default is not inspect.Parameter.empty and name != "rounded"}
+
+
+IMMERSION_GRAPH = ModelGraph(IMMERSION_OUTPUTS, _signature_defaults(BatchCoolingCalculations.calculateICoolingEnergy))
+AIR_GRAPH = ModelGraph(AIR_OUTPUTS, _signature_defaults(BatchCoolingCalculations.calculateACoolingEnergy))
+
+
+@IMMERSION_GRAPH.node
+def fluid(fluidType):
+    return get_registry().fluid_code(fluidType)
+
+
+@IMMERSION_GRAPH.node
+def Cp(fluid, tCoolant):
+    return get_registry().lookup(fluid, tCoolant, CP)
+
+
+@IMMERSION_GRAPH.node
+def rho(fluid, tCoolant):
+    return get_registry().lookup(fluid, tCoolant, RHO)
+
+
+@IMMERSION_GRAPH.node
+def mu(fluid, tCoolant):
+    return get_registry().lookup(fluid, tCoolant, MU)
+
+
+@IMMERSION_GRAPH.node
+def fAgeT(tau):
+    return 1 + 0.03 + np.asarray(tau) / 8760
+
+
+@IMMERSION_GRAPH.node
+def server_temp(tCoolant, L, Q, Cp, fAgeT, val):
+    return tCoolant + (L / (Q * 100 * Cp)) * fAgeT + wrap_row(val) / 2
+
+
+@IMMERSION_GRAPH.node
+def velocity(Q, Aflow):
+    return np.asarray(Q) / Aflow
+
+
+@IMMERSION_GRAPH.node
+def Re(rho, velocity, Lchar, mu):
+    Re = (rho * velocity * Lchar) / mu
+    return np.where(Re == 0, np.nan, Re)
+
+
+@IMMERSION_GRAPH.node
+def friction(Re, epsilon, D):
+    return friction_factor(Re, epsilon / np.asarray(D, dtype=float))
+
+
+@IMMERSION_GRAPH.node
+def deltaP(friction, L_pipe, D, rho, velocity):
+    return friction * (L_pipe / np.asarray(D, dtype=float)) * 0.5 * rho * velocity**2
+
+
+@IMMERSION_GRAPH.node
+def pump_power(Q, deltaP, pump_efficiency):
+    return (Q * deltaP) / (pump_efficiency * 1000)
+
+
+@IMMERSION_GRAPH.node
+def heat_exchanger_power(n, L):
+    return np.asarray(n) * L * 0.10
+
+
+@IMMERSION_GRAPH.node
+def total_cooling_energy(pump_power, heat_exchanger_power, safety_margin):
+    total = pump_power + heat_exchanger_power
+    return np.where(safety_margin, total * 1.25, total)
+
+
+@IMMERSION_GRAPH.node
+def annual_cost(total_cooling_energy, electricity_cost):
+    return total_cooling_energy * 24 * 365 * electricity_cost
+
+
+@AIR_GRAPH.node(name="server_temp")
+def air_server_temp(tAmbient, n, l, fanAirflow, fanEfficiency, dustAmount, heatSinkEfficiency, heatSinkSA):
+    return BatchCoolingCalculations.calculateACServerTemp(tAmbient, n, l, fanAirflow, fanEfficiency, dustAmount,
+                                                          heatSinkEfficiency, heatSinkSA)
+
+
+@AIR_GRAPH.node
+def rho_air(tAmbient):
+    registry = get_registry()
+    return registry.lookup(registry.codes["Air"], tAmbient, RHO)
+
+
+@AIR_GRAPH.node
+def mu_air(tAmbient):
+    registry = get_registry()
+    return registry.lookup(registry.codes["Air"], tAmbient, MU)
+
+
+@AIR_GRAPH.node
+def duct_velocity(fanAirflow, duct_diameter):
+    A_duct = np.pi * (np.asarray(duct_diameter, dtype=float) / 2)**2
+    return fanAirflow / A_duct
+
+
+@AIR_GRAPH.node
+def duct_Re(rho_air, duct_velocity, duct_diameter, mu_air):
+    Re = (rho_air * duct_velocity * np.asarray(duct_diameter, dtype=float)) / mu_air
+    return np.where(Re == 0, np.nan, Re)
+
+
+@AIR_GRAPH.node
+def duct_friction(duct_Re, duct_roughness, duct_diameter):
+    return friction_factor(duct_Re, duct_roughness / np.asarray(duct_diameter, dtype=float))
+
+
+@AIR_GRAPH.node
+def delta_p(duct_friction, duct_length, duct_diameter, rho_air, duct_velocity):
+    return duct_friction * (duct_length / np.asarray(duct_diameter, dtype=float)) * 0.5 * rho_air * duct_velocity**2
+
+
+@AIR_GRAPH.node
+def fan_power(fanAirflow, delta_p, fanEfficiency):
+    return (fanAirflow * delta_p) / fanEfficiency
+
+
+@AIR_GRAPH.node
+def chiller_power(n, l, chiller_cop):
+    return np.asarray(n) * l / chiller_cop
+
+
+@AIR_GRAPH.node(name="total_cooling_energy")
+def air_total_cooling_energy(fan_power, chiller_power, safety_margin):
+    total = fan_power + chiller_power
+    return np.where(safety_margin, total * 1.25, total)
+
+
+@AIR_GRAPH.node(name="annual_cost")
+def air_annual_cost(total_cooling_energy, electricity_cost):
+    return total_cooling_energy * 24 * 365 * electricity_cost
+
+
+GRAPHS = {"Immersion": IMMERSION_GRAPH, "Air": AIR_GRAPH}
+
+
+class GraphState:
+    """Memoized node values of one graph over ``size`` racks.
+
+    Values are computed on first read. ``set`` replaces an input for all
+    racks or for the given rows and marks only the dependent nodes stale, for
+    those rows only. ``computed`` counts the rack evaluations of every node.
+    """
+
+    def __init__(self, graph, arguments, size=None):
+        self.graph = graph
+        self.order = graph.dependents()
+        self.inputs = dict(graph.defaults)
+        self.inputs.update(arguments)
+        self.inputs = {name: self._array(value) for name, value in self.inputs.items()}
+        missing = [name for name in graph.inputs if name not in self.inputs]
+        if missing:
+            raise ValueError(f"Missing model inputs: {', '.join(missing)}")
+        if size is None:
+            size = int(np.prod(np.broadcast_shapes(*(np.shape(value) for value in self.inputs.values()))))
+        self.size = size
+        self.values = {}
+        self.stale = {}
+        self.computed = dict.fromkeys(graph.nodes, 0)
+        # Inputs still shared with the caller; copied before the first row edit.
+        self.shared = set(self.inputs)
+
+    @staticmethod
+    def _array(value):
+        value = np.asarray(value)
+        return value.astype(str) if value.dtype.kind == "O" else value
+
+    def _full(self, value):
+        return np.broadcast_to(value, (self.size,)).copy()
+
+    def __getitem__(self, name):
+        if name in self.inputs:
+            return self.inputs[name]
+        if name not in self.values:
+            self._compute(name, None)
+        elif name in self.stale:
+            self._compute(name, self.stale.pop(name))
+        return self.values[name]
+
+    def _compute(self, name, rows):
+        func, deps = self.graph.nodes[name]
+        arguments = [self[dep] for dep in deps]
+        with span(f"graph.{name}"), np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            if rows is None:
+                self.values[name] = func(*arguments)
+                self.computed[name] += self.size
+            else:
+                value = func(*[arg if np.ndim(arg) == 0 else arg[rows] for arg in arguments])
+                current = self.values[name]
+                if np.ndim(current) == 0:
+                    current = self.values[name] = self._full(current)
+                current[rows] = value
+                self.computed[name] += len(rows)
+
+    def set(self, name, value, rows=None):
+        """Change input ``name`` for every rack, or only at the row indices ``rows``."""
+        if name not in self.inputs:
+            raise KeyError(name)
+        value = self._array(value)
+        if rows is None:
+            self.inputs[name] = value
+            self.shared.add(name)
+            for node in self.order[name]:
+                self.values.pop(node, None)
+                self.stale.pop(node, None)
+            return
+        rows = np.asarray(rows, dtype=np.intp)
+        current = self.inputs[name]
+        if name in self.shared or np.ndim(current) == 0:
+            current = self._full(current)
+            self.shared.discard(name)
+        if value.dtype != current.dtype:
+            current = current.astype(np.result_type(current, value))
+        current[rows] = value
+        self.inputs[name] = current
+        for node in self.order[name]:
+            if node not in self.values:
+                continue
+            pending = self.stale.get(node)
+            self.stale[node] = rows if pending is None else np.union1d(pending, rows)
+
+    def results(self, rounded=True):
+        """The same dict ``evaluate_arguments`` returns, built from the memoized nodes."""
+        results = {key: np.broadcast_to(self[key], (self.size,)) for key in self.graph.outputs}
+        count("racks_evaluated", self.size)
+        return finish_results(results, self.graph.outputs, rounded)
+
+
+def evaluate_graph(racks, cooling_type, **overrides):
+    """GraphState for ``racks`` (columns as for ``evaluate_racks``) under ``cooling_type``."""
+    arguments = rack_arguments(racks, cooling_type)
+    arguments.update(overrides)
+    return GraphState(GRAPHS[cooling_type], arguments)
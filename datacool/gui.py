@@ -0,0 +1,1199 @@
+"""PyQt6 front end of DataCoolSim.
+
+This is the only module that imports PyQt; the rest of the package stays
+importable on machines without a display. The launcher imports it lazily.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+                             QPushButton, QLabel, QComboBox, QLineEdit, QDoubleSpinBox, 
+                             QSpinBox, QGroupBox, QScrollArea, QTabWidget, QStackedWidget, 
+                             QTextEdit, QSizePolicy, QGridLayout, QSlider, QCheckBox,
+                             QTableView, QAbstractItemView, QFileDialog, QMessageBox, QTableWidget,
+                             QTableWidgetItem)
+from PyQt6.QtCore import (Qt, QSize, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot,
+                          QAbstractTableModel, QModelIndex, QSortFilterProxyModel)
+from PyQt6.QtGui import QPixmap, QTextCursor, QColor, QImage, QPainter
+
+from datacool.cache import ResultCache, evaluate_cached
+from datacool.calculations import CoolingCalculations
+from datacool import instrument
+from datacool.export import detect_format
+from datacool.layout import DEFAULT_COLUMNS, DEFAULT_ROWS, column_label, parse_rack_id
+from datacool.layout import rack_id as make_rack_id
+from datacool.project import Project, load_project, save_project
+from datacool.thermal import thermal_field
+
+IMAGE_FILES = {"Immersion": "image.png", "Air": "image_air.png"}
+SCALED_PIXMAP_CACHE_SIZE = 8
+SORT_ROLE = Qt.ItemDataRole.UserRole
+RESULT_LABELS = {
+    "server_temp": "Server Temperature (°C)",
+    "pump_power": "Pump Power (kW)",
+    "heat_exchanger_power": "Heat Exchanger Power (kW)",
+    "fan_power": "Fan Power (kW)",
+    "chiller_power": "Chiller Power (kW)",
+    "total_cooling_energy": "Total Cooling Energy (kWh/year)",
+    "annual_cost": "Annual Cost ($)",
+}
+PROJECT_FILTERS = {"binary": "DataCoolSim Project (*.dcsim)", "json": "JSON Project (*.json)"}
+EXPORT_FILTERS = {"csv": "CSV (*.csv)", "jsonl": "JSON Lines (*.jsonl)", "parquet": "Parquet (*.parquet)"}
+
+
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, relative_path)
+
+
+def image_path(cooling_type):
+    return resource_path(IMAGE_FILES[cooling_type])
+
+class CalculationSignals(QObject):
+    results_ready = pyqtSignal(int, dict)
+    finished = pyqtSignal(int)
+
+class CalculationWorker(QRunnable):
+    """Evaluates rack columns off the GUI thread and emits their results chunk by chunk."""
+    def __init__(self, generation, rack_ids, columns, cooling_type, cache, cache_lock, chunk_size=64):
+        super().__init__()
+        self.generation = generation
+        self.rack_ids = rack_ids
+        self.columns = columns
+        self.cooling_type = cooling_type
+        self.cache = cache
+        self.cache_lock = cache_lock
+        self.chunk_size = chunk_size
+        self.cancelled = False
+        self.signals = CalculationSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        for start in range(0, len(self.rack_ids), self.chunk_size):
+            if self.cancelled:
+                return
+            stop = start + self.chunk_size
+            chunk = {name: column[start:stop] for name, column in self.columns.items()}
+            with self.cache_lock:
+                results = evaluate_cached(chunk, self.cooling_type, self.cache)
+            self.signals.results_ready.emit(self.generation, dict(zip(self.rack_ids[start:stop], results)))
+        self.signals.finished.emit(self.generation)
+
+class ThermalSignals(QObject):
+    field_ready = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+class ThermalWorker(QRunnable):
+    """Solves the floor temperature field off the GUI thread."""
+    def __init__(self, generation, columns, cooling_type, resolution, conductance):
+        super().__init__()
+        self.generation = generation
+        self.columns = columns
+        self.cooling_type = cooling_type
+        self.resolution = resolution
+        self.conductance = conductance
+        self.signals = ThermalSignals()
+
+    def run(self):
+        try:
+            field = thermal_field(self.columns, self.cooling_type, resolution=self.resolution,
+                                  conductance=self.conductance)
+        except (ValueError, KeyError, MemoryError) as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.field_ready.emit(self.generation, field)
+
+class RackDataDialog(QWidget):
+    changed = pyqtSignal()
+
+    def __init__(self, cooling_type, parent=None):
+        super().__init__(parent)
+        self.cooling_type = cooling_type
+        self.setup_ui()
+        
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        
+        if self.cooling_type == "Immersion":
+            
+            self.coolant_temp = QDoubleSpinBox()
+            self.coolant_temp.setRange(-50, 150)
+            self.coolant_temp.setSuffix(" °C")
+            self.coolant_temp.setValue(25)
+            
+            self.server_count = QSpinBox()
+            self.server_count.setRange(1, 100)
+            self.server_count.setValue(20)
+            
+            self.surface_area = QDoubleSpinBox()
+            self.surface_area.setRange(0.1, 100)
+            self.surface_area.setSuffix(" m²")
+            self.surface_area.setValue(0.5)
+            
+            self.load = QDoubleSpinBox()
+            self.load.setRange(0, 100000)
+            self.load.setSuffix(" W")
+            self.load.setValue(200)
+            
+            self.run_time = QDoubleSpinBox()
+            self.run_time.setRange(0, 8760)
+            self.run_time.setSuffix(" hours")
+            
+            self.distance = QDoubleSpinBox()
+            self.distance.setRange(0, 100)
+            self.distance.setSuffix(" m")
+            self.distance.setValue(5)
+            
+            self.insulation_type = QComboBox()
+            self.insulation_type.addItems(["None", "Standard Fiberglass", "Foam", "Fiberglass", "Aerogel"])
+            
+            self.fluid_type = QComboBox()
+            self.fluid_type.addItems(["3M Novec 7000", "Mineral Oil", "Synthetic Oil", "Dielectric Fluid"])
+            
+            self.flow_rate = QDoubleSpinBox()
+            self.flow_rate.setRange(0, 100)
+            self.flow_rate.setSuffix(" L/min")
+            self.flow_rate.setValue(0.05)
+            
+            self.flow_area = QDoubleSpinBox()
+            self.flow_area.setRange(0, 10)
+            self.flow_area.setSuffix(" cm²")
+            self.flow_area.setValue(0.00785)
+            
+            
+            layout.addWidget(QLabel("Coolant Temperature:"))
+            layout.addWidget(self.coolant_temp)
+            layout.addWidget(QLabel("Number of Servers:"))
+            layout.addWidget(self.server_count)
+            layout.addWidget(QLabel("Server Surface Area:"))
+            layout.addWidget(self.surface_area)
+            layout.addWidget(QLabel("Load:"))
+            layout.addWidget(self.load)
+            layout.addWidget(QLabel("Run Time:"))
+            layout.addWidget(self.run_time)
+            layout.addWidget(QLabel("Distance from Heat Exchanger:"))
+            layout.addWidget(self.distance)
+            layout.addWidget(QLabel("Insulation Type:"))
+            layout.addWidget(self.insulation_type)
+            layout.addWidget(QLabel("Fluid Type:"))
+            layout.addWidget(self.fluid_type)
+            layout.addWidget(QLabel("Coolant Flow Rate:"))
+            layout.addWidget(self.flow_rate)
+            layout.addWidget(QLabel("Cross Sectional Flow Area:"))
+            layout.addWidget(self.flow_area)
+            
+        else:  
+            self.ambient_temp = QDoubleSpinBox()
+            self.ambient_temp.setRange(-50, 150)
+            self.ambient_temp.setSuffix(" °C")
+            self.ambient_temp.setValue(25)
+            
+            self.server_count = QSpinBox()
+            self.server_count.setRange(1, 100)
+            self.server_count.setValue(20)
+            
+            self.load = QDoubleSpinBox()
+            self.load.setRange(0, 100000)
+            self.load.setSuffix(" W")
+            self.load.setValue(200)
+            
+            self.fan_airflow = QDoubleSpinBox()
+            self.fan_airflow.setRange(0, 10)
+            self.fan_airflow.setSuffix(" m³/s")
+            self.fan_airflow.setValue(0.085)
+            
+            self.fan_efficiency = QDoubleSpinBox()
+            self.fan_efficiency.setRange(0, 1)
+            self.fan_efficiency.setValue(0.55)
+            
+            self.dust_amount = QDoubleSpinBox()
+            self.dust_amount.setRange(0, 1)
+            self.dust_amount.setValue(0.1)
+            
+            self.heat_sink_efficiency = QDoubleSpinBox()
+            self.heat_sink_efficiency.setRange(0, 1)
+            self.heat_sink_efficiency.setValue(0.75)
+            
+            self.heat_sink_sa = QDoubleSpinBox()
+            self.heat_sink_sa.setRange(0, 10)
+            self.heat_sink_sa.setSuffix(" m²")
+            self.heat_sink_sa.setValue(1.2)
+            
+            
+            layout.addWidget(QLabel("Ambient Temperature:"))
+            layout.addWidget(self.ambient_temp)
+            layout.addWidget(QLabel("Number of Servers:"))
+            layout.addWidget(self.server_count)
+            layout.addWidget(QLabel("Load:"))
+            layout.addWidget(self.load)
+            layout.addWidget(QLabel("Fan Airflow:"))
+            layout.addWidget(self.fan_airflow)
+            layout.addWidget(QLabel("Fan Efficiency:"))
+            layout.addWidget(self.fan_efficiency)
+            layout.addWidget(QLabel("Dust Amount:"))
+            layout.addWidget(self.dust_amount)
+            layout.addWidget(QLabel("Heat Sink Efficiency:"))
+            layout.addWidget(self.heat_sink_efficiency)
+            layout.addWidget(QLabel("Heat Sink Surface Area:"))
+            layout.addWidget(self.heat_sink_sa)
+            
+        self.setLayout(layout)
+        for spin_box in self.findChildren(QDoubleSpinBox) + self.findChildren(QSpinBox):
+            spin_box.valueChanged.connect(lambda _: self.changed.emit())
+        for combo_box in self.findChildren(QComboBox):
+            combo_box.currentIndexChanged.connect(lambda _: self.changed.emit())
+    
+    def get_data(self):
+        if self.cooling_type == "Immersion":
+            return {
+                "coolant_temp": self.coolant_temp.value(),
+                "server_count": self.server_count.value(),
+                "surface_area": self.surface_area.value(),
+                "load": self.load.value(),
+                "run_time": self.run_time.value(),
+                "distance": self.distance.value(),
+                "insulation_type": self.insulation_type.currentText(),
+                "fluid_type": self.fluid_type.currentText(),
+                "flow_rate": self.flow_rate.value(),
+                "flow_area": self.flow_area.value()
+            }
+        else:
+            return {
+                "ambient_temp": self.ambient_temp.value(),
+                "server_count": self.server_count.value(),
+                "load": self.load.value(),
+                "fan_airflow": self.fan_airflow.value(),
+                "fan_efficiency": self.fan_efficiency.value(),
+                "dust_amount": self.dust_amount.value(),
+                "heat_sink_efficiency": self.heat_sink_efficiency.value(),
+                "heat_sink_sa": self.heat_sink_sa.value()
+            }
+
+class RackDataWindow(QWidget):
+    """A separate window for rack data entry."""
+    data_changed = pyqtSignal()
+
+    def __init__(self, cooling_type, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Rack Data Entry")
+        self.setMinimumSize(350, 500)
+        self.cooling_type = cooling_type
+        self.rack_id = None
+        self.loading = False
+
+        self.data_layout = QVBoxLayout()
+        self.current_rack_label = QLabel("No rack selected")
+        self.data_layout.addWidget(self.current_rack_label)
+
+        self.data_entry_widget = RackDataDialog(self.cooling_type)
+        self.data_entry_widget.changed.connect(self.entry_changed)
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(self.data_entry_widget)
+        self.data_layout.addWidget(scroll)
+
+        self.save_btn = QPushButton("Save Data")
+        self.data_layout.addWidget(self.save_btn)
+
+        self.setLayout(self.data_layout)
+
+    def entry_changed(self):
+        # Values filled in by set_rack are not user edits.
+        if not self.loading:
+            self.data_changed.emit()
+
+    def set_rack(self, rack_id, data, cooling_type):
+        self.loading = True
+        try:
+            self.load_rack(rack_id, data, cooling_type)
+        finally:
+            self.loading = False
+
+    def load_rack(self, rack_id, data, cooling_type):
+        self.rack_id = rack_id
+        self.current_rack_label.setText(f"Rack {rack_id}")
+        
+        if self.cooling_type != cooling_type:
+            self.data_layout.removeWidget(self.data_entry_widget)
+            self.data_entry_widget.deleteLater()
+            self.data_entry_widget = RackDataDialog(cooling_type)
+            self.data_entry_widget.changed.connect(self.entry_changed)
+            scroll = self.data_layout.itemAt(1).widget()
+            scroll.setWidget(self.data_entry_widget)
+            self.cooling_type = cooling_type
+        
+        if data:
+            if cooling_type == "Immersion":
+                self.data_entry_widget.coolant_temp.setValue(data.get("coolant_temp", 0))
+                self.data_entry_widget.server_count.setValue(data.get("server_count", 1))
+                self.data_entry_widget.surface_area.setValue(data.get("surface_area", 0))
+                self.data_entry_widget.load.setValue(data.get("load", 0))
+                self.data_entry_widget.run_time.setValue(data.get("run_time", 0))
+                self.data_entry_widget.distance.setValue(data.get("distance", 0))
+                insulation_index = self.data_entry_widget.insulation_type.findText(data.get("insulation_type", ""))
+                if insulation_index >= 0:
+                    self.data_entry_widget.insulation_type.setCurrentIndex(insulation_index)
+                fluid_index = self.data_entry_widget.fluid_type.findText(data.get("fluid_type", ""))
+                if fluid_index >= 0:
+                    self.data_entry_widget.fluid_type.setCurrentIndex(fluid_index)
+                self.data_entry_widget.flow_rate.setValue(data.get("flow_rate", 0))
+                self.data_entry_widget.flow_area.setValue(data.get("flow_area", 0))
+            else:
+                self.data_entry_widget.ambient_temp.setValue(data.get("ambient_temp", 0))
+                self.data_entry_widget.server_count.setValue(data.get("server_count", 1))
+                self.data_entry_widget.load.setValue(data.get("load", 0))
+                self.data_entry_widget.fan_airflow.setValue(data.get("fan_airflow", 0))
+                self.data_entry_widget.fan_efficiency.setValue(data.get("fan_efficiency", 0))
+                self.data_entry_widget.dust_amount.setValue(data.get("dust_amount", 0))
+                self.data_entry_widget.heat_sink_efficiency.setValue(data.get("heat_sink_efficiency", 0))
+                self.data_entry_widget.heat_sink_sa.setValue(data.get("heat_sink_sa", 0))
+
+    def get_data(self):
+        return self.data_entry_widget.get_data()
+
+class DiagnosticsWindow(QWidget):
+    """Live view of datacool.instrument: span timings, counters and cache statistics.
+
+    ``cache_stats`` is called on every refresh and returns extra numbers to
+    show and export alongside the recorded ones.
+    """
+    def __init__(self, cache_stats, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.setMinimumSize(560, 400)
+        self.cache_stats = cache_stats
+
+        layout = QVBoxLayout()
+        self.enable_checkbox = QCheckBox("Record timings")
+        self.enable_checkbox.setChecked(instrument.is_enabled())
+        self.enable_checkbox.toggled.connect(self.set_enabled)
+        layout.addWidget(self.enable_checkbox)
+        self.span_table = QTableWidget(0, 6)
+        self.span_table.setHorizontalHeaderLabels(["Span", "Category", "Calls", "Total (ms)", "Mean (ms)", "Max (ms)"])
+        self.span_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.span_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.span_table)
+        self.counter_label = QLabel()
+        self.counter_label.setWordWrap(True)
+        layout.addWidget(self.counter_label)
+        buttons = QHBoxLayout()
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        buttons.addWidget(reset_btn)
+        json_btn = QPushButton("Export JSON...")
+        json_btn.clicked.connect(lambda: self.export("json"))
+        buttons.addWidget(json_btn)
+        trace_btn = QPushButton("Export Chrome Trace...")
+        trace_btn.clicked.connect(lambda: self.export("chrome"))
+        buttons.addWidget(trace_btn)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        return super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        return super().hideEvent(event)
+
+    def set_enabled(self, checked):
+        if checked:
+            instrument.enable()
+        else:
+            instrument.disable()
+        self.refresh()
+
+    def reset(self):
+        instrument.reset()
+        self.refresh()
+
+    def refresh(self):
+        summary = instrument.summary()
+        spans = sorted(summary["spans"].items(), key=lambda item: item[1]["total"], reverse=True)
+        self.span_table.setRowCount(len(spans))
+        for row, (name, stats) in enumerate(spans):
+            cells = [name, stats["category"], str(stats["count"]), f"{stats['total'] * 1e3:.2f}",
+                     f"{stats['mean'] * 1e3:.4f}", f"{stats['max'] * 1e3:.3f}"]
+            for column, text in enumerate(cells):
+                self.span_table.setItem(row, column, QTableWidgetItem(text))
+        counters = dict(summary["counters"])
+        counters.update(self.cache_stats())
+        text = ", ".join(f"{name}: {value}" for name, value in counters.items())
+        if not summary["enabled"]:
+            text = "Recording is off. " + text
+        self.counter_label.setText(text)
+
+    def export(self, fmt):
+        default = "datacool.trace.json" if fmt == "chrome" else "datacool-diagnostics.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Export Diagnostics", default, "JSON (*.json)")
+        if not path:
+            return
+        try:
+            instrument.dump(path, fmt, extra={"cache": self.cache_stats()})
+        except OSError as e:
+            QMessageBox.warning(self, "Export Failed", str(e))
+
+def heat_colors(values, low, high):
+    """RGB32 pixels of ``values`` on the rack floor's blue-to-red scale; NaN is grey."""
+    lut = np.array([QColor.fromHsvF((1 - t) * 0.66, 0.6, 0.95).rgb() for t in np.linspace(0, 1, 256)],
+                   dtype=np.uint32)
+    span = high - low
+    scaled = np.nan_to_num((values - low) / span if span else np.full(values.shape, 0.5), nan=0.0)
+    pixels = lut[np.clip(scaled * 255, 0, 255).astype(np.uint8)]
+    pixels[np.isnan(values)] = QColor(Qt.GlobalColor.lightGray).rgb()
+    return pixels
+
+class ThermalWindow(QWidget):
+    """Steady-state temperature field of the floor, drawn under the rack outlines.
+
+    ``floor`` is called on every computation and returns the rack columns and
+    cooling type to solve for.
+    """
+    def __init__(self, floor, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Thermal Map")
+        self.setMinimumSize(640, 480)
+        self.floor = floor
+        self.generation = 0
+        self.field = None
+        self.columns = None
+
+        layout = QVBoxLayout()
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Cells per rack:"))
+        self.resolution_spin = QSpinBox()
+        self.resolution_spin.setRange(1, 64)
+        self.resolution_spin.setValue(4)
+        controls.addWidget(self.resolution_spin)
+        controls.addWidget(QLabel("Hall mixing:"))
+        self.conductance_spin = QDoubleSpinBox()
+        self.conductance_spin.setRange(0.1, 10000)
+        self.conductance_spin.setSuffix(" W/K")
+        self.conductance_spin.setValue(20)
+        controls.addWidget(self.conductance_spin)
+        self.compute_btn = QPushButton("Compute")
+        self.compute_btn.clicked.connect(self.compute)
+        controls.addWidget(self.compute_btn)
+        controls.addStretch()
+        layout.addLayout(controls)
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        scroll = QScrollArea()
+        scroll.setWidget(self.image_label)
+        scroll.setWidgetResizable(True)
+        layout.addWidget(scroll)
+        self.setLayout(layout)
+
+    def compute(self):
+        columns, cooling_type = self.floor()
+        self.generation += 1
+        self.columns = columns
+        if not len(columns["col"]):
+            self.status_label.setText("No rack data available.")
+            return
+        worker = ThermalWorker(self.generation, columns, cooling_type, self.resolution_spin.value(),
+                               self.conductance_spin.value())
+        worker.signals.field_ready.connect(self.field_ready)
+        worker.signals.failed.connect(self.field_failed)
+        self.status_label.setText("Solving...")
+        QThreadPool.globalInstance().start(worker)
+
+    def field_failed(self, generation, message):
+        if generation == self.generation:
+            self.status_label.setText(f"Thermal solve failed: {message}")
+
+    @instrument.timed("gui.thermal_map")
+    def field_ready(self, generation, field):
+        if generation != self.generation:
+            return
+        self.field = field
+        temperature = field["temperature"]
+        low, high = float(temperature.min()), float(temperature.max())
+        pixels = heat_colors(temperature, low, high)
+        height, width = temperature.shape
+        image = QImage(pixels.data, width, height, 4 * width, QImage.Format.Format_RGB32).copy()
+        scale = max(1, 800 // max(height, width))
+        pixmap = QPixmap.fromImage(image.scaled(width * scale, height * scale))
+        resolution = self.resolution_spin.value()
+        painter = QPainter(pixmap)
+        painter.setPen(QColor(40, 40, 40))
+        for y, x in field["origin"]:
+            painter.drawRect(int(x) * scale, int(y) * scale, resolution * scale - 1, resolution * scale - 1)
+        painter.end()
+        self.image_label.setPixmap(pixmap)
+
+        text = f"Hall {low:.1f} to {high:.1f} °C over {width} x {height} cells, {field['iterations']} CG iterations."
+        if np.isfinite(field["rack_temp"]).any():
+            hottest = int(np.nanargmax(field["rack_temp"]))
+            rack = make_rack_id(int(self.columns["col"][hottest]), int(self.columns["row"][hottest]))
+            text += f" Hottest rack {rack} at {field['rack_temp'][hottest]:.1f} °C."
+        self.status_label.setText(text)
+
+class RackFloorModel(QAbstractTableModel):
+    """Rack floor as a table model; the view only asks for the cells it shows.
+
+    Cells are colored as a heat map of output ``key`` of a ResultTable, scaled
+    between its minimum (blue) and maximum (red) over the valid racks. Values
+    are read from the table when a cell is painted, so updating a few racks
+    only touches their cells.
+    """
+    def __init__(self, rows, columns, parent=None):
+        super().__init__(parent)
+        self.rows = rows
+        self.columns = columns
+        self.table = None
+        self.key = None
+        self.ranged = False
+        self.low = 0.0
+        self.high = 0.0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.columns
+
+    def rack_id(self, index):
+        return make_rack_id(index.column(), index.row())
+
+    def set_size(self, rows, columns):
+        self.beginResetModel()
+        self.rows = rows
+        self.columns = columns
+        self.endResetModel()
+
+    def _all_changed(self):
+        if self.rows and self.columns:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rows - 1, self.columns - 1))
+
+    def set_metric(self, table, key):
+        """Color by output ``key`` of ``table``; None for either clears the colors."""
+        self.table = table if key is not None else None
+        self.key = key
+        if self.table is not None:
+            values = table.column(key)[table.valid[:len(table)]]
+            self.ranged = bool(len(values))
+            if self.ranged:
+                self.low, self.high = float(values.min()), float(values.max())
+        self._all_changed()
+
+    def update_rows(self, rows):
+        """Repaint the racks at table ``rows``, widening the color range if needed."""
+        if self.table is None or not len(rows):
+            return
+        rows = np.asarray(rows)
+        rows = rows[self.table.valid[rows]]
+        if not len(rows):
+            return
+        values = self.table.values[self.key][rows]
+        low, high = float(values.min()), float(values.max())
+        if self.ranged:
+            low, high = min(low, self.low), max(high, self.high)
+        if not self.ranged or (low, high) != (self.low, self.high):
+            # A new range recolors every rack.
+            self.low, self.high, self.ranged = low, high, True
+            self._all_changed()
+            return
+        for col, row in self.table.coords[rows].tolist():
+            if row < self.rows and col < self.columns:
+                index = self.index(row, col)
+                self.dataChanged.emit(index, index)
+
+    def value(self, index):
+        if self.table is None:
+            return None
+        row = self.table.index.get((index.column(), index.row()))
+        if row is None or not self.table.valid[row]:
+            return None
+        return float(self.table.values[self.key][row])
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(index.row() + 1)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.BackgroundRole:
+            value = self.value(index)
+            if value is None:
+                return None
+            span = self.high - self.low
+            t = (value - self.low) / span if span else 0.5
+            return QColor.fromHsvF((1 - t) * 0.66, 0.6, 0.95)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            rack_id = self.rack_id(index)
+            value = self.value(index)
+            return rack_id if value is None else f"{rack_id}: {value}"
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return column_label(section)
+        return str(section + 1)
+
+class ResultTableModel(QAbstractTableModel):
+    """Read-only view of a ResultTable; only the visible cells are ever formatted.
+
+    SORT_ROLE returns numbers, so a proxy sorts values numerically and racks
+    in floor order.
+    """
+    def __init__(self, table, parent=None):
+        super().__init__(parent)
+        self.table = table
+
+    def set_table(self, table):
+        self.beginResetModel()
+        self.table = table
+        self.endResetModel()
+
+    def update(self, results, errors=None):
+        new = [rack_id for rack_id in results if rack_id not in self.table]
+        if new:
+            first = len(self.table)
+            self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+        changed = self.table.update(results, errors)
+        if new:
+            self.endInsertRows()
+        if changed:
+            self.dataChanged.emit(self.index(min(changed), 0), self.index(max(changed), self.columnCount() - 1))
+        return changed
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.table)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.table.outputs) + 2
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row, column = index.row(), index.column()
+        if role not in (Qt.ItemDataRole.DisplayRole, SORT_ROLE):
+            return None
+        if column == 0:
+            if role == SORT_ROLE:
+                col, rack_row = self.table.coords[row]
+                return int(col) * 1000000 + int(rack_row)
+            return self.table.rack_id(row)
+        if column > len(self.table.outputs):
+            return self.table.errors.get(row, "")
+        value = float(self.table.values[self.table.outputs[column - 1]][row])
+        if role == SORT_ROLE:
+            return value if self.table.valid[row] else float("-inf")
+        return str(value) if self.table.valid[row] else ""
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or orientation != Qt.Orientation.Horizontal:
+            return None
+        if section == 0:
+            return "Rack"
+        if section > len(self.table.outputs):
+            return "Error"
+        return RESULT_LABELS[self.table.outputs[section - 1]]
+
+class DataCenterSimulator(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Data Center Cooling Efficiency Simulator")
+        self.current_cooling_type = "Immersion"
+        self.project = Project(self.current_cooling_type)
+        self.rack_data = self.project.stores[self.current_cooling_type]
+        self.data_window = None  
+        self.diagnostics_window = None
+        self.thermal_window = None
+        self.current_rack_id = None  
+        self.current_image_path = image_path("Immersion")
+        self.pixmaps = {}
+        self.scaled_pixmaps = OrderedDict()
+        self.result_cache = ResultCache()
+        self.cache_lock = threading.Lock()
+        self.result_table = self.project.results[self.current_cooling_type]
+        self.dirty_racks = set()
+        self.worker = None
+        self.generation = 0
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(300)
+        self.live_timer.timeout.connect(self.live_recompute)
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(150)
+        self.resize_timer.timeout.connect(self.update_image)
+        self.init_ui()
+
+    def init_ui(self):
+        main_widget = QWidget()
+        main_layout = QHBoxLayout()
+        main_widget.setLayout(main_layout)
+
+        
+        left_panel = QWidget()
+        left_panel.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding)
+        left_layout = QVBoxLayout()
+        left_panel.setLayout(left_layout)
+
+        project_group = QGroupBox("Project")
+        project_layout = QHBoxLayout()
+        self.open_project_btn = QPushButton("Open Project...")
+        self.open_project_btn.clicked.connect(self.open_project_file)
+        project_layout.addWidget(self.open_project_btn)
+        self.save_project_btn = QPushButton("Save Project...")
+        self.save_project_btn.clicked.connect(self.save_project_file)
+        project_layout.addWidget(self.save_project_btn)
+        project_group.setLayout(project_layout)
+        left_layout.addWidget(project_group)
+
+        cooling_group = QGroupBox("Cooling Type")
+        cooling_layout = QVBoxLayout()
+        self.cooling_selector = QComboBox()
+        self.cooling_selector.addItems(["Immersion Cooling", "Air Cooling"])
+        self.cooling_selector.currentTextChanged.connect(self.change_cooling_type)
+        cooling_layout.addWidget(self.cooling_selector)
+        self.calculate_btn = QPushButton("Calculate Efficiency")
+        self.calculate_btn.clicked.connect(self.calculate_efficiency)
+        cooling_layout.addWidget(self.calculate_btn)
+        self.cancel_btn = QPushButton("Cancel Calculation")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_calculation)
+        cooling_layout.addWidget(self.cancel_btn)
+        self.live_checkbox = QCheckBox("Live Recompute")
+        cooling_layout.addWidget(self.live_checkbox)
+        self.apply_all_btn = QPushButton("Apply Current Rack to All")
+        self.apply_all_btn.clicked.connect(self.apply_to_all)
+        cooling_layout.addWidget(self.apply_all_btn)
+        self.output_toggle = QPushButton("Show Output")
+        self.output_toggle.setCheckable(True)
+        self.output_toggle.toggled.connect(self.toggle_output)
+        cooling_layout.addWidget(self.output_toggle)
+        self.diagnostics_btn = QPushButton("Diagnostics")
+        self.diagnostics_btn.clicked.connect(self.show_diagnostics)
+        cooling_layout.addWidget(self.diagnostics_btn)
+        self.thermal_btn = QPushButton("Thermal Map")
+        self.thermal_btn.clicked.connect(self.show_thermal_map)
+        cooling_layout.addWidget(self.thermal_btn)
+        cooling_group.setLayout(cooling_layout)
+        left_layout.addWidget(cooling_group)
+
+        floor_group = QGroupBox("Rack Floor")
+        floor_form = QGridLayout()
+        self.rows_spin = QSpinBox()
+        self.rows_spin.setRange(1, 100000)
+        self.rows_spin.setValue(DEFAULT_ROWS)
+        self.columns_spin = QSpinBox()
+        self.columns_spin.setRange(1, 10000)
+        self.columns_spin.setValue(DEFAULT_COLUMNS)
+        self.rows_spin.editingFinished.connect(self.resize_floor)
+        self.columns_spin.editingFinished.connect(self.resize_floor)
+        self.color_selector = QComboBox()
+        self.color_selector.addItems(["None", "Server Temperature", "Annual Cost"])
+        self.color_selector.currentTextChanged.connect(self.update_heat_map)
+        floor_form.addWidget(QLabel("Rows:"), 0, 0)
+        floor_form.addWidget(self.rows_spin, 0, 1)
+        floor_form.addWidget(QLabel("Columns:"), 1, 0)
+        floor_form.addWidget(self.columns_spin, 1, 1)
+        floor_form.addWidget(QLabel("Color By:"), 2, 0)
+        floor_form.addWidget(self.color_selector, 2, 1)
+        floor_group.setLayout(floor_form)
+        left_layout.addWidget(floor_group)
+
+
+        self.output_panel = QGroupBox("Simulation Output")
+        output_layout = QVBoxLayout()
+        self.output_status = QLabel()
+        output_layout.addWidget(self.output_status)
+        filter_layout = QHBoxLayout()
+        self.output_filter = QLineEdit()
+        self.output_filter.setPlaceholderText("Filter results")
+        filter_layout.addWidget(self.output_filter)
+        self.export_btn = QPushButton("Export...")
+        self.export_btn.clicked.connect(self.export_results)
+        filter_layout.addWidget(self.export_btn)
+        output_layout.addLayout(filter_layout)
+        self.result_model = ResultTableModel(self.result_table)
+        self.result_proxy = QSortFilterProxyModel()
+        self.result_proxy.setSourceModel(self.result_model)
+        self.result_proxy.setSortRole(SORT_ROLE)
+        self.result_proxy.setFilterKeyColumn(-1)
+        self.result_proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.output_filter.textChanged.connect(self.result_proxy.setFilterFixedString)
+        self.result_view = QTableView()
+        self.result_view.setModel(self.result_proxy)
+        self.result_view.setSortingEnabled(True)
+        self.result_view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        self.result_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.result_view.verticalHeader().setVisible(False)
+        output_layout.addWidget(self.result_view)
+        self.output_panel.setLayout(output_layout)
+        self.output_panel.setVisible(False)
+        left_layout.addWidget(self.output_panel)
+        left_layout.addStretch()
+        main_layout.addWidget(left_panel, 1)  
+
+        
+        right_panel = QWidget()
+        right_layout = QVBoxLayout()
+        right_panel.setLayout(right_layout)
+
+        
+        image_container = QWidget()
+        image_layout = QVBoxLayout()
+        image_container.setLayout(image_layout)
+        self.dc_image = QLabel()
+        self.dc_image.setScaledContents(True)
+        self.dc_image.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        image_layout.addWidget(self.dc_image)
+        right_layout.addWidget(image_container)
+
+        
+        floor_container = QWidget()
+        floor_layout = QVBoxLayout()
+        floor_container.setLayout(floor_layout)
+        self.rack_model = RackFloorModel(DEFAULT_ROWS, DEFAULT_COLUMNS)
+        self.rack_view = QTableView()
+        self.rack_view.setModel(self.rack_model)
+        self.rack_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.rack_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.rack_view.clicked.connect(self.rack_index_clicked)
+        floor_layout.addWidget(self.rack_view)
+        floor_container.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        right_layout.addWidget(floor_container)
+
+        main_layout.addWidget(right_panel, 3)
+
+        self.setCentralWidget(main_widget)
+        self.show()  
+        self.showMaximized()  
+        self.update_image()
+
+    def resizeEvent(self, event):
+        # Fast scaling while the window is being dragged; the smooth one runs once it settles.
+        self.update_image(smooth=False)
+        self.resize_timer.start()
+        self.adjust_rack_grid()
+        return super().resizeEvent(event)
+
+    @instrument.timed("gui.update_image")
+    def update_image(self, smooth=True):
+        
+        if hasattr(self, "dc_image"):
+            right_panel = self.centralWidget().layout().itemAt(1).widget()
+            width = right_panel.width()
+            height = right_panel.height()
+            img_height = int(height * 0.45)
+            img_width = int(width * 0.9)
+            # Decode each image once, the first time it is shown.
+            pixmap = self.pixmaps.get(self.current_image_path)
+            if pixmap is None:
+                pixmap = self.pixmaps[self.current_image_path] = QPixmap(self.current_image_path)
+            if not pixmap.isNull():
+                self.dc_image.setPixmap(self.scaled_pixmap(pixmap, img_width, img_height, smooth))
+                self.dc_image.setMinimumSize(1, 1)
+                self.dc_image.setMaximumSize(img_width, img_height)
+
+    def scaled_pixmap(self, pixmap, width, height, smooth):
+        """``pixmap`` fitted into width x height; smooth results are kept in a small LRU."""
+        key = (self.current_image_path, width, height)
+        scaled = self.scaled_pixmaps.get(key)
+        if scaled is not None:
+            self.scaled_pixmaps.move_to_end(key)
+            return scaled
+        if not smooth:
+            return pixmap.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
+        scaled = pixmap.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self.scaled_pixmaps[key] = scaled
+        while len(self.scaled_pixmaps) > SCALED_PIXMAP_CACHE_SIZE:
+            self.scaled_pixmaps.popitem(last=False)
+        return scaled
+
+    @instrument.timed("gui.adjust_rack_grid")
+    def adjust_rack_grid(self):
+        """Fit rack cells to the view; cost does not depend on the number of racks."""
+        if not hasattr(self, "rack_view"):
+            return
+        viewport = self.rack_view.viewport()
+        rows = self.rack_model.rowCount()
+        cols = self.rack_model.columnCount()
+        cell_width = max(40, viewport.width() // cols)
+        cell_height = max(24, viewport.height() // rows)
+        self.rack_view.horizontalHeader().setDefaultSectionSize(cell_width)
+        self.rack_view.verticalHeader().setDefaultSectionSize(cell_height)
+        font = self.rack_view.font()
+        font.setPointSize(max(8, min(cell_width, cell_height) // 3))
+        self.rack_view.setFont(font)
+
+    def resize_floor(self):
+        self.rack_model.set_size(self.rows_spin.value(), self.columns_spin.value())
+        self.adjust_rack_grid()
+
+    def rack_index_clicked(self, index):
+        self.rack_clicked(self.rack_model.rack_id(index))
+
+    def rack_clicked(self, rack_id):
+        self.current_rack_id = rack_id  
+        
+        if self.data_window is None:
+            self.data_window = RackDataWindow(self.current_cooling_type)
+            self.data_window.save_btn.clicked.connect(self.save_data)
+            self.data_window.data_changed.connect(self.schedule_live_recompute)
+        
+        data = self.rack_data.get(rack_id, None)
+        self.data_window.set_rack(rack_id, data, self.current_cooling_type)
+        self.data_window.show()
+        self.data_window.raise_()
+        self.data_window.activateWindow()
+
+    def save_data(self):
+        
+        if self.data_window is None or self.data_window.rack_id is None:
+            return
+        rack_id = self.data_window.rack_id
+        
+        self.rack_data[rack_id] = self.data_window.get_data()
+        self.dirty_racks.add(rack_id)
+
+    def change_cooling_type(self):
+        cooling_text = self.cooling_selector.currentText()
+        self.current_cooling_type = "Immersion" if "Immersion" in cooling_text else "Air"
+        self.stop_worker()
+        # Each cooling type keeps its own racks and results, so switching back restores them.
+        self.project.cooling_type = self.current_cooling_type
+        self.rack_data = self.project.stores[self.current_cooling_type]
+        self.result_table = self.project.results[self.current_cooling_type]
+        self.result_model.set_table(self.result_table)
+        self.output_status.clear()
+        self.dirty_racks.clear()
+        self.update_heat_map()
+        
+        self.current_image_path = image_path(self.current_cooling_type)
+        self.update_image()
+        if self.data_window is not None:
+            self.data_window.set_rack(self.data_window.rack_id, self.rack_data.get(self.data_window.rack_id),
+                                      self.current_cooling_type)
+
+    def save_project_file(self):
+        path, selected = QFileDialog.getSaveFileName(self, "Save Project", "facility.dcsim",
+                                                     ";;".join(PROJECT_FILTERS.values()))
+        if not path:
+            return
+        if "." not in os.path.basename(path):
+            path += ".json" if selected == PROJECT_FILTERS["json"] else ".dcsim"
+        self.project.rows = self.rack_model.rowCount()
+        self.project.columns = self.rack_model.columnCount()
+        try:
+            save_project(path, self.project)
+        except OSError as e:
+            QMessageBox.warning(self, "Save Failed", str(e))
+            return
+        self.setWindowTitle(f"Data Center Cooling Efficiency Simulator - {os.path.basename(path)}")
+
+    def open_project_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Project", "", ";;".join(PROJECT_FILTERS.values()))
+        if path:
+            self.open_project(path)
+
+    def open_project(self, path):
+        try:
+            project = load_project(path)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Open Failed", str(e))
+            return
+        self.stop_worker()
+        self.project = project
+        self.rows_spin.setValue(project.rows)
+        self.columns_spin.setValue(project.columns)
+        self.resize_floor()
+        self.cooling_selector.blockSignals(True)
+        self.cooling_selector.setCurrentIndex(0 if project.cooling_type == "Immersion" else 1)
+        self.cooling_selector.blockSignals(False)
+        self.change_cooling_type()
+        self.setWindowTitle(f"Data Center Cooling Efficiency Simulator - {os.path.basename(path)}")
+
+    def apply_to_all(self):
+        
+        if self.data_window is None or self.data_window.rack_id is None:
+            return
+        current_rack = self.data_window.rack_id
+        if current_rack not in self.rack_data:
+            self.save_data()
+        
+        self.rack_data.fill(self.rack_data[current_rack], self.rack_model.columnCount(), self.rack_model.rowCount())
+        # Recompute everything on the next run; identical racks share one cache entry.
+        self.result_table.invalidate()
+
+    def show_diagnostics(self):
+        if self.diagnostics_window is None:
+            self.diagnostics_window = DiagnosticsWindow(self.cache_stats)
+        self.diagnostics_window.show()
+        self.diagnostics_window.raise_()
+
+    def show_thermal_map(self):
+        if self.thermal_window is None:
+            self.thermal_window = ThermalWindow(self.thermal_floor)
+        self.thermal_window.show()
+        self.thermal_window.raise_()
+        self.thermal_window.compute()
+
+    def thermal_floor(self):
+        return self.rack_data.columns(), self.current_cooling_type
+
+    def cache_stats(self):
+        with self.cache_lock:
+            return {"cache_entries": len(self.result_cache), "cache_hits": self.result_cache.hits,
+                    "cache_misses": self.result_cache.misses}
+
+    def toggle_output(self, checked):
+        self.output_panel.setVisible(checked)
+
+    def calculate_rack(self, rack_id, data):
+        """Scalar evaluation of a single rack."""
+        if self.current_cooling_type == "Immersion":
+            return CoolingCalculations.calculateICoolingEnergy(
+                tCoolant=data.get("coolant_temp", 25),
+                n=data.get("server_count", 20),
+                SA=data.get("surface_area", 0.5),
+                L=data.get("load", 200),
+                tau=data.get("run_time", 0),
+                D=data.get("distance", 5),
+                insulation=data.get("insulation_type", "Standard Fiberglass"),
+                fluidType=data.get("fluid_type", "3M Novec 7000"),
+                Q=data.get("flow_rate", 0.05),
+                Aflow=data.get("flow_area", 0.00785),
+                Lchar=0.01,
+                val=parse_rack_id(rack_id)[1] + 1,
+                L_pipe=20
+            )
+        return CoolingCalculations.calculateACoolingEnergy(
+            tAmbient=data.get("ambient_temp", 25),
+            n=data.get("server_count", 20),
+            l=data.get("load", 200),
+            fanAirflow=data.get("fan_airflow", 0.085),
+            fanEfficiency=data.get("fan_efficiency", 0.55),
+            dustAmount=data.get("dust_amount", 0.1),
+            heatSinkEfficiency=data.get("heat_sink_efficiency", 0.75),
+            heatSinkSA=data.get("heat_sink_sa", 1.2),
+            duct_length=20,
+            duct_diameter=0.1,
+            safety_margin=True,
+            chiller_cop=3.0,
+            electricity_cost=0.15
+        )
+
+    def rack_error(self, rack_id):
+        """Error text of an invalid rack, as reported by the scalar model."""
+        try:
+            self.calculate_rack(rack_id, self.rack_data[rack_id])
+        except Exception as e:
+            return str(e)
+        return "invalid input"
+
+    @pyqtSlot()
+    @instrument.timed("gui.calculate_efficiency")
+    def calculate_efficiency(self):
+        """Calculate efficiency for all racks using provided formulas"""
+        if not self.rack_data:
+            self.output_status.setText("No rack data available. Please enter data first.")
+            return
+
+        self.stop_worker()
+        dirty = [rack_id for rack_id in self.rack_data
+                 if rack_id in self.dirty_racks or not self.result_table.is_current(rack_id)]
+        self.dirty_racks.clear()
+        if not dirty:
+            self.output_status.setText(f"{len(self.result_table)} racks")
+            return
+
+        self.output_status.setText(f"Calculating {len(dirty)} racks...")
+        self.worker = CalculationWorker(self.generation, dirty, self.rack_data.columns(dirty), self.current_cooling_type,
+                                        self.result_cache, self.cache_lock)
+        self.worker.signals.results_ready.connect(self.results_ready)
+        self.worker.signals.finished.connect(self.calculation_finished)
+        self.cancel_btn.setEnabled(True)
+        QThreadPool.globalInstance().start(self.worker)
+
+    @instrument.timed("gui.results_ready")
+    def results_ready(self, generation, results):
+        if generation != self.generation:
+            return
+        errors = {rack_id: self.rack_error(rack_id) for rack_id, rack_results in results.items()
+                  if not rack_results["valid"]}
+        changed = self.result_model.update(results, errors)
+        # Only this chunk's racks are repainted; the full range is refreshed when the run ends.
+        self.rack_model.update_rows(changed)
+
+    @pyqtSlot()
+    @instrument.timed("gui.update_heat_map")
+    def update_heat_map(self):
+        metric = {"Server Temperature": "server_temp", "Annual Cost": "annual_cost"}.get(self.color_selector.currentText())
+        self.rack_model.set_metric(self.result_table, metric)
+
+    def export_results(self):
+        path, selected = QFileDialog.getSaveFileName(self, "Export Results", "results.csv",
+                                                     ";;".join(EXPORT_FILTERS.values()))
+        if not path:
+            return
+        fmt = next((fmt for fmt, name in EXPORT_FILTERS.items() if name == selected), None)
+        try:
+            count = self.result_table.export(path, detect_format(path) if "." in os.path.basename(path) else fmt)
+        except (OSError, RuntimeError) as e:
+            QMessageBox.warning(self, "Export Failed", str(e))
+            return
+        self.output_status.setText(f"Exported {count} racks to {path}")
+
+    def calculation_finished(self, generation):
+        if generation == self.generation:
+            self.worker = None
+            self.cancel_btn.setEnabled(False)
+            self.update_heat_map()
+            self.output_status.setText(f"{len(self.result_table)} racks")
+
+    def stop_worker(self):
+        """Cancel any running calculation and ignore results it still delivers."""
+        self.generation += 1
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.cancel_btn.setEnabled(False)
+
+    def cancel_calculation(self):
+        if self.worker is None:
+            return
+        self.stop_worker()
+        self.output_status.setText("Calculation cancelled.")
+
+    def schedule_live_recompute(self):
+        if self.live_checkbox.isChecked():
+            self.live_timer.start()
+
+    def live_recompute(self):
+        """Save the edited rack and recompute; only that rack is dirty."""
+        self.save_data()
+        self.calculate_efficiency()
+
+
+def run(argv=None):
+    argv = sys.argv if argv is None else argv
+    app = QApplication(argv)
+    window = DataCenterSimulator()
+    window.show()  
+    window.showMaximized()  
+    # A project file given on the command line is opened at startup.
+    if len(argv) > 1:
+        window.open_project(argv[1])
+    return app.exec()
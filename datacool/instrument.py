@@ -0,0 +1,170 @@
+"""Opt-in timing spans and counters for finding where a run spends its time.
+
+Instrumentation is off by default. While off, ``span`` hands back one shared
+do-nothing context manager and ``count`` returns at once, so the hooks left in
+the hot paths cost a function call and nothing else. ``enable()`` starts
+recording; ``summary()`` aggregates per span name and ``chrome_trace()``
+returns the raw spans in the Trace Event format that chrome://tracing and
+Perfetto load. Setting DATACOOL_PROFILE=1 enables recording at import.
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+MAX_EVENTS = 200000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_recorder = None
+
+
+class Recorder:
+    """Aggregated span statistics and counters, plus the raw spans for a trace.
+
+    Aggregates cover every span; only the first MAX_EVENTS raw events are kept
+    for the trace so memory stays bounded on long runs.
+    """
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self.stats = {}
+        self.counters = {}
+
+    def add_span(self, name, category, start, duration):
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = {"category": category, "count": 0, "total": 0.0, "max": 0.0}
+            stats["count"] += 1
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+            if len(self.events) < self.max_events:
+                self.events.append((name, category, start - self.origin, duration, threading.get_ident()))
+            else:
+                self.dropped += 1
+
+    def add_count(self, name, n):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "category", "start")
+
+    def __init__(self, recorder, name, category):
+        self.recorder = recorder
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add_span(self.name, self.category, self.start, time.perf_counter() - self.start)
+        return False
+
+
+def enable():
+    """Start recording into a fresh recorder."""
+    global _recorder
+    _recorder = Recorder()
+
+
+def disable():
+    global _recorder
+    _recorder = None
+
+
+def is_enabled():
+    return _recorder is not None
+
+
+def reset():
+    if _recorder is not None:
+        enable()
+
+
+def span(name, category="compute"):
+    """Context manager timing one stage; a shared no-op while disabled."""
+    if _recorder is None:
+        return _NULL_SPAN
+    return _Span(_recorder, name, category)
+
+
+def count(name, n=1):
+    if _recorder is not None:
+        _recorder.add_count(name, n)
+
+
+def timed(name, category="gui"):
+    """Decorator wrapping every call of a function in ``span(name, category)``."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with _Span(_recorder, name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def summary():
+    """Per-span count, total, mean and max in seconds, plus counters."""
+    recorder = _recorder
+    if recorder is None:
+        return {"enabled": False, "spans": {}, "counters": {}}
+    with recorder.lock:
+        spans = {name: dict(stats, mean=stats["total"] / stats["count"]) for name, stats in recorder.stats.items()}
+        return {"enabled": True, "spans": spans, "counters": dict(recorder.counters),
+                "events": len(recorder.events), "dropped_events": recorder.dropped}
+
+
+def chrome_trace():
+    """Recorded spans as a Trace Event Format document (times in microseconds)."""
+    recorder = _recorder
+    if recorder is None:
+        return {"traceEvents": []}
+    pid = os.getpid()
+    with recorder.lock:
+        events = [{"name": name, "cat": category, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6,
+                   "pid": pid, "tid": tid}
+                  for name, category, start, duration, tid in recorder.events]
+        events += [{"name": name, "ph": "C", "ts": (time.perf_counter() - recorder.origin) * 1e6,
+                    "pid": pid, "args": {name: value}}
+                   for name, value in recorder.counters.items()]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def dump(path, fmt=None, extra=None):
+    """Write ``summary()`` (``fmt="json"``) or ``chrome_trace()`` (``"chrome"``) to ``path``.
+
+    Without ``fmt``, paths ending in ``.trace.json`` get the trace. ``extra``
+    is merged into the summary, e.g. cache statistics only the caller knows.
+    """
+    if fmt is None:
+        fmt = "chrome" if path.endswith(".trace.json") else "json"
+    document = chrome_trace() if fmt == "chrome" else dict(summary(), **(extra or {}))
+    with open(path, "w") as f:
+        json.dump(document, f, indent=None if fmt == "chrome" else 2)
+
+
+if os.environ.get("DATACOOL_PROFILE"):
+    enable()
@@ -0,0 +1,37 @@
+"""Rack naming on the hall floor.
+
+Columns are lettered like spreadsheet columns (A..Z, AA, AB, ...) and rows are
+numbered from 1, so the default 5x12 hall runs from A1 to E12.
+"""
+import re
+
+DEFAULT_ROWS = 12
+DEFAULT_COLUMNS = 5
+
+_RACK_ID = re.compile(r"([A-Za-z]+)(\d+)$")
+
+
+def column_label(col):
+    """Letters of the zero-based column ``col``."""
+    label = ""
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        label = chr(65 + rem) + label
+    return label
+
+
+def rack_id(col, row):
+    """Rack id of the zero-based (column, row) position."""
+    return f"{column_label(col)}{row + 1}"
+
+
+def parse_rack_id(rack_id):
+    """Zero-based (column, row) of a rack id such as "AB12"."""
+    match = _RACK_ID.match(str(rack_id))
+    if match is None:
+        raise ValueError(f"Invalid rack id: {rack_id}")
+    col = 0
+    for letter in match.group(1).upper():
+        col = col * 26 + ord(letter) - 64
+    return col - 1, int(match.group(2)) - 1
@@ -0,0 +1,238 @@
+"""Monte Carlo uncertainty propagation through the batch cooling models.
+
+Samples are drawn and evaluated in fixed-size batches and folded into
+streaming statistics, so memory stays bounded however many samples are run.
+Batch ``k`` always uses the random stream ``(seed, k)`` and batches are merged
+in order, so a seeded run gives the same numbers for any worker count.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from datacool.batch import default_arguments, evaluate_arguments
+from datacool.sweep import model_outputs, model_parameter
+
+
+class Uniform:
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def sample(self, rng, size):
+        return rng.uniform(self.low, self.high, size)
+
+
+class Normal:
+    """Normal distribution, optionally clipped to [low, high]."""
+
+    def __init__(self, mean, std, low=None, high=None):
+        self.mean = mean
+        self.std = std
+        self.low = low
+        self.high = high
+
+    def sample(self, rng, size):
+        values = rng.normal(self.mean, self.std, size)
+        if self.low is not None or self.high is not None:
+            values = np.clip(values, self.low, self.high)
+        return values
+
+
+class Triangular:
+    def __init__(self, low, mode, high):
+        self.low = low
+        self.mode = mode
+        self.high = high
+
+    def sample(self, rng, size):
+        return rng.triangular(self.low, self.mode, self.high, size)
+
+
+class LogNormal:
+    """Log-normal distribution parameterised by the mean and sigma of the underlying normal."""
+
+    def __init__(self, mean, sigma):
+        self.mean = mean
+        self.sigma = sigma
+
+    def sample(self, rng, size):
+        return rng.lognormal(self.mean, self.sigma, size)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so any quantile
+    is returned within ``relative_accuracy`` of an actual sample and memory
+    grows only with the log of the value range.
+    """
+
+    def __init__(self, relative_accuracy=0.001):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+
+    def _add(self, store, values):
+        index = np.ceil(np.log(values) / self.log_gamma).astype(np.int64)
+        keys, counts = np.unique(index, return_counts=True)
+        for key, n in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + n
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        self._add(self.positive, values[values > 0])
+        self._add(self.negative, -values[values < 0])
+        self.zeros += int(np.count_nonzero(values == 0))
+        self.count += values.size
+
+    def merge(self, other):
+        for key, n in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + n
+        for key, n in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def _value(self, key):
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+
+class StreamingStats:
+    """Running count, mean, variance, extremes and quantile sketch of one output."""
+
+    def __init__(self, relative_accuracy=0.001):
+        self.count = 0
+        self.invalid = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def _combine(self, count, mean, m2):
+        # Chan et al. pairwise update, stable for large counts.
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        finite = values[np.isfinite(values)]
+        self.invalid += values.size - finite.size
+        if finite.size == 0:
+            return
+        mean = float(finite.mean())
+        self._combine(finite.size, mean, float(((finite - mean)**2).sum()))
+        self.min = min(self.min, float(finite.min()))
+        self.max = max(self.max, float(finite.max()))
+        self.sketch.update(finite)
+
+    def merge(self, other):
+        self.invalid += other.invalid
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.sketch.merge(other.sketch)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    def quantile(self, q):
+        # Bucket midpoints can overshoot the observed range slightly.
+        return min(max(self.sketch.quantile(q), self.min), self.max)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "invalid": self.invalid,
+            "mean": float(self.mean),
+            "std": math.sqrt(self.variance) if self.count > 1 else math.nan,
+            "variance": float(self.variance),
+            "min": self.min,
+            "max": self.max,
+            "p5": self.quantile(0.05),
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+        }
+
+
+def _run_batches(distributions, cooling_type, base, outputs, seed, samples, batch_size, first, last, relative_accuracy):
+    batches = []
+    for batch in range(first, last):
+        size = min(batch_size, samples - batch * batch_size)
+        rng = np.random.default_rng([seed, batch])
+        arguments = dict(base)
+        for name, distribution in distributions.items():
+            arguments[model_parameter(name, cooling_type)] = distribution.sample(rng, size)
+        results = evaluate_arguments(arguments, cooling_type, rounded=False)
+        stats = {}
+        for key in outputs:
+            stats[key] = StreamingStats(relative_accuracy)
+            stats[key].update(np.broadcast_to(results[key], (size,)))
+        batches.append((batch, stats))
+    return batches
+
+
+def run_monte_carlo(distributions, cooling_type, samples, rack=None, seed=None, outputs=None,
+                    workers=1, batch_size=100000, relative_accuracy=0.001):
+    """Propagate input distributions through the model for ``cooling_type``.
+
+    ``distributions`` maps rack_data fields or model keywords to distribution
+    objects; every other input keeps its value from ``rack``. Returns a dict of
+    StreamingStats per output; call ``summary()`` on each for plain numbers.
+    """
+    seed = np.random.SeedSequence(seed).entropy
+    base = default_arguments(cooling_type, rack)
+    outputs = tuple(outputs or model_outputs(cooling_type))
+    n_batches = -(-int(samples) // batch_size)
+    workers = workers or os.cpu_count() or 1
+    common = (distributions, cooling_type, base, outputs, seed, int(samples), batch_size)
+    totals = {key: StreamingStats(relative_accuracy) for key in outputs}
+
+    def merge(batches):
+        for _, stats in batches:
+            for key in outputs:
+                totals[key].merge(stats[key])
+
+    if workers == 1 or n_batches == 1:
+        for batch in range(n_batches):
+            merge(_run_batches(*common, batch, batch + 1, relative_accuracy))
+    else:
+        # More tasks than workers so stragglers even out; results are merged in
+        # batch order and released as soon as they are folded in.
+        step = max(1, n_batches // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_batches, *common, first, min(first + step, n_batches), relative_accuracy)
+                       for first in range(0, n_batches, step)]
+            for i, future in enumerate(futures):
+                merge(future.result())
+                futures[i] = None
+    return totals
@@ -0,0 +1,207 @@
+"""Per-rack design optimization: cheapest settings that keep servers cool enough.
+
+For every rack, ``optimize_racks`` looks for the design variables (flow rate
+and pipe flow area for immersion, fan airflow for air) that minimize
+``annual_cost`` while ``server_temp`` stays at or below a limit and every
+variable stays within its equipment bounds. All racks are solved together:
+each search step is one batch evaluation of the cooling model over the whole
+hall, and large halls are split into chunks that run in a process pool.
+
+Variables are optimized one at a time, repeated for a few sweeps when there
+are several. For each one the feasible range is found by bisection on the
+temperature limit, then the cost is minimized over that range by golden
+section search. Both searches work on the logarithm of the variable, since
+the bounds span orders of magnitude. This assumes the temperature is
+monotonic and the cost unimodal in each variable, which holds for both models.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from datacool.batch import evaluate_arguments, rack_arguments
+from datacool.sweep import model_outputs, model_parameter
+
+# rack_data field -> default (low, high) equipment bounds
+DESIGN_VARIABLES = {
+    "Immersion": {"flow_rate": (0.005, 0.5), "flow_area": (0.00196, 0.0314)},
+    "Air": {"fan_airflow": (0.01, 1.0)},
+}
+_INVPHI = (math.sqrt(5) - 1) / 2
+
+
+class _Problem:
+    """One chunk of racks: fixed model arguments, the variables and their bounds in log space."""
+
+    def __init__(self, arguments, cooling_type, max_server_temp, variables, bounds):
+        self.arguments = arguments
+        self.cooling_type = cooling_type
+        self.limit = max_server_temp
+        self.keywords = [model_parameter(name, cooling_type) for name in variables]
+        self.bounds = [(np.log(low), np.log(high)) for low, high in bounds]
+
+    def evaluate(self, values, rounded=False):
+        arguments = dict(self.arguments)
+        for keyword, value in zip(self.keywords, values):
+            arguments[keyword] = np.exp(value)
+        return evaluate_arguments(arguments, self.cooling_type, rounded=rounded)
+
+    def with_value(self, values, i, value):
+        values = list(values)
+        values[i] = value
+        return values
+
+    def feasible(self, values, i, value):
+        temp = self.evaluate(self.with_value(values, i, value))["server_temp"]
+        return temp <= self.limit, temp
+
+    def cost(self, values, i, value):
+        results = self.evaluate(self.with_value(values, i, value))
+        ok = results["valid"] & (results["server_temp"] <= self.limit)
+        return np.where(ok, results["annual_cost"], np.inf)
+
+
+def _feasible_range(problem, values, i, iterations):
+    """Part of variable ``i``'s bounds meeting the temperature limit, per rack.
+
+    Racks that cannot meet the limit anywhere in the bounds get the single
+    point with the lowest temperature.
+    """
+    lo, hi = problem.bounds[i]
+    ok_lo, temp_lo = problem.feasible(values, i, lo)
+    ok_hi, temp_hi = problem.feasible(values, i, hi)
+    inside = np.where(ok_lo, lo, hi)
+    outside = np.where(ok_lo, hi, lo)
+    for _ in range(iterations):
+        mid = 0.5 * (inside + outside)
+        ok, _ = problem.feasible(values, i, mid)
+        inside = np.where(ok, mid, inside)
+        outside = np.where(ok, outside, mid)
+    coolest = np.where(temp_hi < temp_lo, hi, lo)
+    low = np.where(ok_lo, lo, np.where(ok_hi, inside, coolest))
+    high = np.where(ok_hi, hi, np.where(ok_lo, inside, coolest))
+    return low, high
+
+
+def _golden_section(problem, values, i, a, b, iterations):
+    """Per-rack minimizer of the cost over variable ``i`` in [a, b]."""
+    c = b - _INVPHI * (b - a)
+    d = a + _INVPHI * (b - a)
+    fc = problem.cost(values, i, c)
+    fd = problem.cost(values, i, d)
+    for _ in range(iterations):
+        left = fc <= fd
+        b = np.where(left, d, b)
+        a = np.where(left, a, c)
+        x = np.where(left, b - _INVPHI * (b - a), a + _INVPHI * (b - a))
+        fx = problem.cost(values, i, x)
+        c, d, fc, fd = (np.where(left, x, d), np.where(left, c, x),
+                        np.where(left, fx, fd), np.where(left, fc, fx))
+    best = np.where(fc <= fd, c, d)
+    f_best = np.minimum(fc, fd)
+    # The optimum often sits on an end of the range, e.g. the smallest flow
+    # that meets the temperature limit; golden section only approaches it.
+    for end in (a, b):
+        f_end = problem.cost(values, i, end)
+        better = f_end < f_best
+        best = np.where(better, end, best)
+        f_best = np.where(better, f_end, f_best)
+    return best
+
+
+def _solve(problem, start, tolerance, sweeps):
+    """Optimal variable values (log space) for every rack of ``problem``."""
+    values = [np.clip(np.log(value), lo, hi) for value, (lo, hi) in zip(start, problem.bounds)]
+    width = max(hi - lo for lo, hi in problem.bounds) or 1.0
+    # Both searches stop once the bracket is below ``tolerance`` relative to the variable.
+    bisections = max(1, math.ceil(math.log2(width / tolerance)))
+    golden = max(1, math.ceil(math.log(tolerance / width) / math.log(_INVPHI)))
+    for _ in range(sweeps if len(values) > 1 else 1):
+        previous = [value.copy() for value in values]
+        for i in range(len(values)):
+            low, high = _feasible_range(problem, values, i, bisections)
+            values[i] = _golden_section(problem, values, i, low, high, golden)
+        if all(np.all(np.abs(value - old) <= tolerance) for value, old in zip(values, previous)):
+            break
+    return values
+
+
+def _optimize_chunk(arguments, cooling_type, max_server_temp, variables, bounds, start, tolerance, sweeps):
+    problem = _Problem(arguments, cooling_type, max_server_temp, variables, bounds)
+    values = _solve(problem, start, tolerance, sweeps)
+    exact = problem.evaluate(values)
+    results = problem.evaluate(values, rounded=True)
+    results["feasible"] = exact["valid"] & (exact["server_temp"] <= max_server_temp)
+    for name, value in zip(variables, values):
+        results[name] = np.exp(value)
+    return results
+
+
+def _slice(value, size, start, stop):
+    value = np.asarray(value)
+    if value.ndim == 0:
+        return value
+    return np.broadcast_to(value, (size,))[start:stop]
+
+
+def optimize_racks(racks, cooling_type, max_server_temp, variables=None, bounds=None, tolerance=1e-6,
+                   sweeps=3, workers=None, chunk_size=50000):
+    """Minimum ``annual_cost`` design for every rack in ``racks``.
+
+    ``racks`` is a column dict, structured array or DataFrame as accepted by
+    ``evaluate_racks``; the racks' current values of the design variables are
+    the starting point. ``max_server_temp`` and the ``(low, high)`` entries of
+    ``bounds`` may be scalars or per-rack arrays. ``variables`` defaults to the
+    DESIGN_VARIABLES of ``cooling_type``; other numeric rack_data fields can be
+    optimized when ``bounds`` covers them. ``workers=None`` uses all cores for
+    halls larger than ``chunk_size``, ``1`` runs in-process.
+
+    Returns a dict of arrays: the optimal value of each variable, the model
+    outputs at that design, ``valid``, ``feasible`` (the limit is met within
+    the bounds) and ``current_annual_cost`` for the racks as given.
+    """
+    variables = tuple(variables or DESIGN_VARIABLES[cooling_type])
+    bounds = dict(DESIGN_VARIABLES[cooling_type], **(bounds or {}))
+    missing = [name for name in variables if name not in bounds]
+    if missing:
+        raise ValueError(f"No bounds given for design variable(s): {', '.join(missing)}")
+    bounds = [tuple(np.asarray(bound, dtype=float) for bound in bounds[name]) for name in variables]
+    if any(np.any(low <= 0) or np.any(high < low) for low, high in bounds):
+        raise ValueError("Design variable bounds must satisfy 0 < low <= high")
+
+    arguments = rack_arguments(racks, cooling_type)
+    current = evaluate_arguments(arguments, cooling_type, rounded=False)
+    size = int(np.prod(np.broadcast_shapes(np.shape(current["valid"]),
+                                           *(np.shape(v) for bound in bounds for v in bound),
+                                           np.shape(max_server_temp))))
+    start = [np.broadcast_to(np.asarray(arguments[model_parameter(name, cooling_type)], dtype=float), (size,))
+             for name in variables]
+
+    outputs = model_outputs(cooling_type) + ("valid", "feasible") + variables
+    results = {key: np.empty(size, dtype=bool if key in ("valid", "feasible") else float) for key in outputs}
+    results["current_annual_cost"] = np.broadcast_to(current["annual_cost"], (size,)).copy()
+
+    def chunk(first, stop):
+        return ({key: _slice(value, size, first, stop) for key, value in arguments.items()}, cooling_type,
+                _slice(max_server_temp, size, first, stop), variables,
+                [tuple(_slice(v, size, first, stop) for v in bound) for bound in bounds],
+                [value[first:stop] for value in start], tolerance, sweeps)
+
+    def store(first, chunk_results):
+        stop = first + len(chunk_results["feasible"])
+        for key in outputs:
+            results[key][first:stop] = chunk_results[key]
+
+    starts = range(0, size, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(starts) == 1:
+        for first in starts:
+            store(first, _optimize_chunk(*chunk(first, min(first + chunk_size, size))))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_optimize_chunk, *chunk(first, min(first + chunk_size, size))): first
+                       for first in starts}
+            for future in as_completed(futures):
+                store(futures[future], future.result())
+    return results
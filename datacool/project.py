@@ -0,0 +1,140 @@
+"""Project files: rack inputs, floor layout and cached results of a facility.
+
+Two flavours hold the same content:
+
+- JSON (``.json``), readable and diffable, with arrays written as lists;
+- binary (``.dcsim``): an 8-byte magic, the length of a JSON header, the
+  header itself, then every array as raw little-endian bytes aligned to 64
+  bytes. The header records each array's dtype, shape and offset from the
+  first aligned byte after the header, so loading
+  maps the file and hands out views; a column is read from disk only when it
+  is first touched.
+
+Both cooling types are stored, each as a RackStore plus a ResultTable.
+"""
+import json
+import struct
+
+import numpy as np
+
+from datacool.layout import DEFAULT_COLUMNS, DEFAULT_ROWS
+from datacool.results import ResultTable
+from datacool.store import RackStore
+
+FORMAT_NAME = "datacool-project"
+FORMAT_VERSION = 1
+MAGIC = b"DCSIMPRJ"
+ALIGNMENT = 64
+COOLING_TYPES = ("Immersion", "Air")
+
+
+class Project:
+    """Everything needed to restore the simulator: per-cooling-type racks and results, and the floor size."""
+
+    def __init__(self, cooling_type="Immersion", rows=DEFAULT_ROWS, columns=DEFAULT_COLUMNS, stores=None, results=None):
+        self.cooling_type = cooling_type
+        self.rows = rows
+        self.columns = columns
+        self.stores = stores or {ct: RackStore(ct) for ct in COOLING_TYPES}
+        self.results = results or {ct: ResultTable(ct) for ct in COOLING_TYPES}
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "json" if path.endswith(".json") else "binary"
+
+
+def _split(project):
+    """Header and flat name -> array mapping of a project."""
+    header = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "cooling_type": project.cooling_type,
+              "layout": {"rows": project.rows, "columns": project.columns}, "stores": {}, "results": {}}
+    arrays = {}
+    for section, items in (("stores", project.stores), ("results", project.results)):
+        for cooling_type, item in items.items():
+            meta, item_arrays = item.state()
+            header[section][cooling_type] = meta
+            for name, array in item_arrays.items():
+                arrays[f"{section}/{cooling_type}/{name}"] = np.ascontiguousarray(array)
+    return header, arrays
+
+
+def _join(header, arrays):
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError("Not a DataCoolSim project file")
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Project file version {header['version']} is newer than this program supports")
+
+    def section_arrays(section, cooling_type):
+        prefix = f"{section}/{cooling_type}/"
+        return {name[len(prefix):]: array for name, array in arrays.items() if name.startswith(prefix)}
+
+    stores = {ct: RackStore.from_state(ct, meta, section_arrays("stores", ct)) for ct, meta in header["stores"].items()}
+    results = {ct: ResultTable.from_state(ct, meta, section_arrays("results", ct))
+               for ct, meta in header["results"].items()}
+    layout = header["layout"]
+    return Project(header["cooling_type"], layout["rows"], layout["columns"], stores, results)
+
+
+def save_project(path, project, fmt=None):
+    header, arrays = _split(project)
+    if detect_format(path, fmt) == "json":
+        header["arrays"] = {name: {"dtype": array.dtype.str, "shape": list(array.shape),
+                                   "data": np.where(np.isnan(array), None, array).tolist()
+                                   if array.dtype.kind == "f" else array.tolist()}
+                            for name, array in arrays.items()}
+        with open(path, "w") as f:
+            json.dump(header, f, indent=1)
+        return
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = arrays[name] = array.astype(array.dtype.newbyteorder("<"), copy=False)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+    header["arrays"] = layout
+    encoded = json.dumps(header).encode()
+    start = _aligned(len(MAGIC) + 8 + len(encoded))
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(encoded)) + encoded)
+        for name, array in arrays.items():
+            f.seek(start + layout[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(start + offset)
+
+
+def load_project(path, fmt=None, mmap=True):
+    """Project stored at ``path``.
+
+    Binary files are memory-mapped copy-on-write unless ``mmap`` is False:
+    edits after loading never touch the file, and untouched columns are never
+    read.
+    """
+    if detect_format(path, fmt) == "json":
+        with open(path) as f:
+            header = json.load(f)
+        arrays = {}
+        for name, entry in header.pop("arrays").items():
+            array = np.array(entry["data"], dtype=float if np.dtype(entry["dtype"]).kind == "f" else entry["dtype"])
+            arrays[name] = array.astype(entry["dtype"], copy=False).reshape(entry["shape"])
+        return _join(header, arrays)
+
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a DataCoolSim project file")
+        (length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(length))
+    start = _aligned(len(MAGIC) + 8 + length)
+    buffer = np.memmap(path, dtype=np.uint8, mode="c") if mmap else np.fromfile(path, dtype=np.uint8)
+    arrays = {}
+    for name, entry in header.pop("arrays").items():
+        dtype = np.dtype(entry["dtype"])
+        size = dtype.itemsize * int(np.prod(entry["shape"], dtype=np.int64))
+        offset = start + entry["offset"]
+        arrays[name] = buffer[offset:offset + size].view(dtype).reshape(entry["shape"])
+    return _join(header, arrays)
@@ -0,0 +1,111 @@
+"""Fluid and material property registry.
+
+Properties are read once from ``fluids.json`` and resampled onto a uniform
+temperature grid. A lookup is then an index computation plus one linear blend,
+works on whole arrays of fluid codes and temperatures, and involves no string
+comparisons: names are turned into integer codes once, up front.
+"""
+import functools
+import json
+import math
+import os
+
+import numpy as np
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fluids.json")
+PROPERTIES = ("k", "Cp", "rho", "mu")
+K, CP, RHO, MU = range(len(PROPERTIES))
+GRID_STEP = 0.5
+
+
+def encode(values, names):
+    """Map names to integer codes into a property table; unknown names get len(names)."""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.intp)
+    arr = arr.astype(str)
+    uniq, inverse = np.unique(arr, return_inverse=True)
+    lookup = {name: i for i, name in enumerate(names)}
+    codes = np.array([lookup.get(u, len(names)) for u in uniq], dtype=np.intp)
+    return codes[inverse].reshape(arr.shape)
+
+
+class PropertyRegistry:
+    """Temperature-dependent k, Cp, rho and mu per fluid plus constant material data.
+
+    ``table`` has shape (fluids + 1, properties, temperatures); the extra last
+    fluid row is all NaN and is what unknown fluid names map to. Temperatures
+    outside the tabulated range are clamped to its ends.
+    """
+
+    def __init__(self, data):
+        fluids = data["fluids"]
+        self.fluid_names = tuple(fluids)
+        self.codes = {name: i for i, name in enumerate(self.fluid_names)}
+        self.t_min = min(fluid["temperature"][0] for fluid in fluids.values())
+        self.t_max = max(fluid["temperature"][-1] for fluid in fluids.values())
+        self.grid = np.arange(self.t_min, self.t_max + GRID_STEP / 2, GRID_STEP)
+        self.table = np.full((len(fluids) + 1, len(PROPERTIES), len(self.grid)), np.nan)
+        for i, fluid in enumerate(fluids.values()):
+            for j, prop in enumerate(PROPERTIES):
+                values = np.asarray(fluid[prop], dtype=float)
+                if prop == "mu":
+                    # Viscosity is close to exponential in temperature, so blend its log.
+                    values = np.exp(np.interp(self.grid, fluid["temperature"], np.log(values)))
+                else:
+                    values = np.interp(self.grid, fluid["temperature"], values)
+                self.table[i, j] = values
+
+        materials = data["materials"]
+        self.material_names = tuple(materials)
+        self.material_properties = tuple(sorted({key for props in materials.values() for key in props}))
+        self.materials = np.full((len(materials) + 1, len(self.material_properties)), np.nan)
+        for i, props in enumerate(materials.values()):
+            for j, key in enumerate(self.material_properties):
+                if props.get(key) is not None:
+                    self.materials[i, j] = props[key]
+
+    def fluid_code(self, names):
+        return encode(names, self.fluid_names)
+
+    def material_code(self, names):
+        return encode(names, self.material_names)
+
+    def lookup(self, codes, temperature, prop):
+        """Property ``prop`` (an index such as MU) for fluid codes at temperatures, vectorized."""
+        x = (np.asarray(temperature, dtype=float) - self.t_min) / GRID_STEP
+        missing = np.isnan(x)
+        x = np.clip(np.where(missing, 0, x), 0, len(self.grid) - 1)
+        i = np.minimum(x.astype(np.intp), len(self.grid) - 2)
+        frac = x - i
+        column = self.table[:, prop]
+        values = column[codes, i] * (1 - frac) + column[codes, i + 1] * frac
+        return np.where(missing, np.nan, values)
+
+    def material(self, codes, prop):
+        return self.materials[codes, self.material_properties.index(prop)]
+
+
+@functools.lru_cache(maxsize=None)
+def get_registry(path=DATA_FILE):
+    """The registry for ``path``, loaded and resampled only on first use."""
+    with open(path) as f:
+        return PropertyRegistry(json.load(f))
+
+
+@functools.lru_cache(maxsize=4096)
+def fluid_properties(name, temperature):
+    """Scalar k, Cp, rho and mu of ``name`` at ``temperature`` as a dict of floats."""
+    registry = get_registry()
+    code = registry.fluid_code(name)
+    if code == len(registry.fluid_names):
+        raise ValueError(f"Unknown fluid type: {name}")
+    return {prop: float(registry.lookup(code, temperature, j)) for j, prop in enumerate(PROPERTIES)}
+
+
+@functools.lru_cache(maxsize=None)
+def material_property(name, prop):
+    """Scalar material property, or None when the registry has no value for it."""
+    registry = get_registry()
+    value = float(registry.material(registry.material_code(name), prop))
+    return None if math.isnan(value) else value
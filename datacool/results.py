@@ -0,0 +1,146 @@
+"""Per-rack results kept as columns.
+
+The GUI fills a ResultTable as calculation chunks arrive and shows it through
+a table model; exports read it back in chunks. A rack's row is reused when it
+is recomputed, so the table never holds more rows than there are racks.
+"""
+import numpy as np
+
+from datacool.batch import AIR_OUTPUTS, IMMERSION_OUTPUTS
+from datacool.export import write_chunks
+from datacool.layout import parse_rack_id, rack_id as make_rack_id
+
+
+class ResultTable:
+    """Growable output columns plus a validity flag and error text per rack.
+
+    Racks are stored by (column, row) coordinates; the rack id -> row index
+    is built only when first needed, so a table loaded from a project file is
+    usable at once. ``current`` is False for rows whose inputs changed since
+    they were computed; they keep their old values until the next calculation.
+    """
+
+    def __init__(self, cooling_type, capacity=64):
+        self.cooling_type = cooling_type
+        self.outputs = IMMERSION_OUTPUTS if cooling_type == "Immersion" else AIR_OUTPUTS
+        self.size = 0
+        self.errors = {}
+        self._index = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.coords = np.zeros((capacity, 2), dtype=np.int32)
+        self.values = {key: np.full(capacity, np.nan) for key in self.outputs}
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.current = np.zeros(capacity, dtype=bool)
+
+    def _grow(self, capacity):
+        self.coords = np.resize(self.coords, (capacity, 2))
+        self.values = {key: np.resize(column, capacity) for key, column in self.values.items()}
+        self.valid = np.resize(self.valid, capacity)
+        self.current = np.resize(self.current, capacity)
+
+    @property
+    def index(self):
+        """(column, row) -> table row."""
+        if self._index is None:
+            self._index = {tuple(key): row for row, key in enumerate(self.coords[:self.size].tolist())}
+        return self._index
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, rack_id):
+        return parse_rack_id(rack_id) in self.index
+
+    def rack_id(self, row):
+        col, rack_row = self.coords[row]
+        return make_rack_id(int(col), int(rack_row))
+
+    def is_current(self, rack_id):
+        row = self.index.get(parse_rack_id(rack_id))
+        return row is not None and bool(self.current[row])
+
+    def update(self, results, errors=None):
+        """Store ``results`` (rack_id -> result dict); returns the rows that changed.
+
+        ``errors`` maps rack ids of invalid results to the message to show.
+        """
+        index = self.index
+        changed = []
+        for rack_id, result in results.items():
+            key = parse_rack_id(rack_id)
+            row = index.get(key)
+            if row is None:
+                row = self.size
+                if row == len(self.valid):
+                    self._grow(max(2 * row, 64))
+                self.coords[row] = key
+                index[key] = row
+                self.size += 1
+            for name in self.outputs:
+                self.values[name][row] = result[name]
+            self.valid[row] = result["valid"]
+            self.current[row] = True
+            self.errors.pop(row, None)
+            if errors and rack_id in errors:
+                self.errors[row] = errors[rack_id]
+            changed.append(row)
+        return changed
+
+    def state(self):
+        """``(meta, arrays)`` describing the table, for saving in a project file."""
+        n = self.size
+        meta = {"errors": {str(row): message for row, message in self.errors.items()}}
+        arrays = {"coords": self.coords[:n], "valid": self.valid[:n], "current": self.current[:n]}
+        arrays.update({key: column[:n] for key, column in self.values.items()})
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, cooling_type, meta, arrays):
+        """Table rebuilt from ``state()`` output; columns are only read when used."""
+        table = cls(cooling_type, capacity=0)
+        table.coords = arrays["coords"]
+        table.size = len(table.coords)
+        table._index = None
+        table.errors = {int(row): message for row, message in meta["errors"].items()}
+        table.values = {key: arrays[key] for key in table.outputs}
+        table.valid = arrays["valid"]
+        table.current = arrays["current"]
+        return table
+
+    def invalidate(self):
+        self.current[:self.size] = False
+
+    def clear(self):
+        self.size = 0
+        self.errors = {}
+        self._index = {}
+
+    def column(self, key):
+        return self.values[key][:self.size]
+
+    def metric(self, key):
+        """rack_id -> value of output ``key`` for the valid racks."""
+        rows = np.flatnonzero(self.valid[:self.size])
+        values = self.values[key][rows].tolist()
+        return {make_rack_id(col, row): value for (col, row), value in zip(self.coords[rows].tolist(), values)}
+
+    @property
+    def header(self):
+        return ["rack_id", *self.outputs, "error"]
+
+    def chunks(self, chunk_size=10000):
+        """Column dicts of at most ``chunk_size`` rows; invalid outputs are None."""
+        for start in range(0, self.size, chunk_size):
+            stop = min(start + chunk_size, self.size)
+            valid = self.valid[start:stop]
+            columns = {"rack_id": [make_rack_id(col, row) for col, row in self.coords[start:stop].tolist()]}
+            for key in self.outputs:
+                columns[key] = np.where(valid, self.values[key][start:stop], None).tolist()
+            columns["error"] = [self.errors.get(row, "") for row in range(start, stop)]
+            yield columns
+
+    def export(self, path, fmt=None, chunk_size=10000):
+        """Write the table to CSV, JSON Lines or Parquet without materializing it whole."""
+        return write_chunks(self.chunks(chunk_size), path, self.header, fmt)
@@ -0,0 +1,237 @@
+"""Side-by-side comparison of named scenarios on the same site.
+
+A scenario is one way of running the site's racks: a cooling type, the rack
+inputs for it and any model overrides (a different fluid, a different
+electricity price). ``run_scenarios`` evaluates any number of them on the
+same racks and ``ScenarioResults.delta_table`` compares each one with a
+baseline, hall by hall: temperature, cooling power, annual cost and the
+payback time of the extra capital cost.
+
+With several workers, every (scenario, chunk of racks) pair is a task in a
+process pool. The scenarios reach each worker once, through the pool
+initializer, and the workers write their outputs straight into result arrays
+in shared memory; a task returns nothing, so no per-rack results are pickled.
+"""
+import inspect
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from datacool.batch import BatchCoolingCalculations, evaluate_racks
+from datacool.properties import get_registry
+from datacool.sweep import model_parameter
+
+COMPARE_OUTPUTS = ("server_temp", "total_cooling_energy", "annual_cost")
+SITE = "site"
+MODEL_FUNCTIONS = {"Immersion": BatchCoolingCalculations.calculateICoolingEnergy,
+                   "Air": BatchCoolingCalculations.calculateACoolingEnergy}
+
+
+def model_keywords(cooling_type):
+    """Keywords the batch model of ``cooling_type`` accepts as overrides."""
+    return set(inspect.signature(MODEL_FUNCTIONS[cooling_type]).parameters) - {"rounded"}
+
+
+def _check_override(key, keyword, value, cooling_type):
+    if keyword not in model_keywords(cooling_type):
+        raise ValueError(f"Unknown {cooling_type.lower()} setting {key!r}")
+    if isinstance(value, str) and not value.strip():
+        raise ValueError(f"Setting {key!r} has no value")
+    registry = get_registry()
+    names = {"fluidType": registry.fluid_names, "insulation": registry.material_names}.get(keyword)
+    if names is not None and isinstance(value, str) and value not in names:
+        raise ValueError(f"Unknown {key} {value!r}; choose one of {', '.join(names)}")
+
+
+class Scenario:
+    """A named cooling type, its rack columns and model overrides.
+
+    ``racks`` is a column dict as for ``evaluate_racks``; scenarios of one
+    comparison may share the same dict. ``overrides`` take rack_data field
+    names or model keywords (``fluid_type``, ``electricity_cost``).
+    ``capital_cost`` is the upgrade cost per rack, a scalar or one value per
+    rack, used for payback times.
+    """
+
+    def __init__(self, name, cooling_type, racks, overrides=None, capital_cost=0.0):
+        if cooling_type not in ("Immersion", "Air"):
+            raise ValueError(f"Unknown cooling type {cooling_type!r}")
+        self.name = name
+        self.cooling_type = cooling_type
+        self.racks = racks
+        self.overrides = {}
+        for key, value in (overrides or {}).items():
+            keyword = model_parameter(key, cooling_type)
+            _check_override(key, keyword, value, cooling_type)
+            self.overrides[keyword] = value
+        self.capital_cost = capital_cost
+
+    def __repr__(self):
+        return f"Scenario({self.name!r}, {self.cooling_type!r})"
+
+    def evaluate(self, start, stop, outputs):
+        """``outputs`` and ``valid`` of racks ``start:stop``; outputs the model lacks are NaN."""
+        chunk = {key: column[start:stop] if np.ndim(column) else column for key, column in self.racks.items()}
+        results = evaluate_racks(chunk, self.cooling_type, rounded=False, **self.overrides)
+        values = np.full((len(outputs), stop - start), np.nan)
+        for i, key in enumerate(outputs):
+            if key in results:
+                values[i] = results[key]
+        return values, np.broadcast_to(results["valid"], (stop - start,))
+
+
+def rack_count(racks):
+    sizes = {len(column) for column in racks.values() if np.ndim(column)}
+    if len(sizes) != 1:
+        raise ValueError("Rack columns must all have the same length")
+    return sizes.pop()
+
+
+# Per-process state set by the pool initializer, so each task only ships indices.
+_worker = {}
+
+
+def _init_worker(scenarios, outputs, values, valid):
+    size = len(valid) // len(scenarios)
+    _worker.update(scenarios=scenarios, outputs=outputs,
+                   values=np.frombuffer(values, dtype=float).reshape(len(scenarios), len(outputs), size),
+                   valid=np.frombuffer(valid, dtype=np.uint8).reshape(len(scenarios), size))
+
+
+def _run_chunk(index, start, stop):
+    w = _worker
+    w["values"][index, :, start:stop], w["valid"][index, start:stop] = \
+        w["scenarios"][index].evaluate(start, stop, w["outputs"])
+
+
+class ScenarioResults:
+    """Per-rack outputs of every scenario, as ``values[scenario, output, rack]`` and ``valid[scenario, rack]``.
+
+    ``halls`` assigns each rack to a hall; all racks form one hall when it is
+    None.
+    """
+
+    def __init__(self, scenarios, outputs, values, valid, halls=None):
+        self.scenarios = list(scenarios)
+        self.names = [scenario.name for scenario in self.scenarios]
+        self.outputs = tuple(outputs)
+        self.values = values
+        self.valid = valid
+        size = values.shape[2]
+        if halls is None:
+            self.halls, self.hall_index = np.array([SITE]), np.zeros(size, dtype=np.intp)
+        else:
+            self.halls, self.hall_index = np.unique(np.asarray(halls), return_inverse=True)
+
+    def __getitem__(self, name):
+        """Output arrays and ``valid`` of one scenario."""
+        index = self.names.index(name)
+        results = dict(zip(self.outputs, self.values[index]))
+        results["valid"] = self.valid[index]
+        return results
+
+    def _capital(self, index):
+        return np.broadcast_to(np.asarray(self.scenarios[index].capital_cost, dtype=float), self.valid[index].shape)
+
+    def _hall_sums(self, weights, mask):
+        return np.bincount(self.hall_index, weights=np.where(mask, weights, 0.0), minlength=len(self.halls))
+
+    def delta_table(self, baseline=None):
+        """One row per hall and scenario comparing it with ``baseline`` (the first scenario by default).
+
+        Only racks valid in both scenarios are compared; the others are
+        counted in ``invalid_racks``. Temperatures are means over a hall,
+        cooling power, cost and capital are totals. ``payback_years`` is
+        the extra capital over the annual saving: zero when there is no extra
+        capital and nothing is lost each year, infinite when the scenario
+        never recovers its cost. A hall with no racks to compare has NaN
+        outputs. When there are several halls a final ``site`` row adds them
+        up.
+        """
+        base = self.names.index(baseline if baseline is not None else self.names[0])
+        columns = {key: self.outputs.index(key) for key in COMPARE_OUTPUTS if key in self.outputs}
+        rows = []
+        for index, name in enumerate(self.names):
+            if index == base:
+                continue
+            both = self.valid[index] & self.valid[base]
+            counts = self._hall_sums(np.ones(both.shape), both)
+            totals = {"racks": np.bincount(self.hall_index, minlength=len(self.halls)).astype(float),
+                      "compared": counts}
+            for key, column in columns.items():
+                totals[key] = self._hall_sums(self.values[index, column], both)
+                totals[f"baseline_{key}"] = self._hall_sums(self.values[base, column], both)
+            totals["capital_cost"] = self._hall_sums(self._capital(index) - self._capital(base), both)
+            halls = self.halls.tolist()
+            if len(halls) > 1:
+                totals = {key: np.append(value, value.sum()) for key, value in totals.items()}
+                halls.append(SITE)
+            for h, hall in enumerate(halls):
+                rows.append(self._row(name, self.names[base], hall, {key: float(v[h]) for key, v in totals.items()}))
+        return rows
+
+    @staticmethod
+    def _row(name, baseline, hall, totals):
+        compared = totals["compared"]
+        row = {"scenario": name, "baseline": baseline, "hall": hall,
+               "racks": int(totals["racks"]), "invalid_racks": int(totals["racks"] - compared)}
+        for key in COMPARE_OUTPUTS:
+            if key not in totals:
+                continue
+            value, base_value = totals[key], totals[f"baseline_{key}"]
+            if not compared:
+                value = base_value = math.nan
+            elif key == "server_temp":
+                value, base_value = value / compared, base_value / compared
+            row[key] = value
+            row[f"delta_{key}"] = value - base_value
+        row["capital_cost"] = totals["capital_cost"] if compared else math.nan
+        saving = -row.get("delta_annual_cost", math.nan)
+        if not compared:
+            row["payback_years"] = math.nan
+        elif row["capital_cost"] <= 0 and saving >= 0:
+            row["payback_years"] = 0.0
+        elif saving > 0:
+            row["payback_years"] = row["capital_cost"] / saving
+        else:
+            row["payback_years"] = math.inf
+        return row
+
+
+def run_scenarios(scenarios, halls=None, outputs=COMPARE_OUTPUTS, workers=None, chunk_size=50000):
+    """Evaluate every scenario on the same racks; returns ScenarioResults.
+
+    ``workers=None`` uses all cores, ``1`` runs in-process. ``halls`` gives
+    the hall of each rack for the delta tables.
+    """
+    scenarios = list(scenarios)
+    names = [scenario.name for scenario in scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError("Scenario names must be unique")
+    sizes = {rack_count(scenario.racks) for scenario in scenarios}
+    if len(sizes) != 1:
+        raise ValueError("Every scenario must cover the same racks")
+    size = sizes.pop()
+    outputs = tuple(outputs)
+    tasks = [(index, start, min(start + chunk_size, size))
+             for index in range(len(scenarios)) for start in range(0, size, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        values = np.empty((len(scenarios), len(outputs), size))
+        valid = np.empty((len(scenarios), size), dtype=np.uint8)
+        for index, start, stop in tasks:
+            values[index, :, start:stop], valid[index, start:stop] = scenarios[index].evaluate(start, stop, outputs)
+        return ScenarioResults(scenarios, outputs, values, valid.astype(bool), halls)
+
+    shared_values = multiprocessing.RawArray("d", len(scenarios) * len(outputs) * size)
+    shared_valid = multiprocessing.RawArray("B", len(scenarios) * size)
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_init_worker,
+                             initargs=(scenarios, outputs, shared_values, shared_valid)) as pool:
+        for future in [pool.submit(_run_chunk, *task) for task in tasks]:
+            future.result()
+    values = np.frombuffer(shared_values, dtype=float).reshape(len(scenarios), len(outputs), size)
+    valid = np.frombuffer(shared_valid, dtype=np.uint8).reshape(len(scenarios), size).astype(bool)
+    return ScenarioResults(scenarios, outputs, values, valid, halls)
@@ -0,0 +1,334 @@
+"""Local HTTP/JSON service exposing the cooling calculations.
+
+Started with ``python -m datacool serve``, it answers::
+
+    POST /v1/immersion   {"racks": [{"rack_id": "A1", "load": 250}, ...]}
+    POST /v1/air         {"load": 250, "ambient_temp": 30}
+    GET  /v1/metrics
+    GET  /v1/health
+
+Rack fields are the rack_data names used everywhere else, with the GUI
+defaults for anything missing. A body holding a ``racks`` list gets a
+``results`` list back; a bare rack object gets a single result.
+
+Requests arriving close together are coalesced: each cooling type has a
+batcher that collects requests for at most ``max_delay`` seconds or
+``max_batch`` racks, evaluates them with one call of the batch engine in a
+process pool and hands every request its slice of the results. The event
+loop itself only parses and formats JSON. Only the standard library and
+NumPy are needed.
+"""
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from datacool.batch import AIR_OUTPUTS, IMMERSION_OUTPUTS, evaluate_racks
+from datacool.cli import chunk_columns
+from datacool.layout import parse_rack_id
+
+ROUTES = {"/v1/immersion": "Immersion", "/v1/air": "Air"}
+MAX_BODY = 64 * 1024 * 1024
+LATENCY_WINDOW = 10000
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def evaluate_rows(rows, cooling_type):
+    """Result dicts for a list of rack dicts; invalid outputs are None. Runs in the worker processes."""
+    outputs = IMMERSION_OUTPUTS if cooling_type == "Immersion" else AIR_OUTPUTS
+    results = evaluate_racks(chunk_columns(rows, cooling_type), cooling_type)
+    valid = np.broadcast_to(results["valid"], (len(rows),))
+    columns = {key: np.where(valid, np.broadcast_to(results[key], (len(rows),)), None).tolist() for key in outputs}
+    return [dict({key: columns[key][i] for key in outputs}, rack_id=row.get("rack_id"), valid=bool(valid[i]))
+            for i, row in enumerate(rows)]
+
+
+def _ignore_interrupt():
+    # Ctrl+C reaches the whole process group; only the server should handle it.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _normalize(rack):
+    if not isinstance(rack, dict):
+        raise ValueError("Each rack must be a JSON object")
+    if "val" not in rack:
+        # Every row carries its row position, so requests with and without
+        # rack ids can share a batch.
+        rack = dict(rack, val=parse_rack_id(rack.get("rack_id", "A1"))[1] + 1)
+    return rack
+
+
+class Metrics:
+    """Request counts, latency percentiles over the last LATENCY_WINDOW requests and throughput."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.racks = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.largest_batch = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def record_request(self, seconds, ok=True):
+        self.requests += 1
+        self.errors += not ok
+        self.latencies.append(seconds)
+
+    def record_batch(self, requests, racks):
+        self.batches += 1
+        self.batched_requests += requests
+        self.racks += racks
+        self.largest_batch = max(self.largest_batch, racks)
+
+    def snapshot(self, queued=0):
+        uptime = time.monotonic() - self.started
+        latencies = np.array(self.latencies) * 1e3
+        percentiles = dict(zip(("p50", "p95", "p99", "max"), np.percentile(latencies, [50, 95, 99, 100]).tolist())
+                           if len(latencies) else {})
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "racks": self.racks,
+            "batches": self.batches,
+            "mean_requests_per_batch": self.batched_requests / self.batches if self.batches else 0.0,
+            "mean_racks_per_batch": self.racks / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued_requests": queued,
+            "requests_per_s": self.requests / uptime if uptime else 0.0,
+            "racks_per_s": self.racks / uptime if uptime else 0.0,
+            "latency_ms": percentiles,
+        }
+
+
+class MicroBatcher:
+    """Coalesces concurrent requests of one cooling type into batch evaluations.
+
+    At most ``concurrency`` batches are evaluated at once, so a burst queues
+    here instead of piling up in the executor, and the next batch is already
+    collecting while earlier ones run.
+    """
+
+    def __init__(self, cooling_type, executor, metrics, max_batch=4096, max_delay=0.002, concurrency=1):
+        self.cooling_type = cooling_type
+        self.executor = executor
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(concurrency)
+        self.tasks = set()
+        self.runner = None
+
+    def start(self):
+        self.runner = asyncio.ensure_future(self.run())
+
+    async def close(self):
+        if self.runner is not None:
+            self.runner.cancel()
+            await asyncio.gather(self.runner, *self.tasks, return_exceptions=True)
+
+    async def submit(self, racks):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((racks, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        items = [await self.queue.get()]
+        size = len(items[0][0])
+        deadline = loop.time() + self.max_delay
+        while size < self.max_batch:
+            if self.queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self.queue.get_nowait()
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    async def run(self):
+        while True:
+            await self.slots.acquire()
+            try:
+                items = await self._collect()
+            except BaseException:
+                self.slots.release()
+                raise
+            task = asyncio.ensure_future(self._evaluate(items))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _evaluate(self, items):
+        try:
+            rows = [rack for racks, _ in items for rack in racks]
+            loop = asyncio.get_running_loop()
+            try:
+                results = await loop.run_in_executor(self.executor, evaluate_rows, rows, self.cooling_type)
+            except Exception as exc:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+            self.metrics.record_batch(len(items), len(rows))
+            start = 0
+            for racks, future in items:
+                if not future.done():
+                    future.set_result(results[start:start + len(racks)])
+                start += len(racks)
+        finally:
+            self.slots.release()
+
+
+class SimulationService:
+    """The HTTP server plus one MicroBatcher per cooling type.
+
+    ``port=0`` binds a free port, available as ``port`` after ``start()``.
+    ``workers`` is the process pool size (all cores when None); ``0``
+    evaluates in a thread instead, which suits tests and small machines.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, workers=None, max_batch=4096, max_delay=0.002):
+        self.host = host
+        self.port = port
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.metrics = Metrics()
+        self.executor = None
+        self.server = None
+        self.batchers = {}
+
+    async def start(self):
+        if self.workers:
+            # Spawned rather than forked workers: a worker forked while a
+            # request is being served would inherit its socket and keep the
+            # connection open after the server closes it.
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=_ignore_interrupt)
+            await asyncio.get_running_loop().run_in_executor(self.executor, evaluate_rows, [{"val": 1}], "Air")
+        concurrency = max(self.workers, 1)
+        self.batchers = {cooling_type: MicroBatcher(cooling_type, self.executor, self.metrics, self.max_batch,
+                                                    self.max_delay, concurrency)
+                         for cooling_type in ROUTES.values()}
+        for batcher in self.batchers.values():
+            batcher.start()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.close()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                method, path, *version = request_line.decode("latin-1").split()
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Without a usable length the body cannot be skipped, so the connection ends here.
+                    status, document = 400, {"error": "Invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY:
+                    status, document = 413, {"error": "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, document = await self.respond(method, path, body)
+                    keep_alive = headers.get("connection", "").lower() != "close" and version != ["HTTP/1.0"]
+                payload = json.dumps(document).encode()
+                writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, path, body):
+        """``(status, JSON document)`` for one request."""
+        path = path.split("?", 1)[0]
+        if path == "/v1/health":
+            return 200, {"status": "ok"}
+        if path == "/v1/metrics":
+            return 200, self.metrics.snapshot(sum(b.queue.qsize() for b in self.batchers.values()))
+        if path not in ROUTES:
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+
+        started = time.perf_counter()
+        try:
+            document = json.loads(body or b"{}")
+            single = not (isinstance(document, dict) and isinstance(document.get("racks"), list))
+            racks = [_normalize(rack) for rack in ([document] if single else document["racks"])]
+            # Reject bad input here, so it cannot fail a batch shared with other requests.
+            chunk_columns(racks, ROUTES[path])
+        except (ValueError, TypeError) as exc:
+            self.metrics.record_request(time.perf_counter() - started, ok=False)
+            return 400, {"error": str(exc)}
+        try:
+            results = await self.batchers[ROUTES[path]].submit(racks) if racks else []
+        except Exception as exc:
+            self.metrics.record_request(time.perf_counter() - started, ok=False)
+            return 500, {"error": str(exc)}
+        self.metrics.record_request(time.perf_counter() - started)
+        return 200, results[0] if single else {"results": results}
+
+
+def serve(host="127.0.0.1", port=8765, **kwargs):
+    """Run the service until interrupted."""
+    async def main():
+        service = await SimulationService(host, port, **kwargs).start()
+        print(f"DataCoolSim service listening on http://{service.host}:{service.port}", flush=True)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
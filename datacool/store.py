@@ -0,0 +1,272 @@
+"""Columnar storage of per-rack inputs.
+
+Every input field is one typed NumPy column, fluid and insulation names are
+kept as integer codes into the property registry, and racks are addressed by
+integer (column, row) coordinates rather than id strings. "Apply to all" sets
+a template covering a rectangle of the floor instead of copying the values
+into each rack; racks saved afterwards are sparse overrides on top of it.
+"""
+import numpy as np
+
+from datacool.batch import AIR_FIELDS, IMMERSION_FIELDS
+from datacool.layout import parse_rack_id, rack_id as make_rack_id
+from datacool.properties import get_registry
+
+INTEGER_FIELDS = ("server_count",)
+CATEGORICAL_FIELDS = ("fluid_type", "insulation_type")
+
+
+def _coordinate_keys(coords):
+    # One sortable integer per (column, row) pair.
+    coords = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+    return (coords[:, 0] << 32) | coords[:, 1]
+
+
+class RackStore:
+    """Inputs of the racks of one cooling type.
+
+    Behaves like a mapping from rack id to a rack_data dict for the GUI, while
+    ``columns()`` hands the same data to the batch engine as arrays. Iteration
+    runs over the template rectangle column by column, then over saved racks
+    outside it in the order they were first saved.
+    """
+
+    def __init__(self, cooling_type, capacity=64):
+        self.cooling_type = cooling_type
+        self.fields = IMMERSION_FIELDS if cooling_type == "Immersion" else AIR_FIELDS
+        registry = get_registry()
+        # Names the registry does not know are appended so they survive a round trip;
+        # columns() maps them all to the registry's NaN row.
+        self.categories = {
+            "fluid_type": list(registry.fluid_names),
+            "insulation_type": list(registry.material_names),
+        }
+        self.known = {field: len(names) for field, names in self.categories.items()}
+        self.template = None
+        self.extent = (0, 0)
+        self.size = 0
+        self.coords = np.empty((capacity, 2), dtype=np.int32)
+        self.values = {field: np.empty(capacity, dtype=self._dtype(field)) for field in self.fields}
+        self.slots = {}
+
+    def _dtype(self, field):
+        if field in CATEGORICAL_FIELDS:
+            return np.intp
+        return np.int64 if field in INTEGER_FIELDS else np.float64
+
+    def _encode(self, field, value):
+        if field not in CATEGORICAL_FIELDS:
+            return value
+        names = self.categories[field]
+        try:
+            return names.index(value)
+        except ValueError:
+            names.append(value)
+            return len(names) - 1
+
+    def _encode_rack(self, data):
+        return {field: self._encode(field, data.get(field, default))
+                for field, (_, default) in self.fields.items()}
+
+    def _in_template(self, col, row):
+        return self.template is not None and col < self.extent[0] and row < self.extent[1]
+
+    def __len__(self):
+        outside = sum(1 for col, row in self.slots if not self._in_template(col, row))
+        return (self.extent[0] * self.extent[1] if self.template is not None else 0) + outside
+
+    def __contains__(self, rack_id):
+        try:
+            col, row = parse_rack_id(rack_id)
+        except ValueError:
+            return False
+        return (col, row) in self.slots or self._in_template(col, row)
+
+    def __iter__(self):
+        for col, row in self.coordinates():
+            yield make_rack_id(int(col), int(row))
+
+    def __getitem__(self, rack_id):
+        col, row = parse_rack_id(rack_id)
+        slot = self.slots.get((col, row))
+        if slot is not None:
+            values = {field: self.values[field][slot] for field in self.fields}
+        elif self._in_template(col, row):
+            values = self.template
+        else:
+            raise KeyError(rack_id)
+        data = {}
+        for field, value in values.items():
+            if field in CATEGORICAL_FIELDS:
+                data[field] = self.categories[field][value]
+            else:
+                data[field] = value.item() if isinstance(value, np.generic) else value
+        return data
+
+    def get(self, rack_id, default=None):
+        try:
+            return self[rack_id]
+        except (KeyError, ValueError):
+            return default
+
+    def __setitem__(self, rack_id, data):
+        key = parse_rack_id(rack_id)
+        values = self._encode_rack(data)
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.size
+            if slot == len(self.coords):
+                self._grow(max(2 * slot, 64))
+            self.coords[slot] = key
+            self.slots[key] = slot
+            self.size += 1
+        for field, value in values.items():
+            self.values[field][slot] = value
+
+    def _grow(self, capacity):
+        self.coords = np.resize(self.coords, (capacity, 2))
+        for field, column in self.values.items():
+            self.values[field] = np.resize(column, capacity)
+
+    def fill(self, data, columns, rows):
+        """Give every rack of the ``columns`` x ``rows`` rectangle the values in ``data``.
+
+        Overrides inside the rectangle are dropped; racks outside it keep
+        their values, including those that came from an earlier, larger fill.
+        """
+        if self.template is not None and (self.extent[0] > columns or self.extent[1] > rows):
+            self._materialize_outside(columns, rows)
+        coords = self.coords[:self.size]
+        keep = np.flatnonzero((coords[:, 0] >= columns) | (coords[:, 1] >= rows))
+        self._compact(keep)
+        self.template = self._encode_rack(data)
+        self.extent = (columns, rows)
+
+    def _materialize_outside(self, columns, rows):
+        # Racks the old template covered but the new one does not become overrides.
+        old_columns, old_rows = self.extent
+        col, row = np.indices((old_columns, old_rows)).reshape(2, -1)
+        outside = (col >= columns) | (row >= rows)
+        coords = np.column_stack([col[outside], row[outside]])
+        coords = coords[~np.isin(_coordinate_keys(coords), _coordinate_keys(self.coords[:self.size]))]
+        start = self.size
+        if start + len(coords) > len(self.coords):
+            self._grow(max(2 * len(self.coords), start + len(coords)))
+        self.coords[start:start + len(coords)] = coords
+        for field, value in self.template.items():
+            self.values[field][start:start + len(coords)] = value
+        self.size += len(coords)
+        self.slots.update(zip(map(tuple, coords.tolist()), range(start, self.size)))
+
+    def _compact(self, keep):
+        self.coords[:len(keep)] = self.coords[keep]
+        for column in self.values.values():
+            column[:len(keep)] = column[keep]
+        self.size = len(keep)
+        self.slots = {tuple(key): slot for slot, key in enumerate(self.coords[:self.size].tolist())}
+
+    def clear(self):
+        self.template = None
+        self.extent = (0, 0)
+        self.size = 0
+        self.slots = {}
+
+    def state(self):
+        """``(meta, arrays)`` describing the store, for saving in a project file."""
+        template = None if self.template is None else {
+            field: value.item() if isinstance(value, np.generic) else value for field, value in self.template.items()
+        }
+        meta = {"categories": self.categories, "template": template, "extent": list(self.extent)}
+        arrays = {"coords": self.coords[:self.size]}
+        arrays.update({field: column[:self.size] for field, column in self.values.items()})
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, cooling_type, meta, arrays):
+        """Store rebuilt from ``state()`` output; the arrays are used as given, e.g. memory-mapped."""
+        store = cls(cooling_type, capacity=0)
+        # Codes in the file index the categories saved with it; the registry may
+        # have gained, lost or reordered names since, so map them by name.
+        mappings = {}
+        for field, saved in meta["categories"].items():
+            if field not in store.fields:
+                continue
+            names = store.categories[field]
+            for name in saved:
+                if name not in names:
+                    names.append(name)
+            mapping = np.array([names.index(name) for name in saved], dtype=np.intp)
+            if not np.array_equal(mapping, np.arange(len(saved))):
+                mappings[field] = mapping
+        store.template = meta["template"]
+        if store.template is not None:
+            store.template = dict(store.template)
+            for field, mapping in mappings.items():
+                store.template[field] = int(mapping[store.template[field]])
+        store.extent = tuple(meta["extent"])
+        store.coords = arrays["coords"]
+        store.values = {field: arrays[field] for field in store.fields}
+        for field, mapping in mappings.items():
+            column = store.values[field]
+            if column.flags.writeable:
+                column[:] = mapping[column]
+            else:
+                store.values[field] = mapping[column]
+        store.size = len(store.coords)
+        store.slots = {tuple(key): slot for slot, key in enumerate(store.coords.tolist())}
+        return store
+
+    def coordinates(self):
+        """(racks, 2) array of zero-based (column, row) in iteration order."""
+        coords = self.coords[:self.size]
+        if self.template is None:
+            return coords.copy()
+        grid = np.indices(self.extent, dtype=np.int32).reshape(2, -1).T
+        outside = (coords[:, 0] >= self.extent[0]) | (coords[:, 1] >= self.extent[1])
+        return np.concatenate([grid, coords[outside]])
+
+    def columns(self, rack_ids=None):
+        """Rack inputs as arrays ready for batch.evaluate_racks.
+
+        Categorical fields are registry codes; immersion racks also get the
+        ``val`` row column, so no rack id is parsed during evaluation. Rows
+        follow ``rack_ids`` when given, otherwise the store's own order.
+        """
+        if rack_ids is None:
+            coords = self.coordinates()
+        else:
+            coords = np.array([parse_rack_id(r) for r in rack_ids], dtype=np.int32).reshape(-1, 2)
+        stored = _coordinate_keys(self.coords[:self.size])
+        keys = _coordinate_keys(coords)
+        if self.size:
+            order = np.argsort(stored)
+            position = np.minimum(np.searchsorted(stored[order], keys), self.size - 1)
+            slot = order[position]
+            overridden = stored[slot] == keys
+        else:
+            slot = np.zeros(len(keys), dtype=np.intp)
+            overridden = np.zeros(len(keys), dtype=bool)
+        if self.template is not None:
+            covered = overridden | ((coords[:, 0] < self.extent[0]) & (coords[:, 1] < self.extent[1]))
+        else:
+            covered = overridden
+        if not covered.all():
+            missing = coords[~covered][0]
+            raise KeyError(make_rack_id(int(missing[0]), int(missing[1])))
+
+        result = {}
+        for field in self.fields:
+            column = self.values[field]
+            if self.template is None:
+                values = column[slot]
+            else:
+                values = np.full(len(coords), self.template[field], dtype=column.dtype)
+                values[overridden] = column[slot[overridden]]
+            if field in CATEGORICAL_FIELDS:
+                values = np.minimum(values, self.known[field])
+            result[field] = values
+        result["col"] = coords[:, 0]
+        result["row"] = coords[:, 1]
+        if self.cooling_type == "Immersion":
+            result["val"] = coords[:, 1] + 1
+        return result
@@ -0,0 +1,237 @@
+"""Parameter sweeps and sensitivity analysis over the batch cooling models.
+
+A sweep only describes how to generate points; ``run_sweep`` evaluates it in
+chunks, either in-process or across a process pool, and gathers the outputs
+into preallocated arrays. Parameters may be given either as rack_data field
+names (``flow_rate``) or as model keywords (``Q``, ``electricity_cost``).
+"""
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from datacool.batch import (AIR_FIELDS, AIR_OUTPUTS, IMMERSION_FIELDS, IMMERSION_OUTPUTS, BatchCoolingCalculations,
+                            default_arguments, evaluate_arguments)
+
+# Jitter for Latin hypercube points is drawn per block of this many points, so
+# the generated points do not depend on the chunk size or worker count.
+_LHS_BLOCK = 65536
+
+
+def model_parameter(name, cooling_type):
+    """Model keyword for a rack_data field name; model keywords pass through."""
+    fields = IMMERSION_FIELDS if cooling_type == "Immersion" else AIR_FIELDS
+    return fields[name][0] if name in fields else name
+
+
+def model_outputs(cooling_type):
+    return IMMERSION_OUTPUTS if cooling_type == "Immersion" else AIR_OUTPUTS
+
+
+def _local_arguments(cooling_type, rack):
+    # Keywords the racks never set (e.g. immersion electricity_cost) take the model's defaults.
+    func = (BatchCoolingCalculations.calculateICoolingEnergy if cooling_type == "Immersion"
+            else BatchCoolingCalculations.calculateACoolingEnergy)
+    arguments = {name: parameter.default for name, parameter in inspect.signature(func).parameters.items()
+                 if parameter.default is not inspect.Parameter.empty and name != "rounded"}
+    arguments.update(default_arguments(cooling_type, rack))
+    return arguments
+
+
+class GridSweep:
+    """Full factorial grid over the given axes."""
+
+    def __init__(self, axes):
+        self.names = list(axes)
+        self.axes = [np.asarray(values, dtype=float) for values in axes.values()]
+        self.shape = tuple(len(axis) for axis in self.axes)
+        self.size = int(np.prod(self.shape))
+
+    def points(self, start, stop):
+        index = np.unravel_index(np.arange(start, stop), self.shape)
+        return {name: axis[i] for name, axis, i in zip(self.names, self.axes, index)}
+
+
+class LatinHypercubeSweep:
+    """Latin hypercube sample of ``size`` points within ``bounds`` (name -> (low, high))."""
+
+    def __init__(self, bounds, size, seed=None):
+        self.names = list(bounds)
+        self.bounds = np.array([bounds[name] for name in self.names], dtype=float)
+        self.size = int(size)
+        self.seed = np.random.SeedSequence(seed).entropy
+        rng = np.random.default_rng([self.seed, 0])
+        dtype = np.int32 if self.size < 2**31 else np.int64
+        self.strata = [rng.permutation(self.size).astype(dtype) for _ in self.names]
+
+    def points(self, start, stop):
+        jitter = np.empty((len(self.names), stop - start))
+        first_block = start // _LHS_BLOCK
+        for block in range(first_block, (stop - 1) // _LHS_BLOCK + 1):
+            rng = np.random.default_rng([self.seed, 1, block])
+            block_start = block * _LHS_BLOCK
+            values = rng.random((len(self.names), _LHS_BLOCK))
+            lo = max(start, block_start)
+            hi = min(stop, block_start + _LHS_BLOCK)
+            jitter[:, lo - start:hi - start] = values[:, lo - block_start:hi - block_start]
+        points = {}
+        for i, name in enumerate(self.names):
+            low, high = self.bounds[i]
+            u = (self.strata[i][start:stop] + jitter[i]) / self.size
+            points[name] = low + u * (high - low)
+        return points
+
+
+class OneAtATimeSweep:
+    """Vary each parameter over its range in ``steps`` points while the others stay at ``center``."""
+
+    def __init__(self, ranges, center, steps=11):
+        self.names = list(ranges)
+        self.steps = int(steps)
+        self.values = [np.linspace(low, high, self.steps) for low, high in ranges.values()]
+        self.center = {name: float(center[name]) if name in center else float(np.mean(ranges[name]))
+                       for name in self.names}
+        self.size = len(self.names) * self.steps
+
+    def points(self, start, stop):
+        index = np.arange(start, stop)
+        varied, step = np.divmod(index, self.steps)
+        return {name: np.where(varied == i, values[step], self.center[name])
+                for i, (name, values) in enumerate(zip(self.names, self.values))}
+
+
+class SweepResult:
+    """Outputs of a sweep; ``inputs`` regenerates the varied parameters on demand."""
+
+    def __init__(self, sweep, outputs):
+        self.sweep = sweep
+        self.outputs = outputs
+
+    @property
+    def inputs(self):
+        return self.sweep.points(0, self.sweep.size)
+
+    def standardized_coefficients(self, output="annual_cost"):
+        """Standardized regression coefficients of ``output`` on each varied input.
+
+        Useful for grid and Latin hypercube sweeps; values near +/-1 dominate.
+        """
+        valid = self.outputs["valid"]
+        y = self.outputs[output][valid]
+        inputs = self.inputs
+        X = np.column_stack([inputs[name][valid] for name in self.sweep.names])
+        X_std = X.std(axis=0)
+        X_std[X_std == 0] = 1
+        Xs = (X - X.mean(axis=0)) / X_std
+        ys = (y - y.mean()) / (y.std() or 1)
+        coef, *_ = np.linalg.lstsq(Xs, ys, rcond=None)
+        return dict(zip(self.sweep.names, coef.tolist()))
+
+
+# Per-process state set by the pool initializer, so each task only ships indices.
+_worker = {}
+
+
+def _init_worker(sweep, cooling_type, base, outputs):
+    _worker.update(sweep=sweep, cooling_type=cooling_type, base=base, outputs=outputs)
+
+
+def _evaluate_chunk(sweep, cooling_type, base, outputs, start, stop):
+    arguments = dict(base)
+    for name, values in sweep.points(start, stop).items():
+        arguments[model_parameter(name, cooling_type)] = values
+    results = evaluate_arguments(arguments, cooling_type, rounded=False)
+    return {key: np.broadcast_to(results[key], (stop - start,)) for key in outputs}
+
+
+def _run_chunk(start, stop):
+    w = _worker
+    return start, _evaluate_chunk(w["sweep"], w["cooling_type"], w["base"], w["outputs"], start, stop)
+
+
+def run_sweep(sweep, cooling_type, rack=None, outputs=None, workers=None, chunk_size=100000):
+    """Evaluate every point of ``sweep`` on top of a base rack.
+
+    ``rack`` holds fixed rack_data fields; everything not swept keeps the
+    calculate_efficiency defaults. ``workers=None`` uses all cores, ``1`` runs
+    in-process. Returns a SweepResult with one array per output.
+    """
+    base = default_arguments(cooling_type, rack)
+    outputs = tuple(outputs or model_outputs(cooling_type)) + ("valid",)
+    results = {key: np.empty(sweep.size, dtype=bool if key == "valid" else float) for key in outputs}
+    starts = range(0, sweep.size, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(starts) == 1:
+        for start in starts:
+            stop = min(start + chunk_size, sweep.size)
+            chunk = _evaluate_chunk(sweep, cooling_type, base, outputs, start, stop)
+            for key in outputs:
+                results[key][start:stop] = chunk[key]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(sweep, cooling_type, base, outputs)) as pool:
+            futures = [pool.submit(_run_chunk, start, min(start + chunk_size, sweep.size)) for start in starts]
+            for future in as_completed(futures):
+                start, chunk = future.result()
+                stop = start + len(chunk["valid"])
+                for key in outputs:
+                    results[key][start:stop] = chunk[key]
+    return SweepResult(sweep, results)
+
+
+def elasticities(cooling_type, output="annual_cost", rack=None, parameters=None, rel_step=0.01):
+    """Local elasticities d ln(output) / d ln(parameter) at a base rack.
+
+    Uses central differences; all perturbed points are evaluated in one batch.
+    Parameters whose base value is zero have no defined elasticity and give NaN.
+    """
+    base = _local_arguments(cooling_type, rack)
+    if parameters is None:
+        fields = IMMERSION_FIELDS if cooling_type == "Immersion" else AIR_FIELDS
+        parameters = [name for name, (param, _) in fields.items() if np.asarray(base[param]).dtype.kind in "iuf"]
+    keywords = [model_parameter(name, cooling_type) for name in parameters]
+    count = 2 * len(keywords) + 1
+    arguments = dict(base)
+    for i, keyword in enumerate(keywords):
+        values = np.full(count, float(base[keyword]))
+        values[2 * i] *= 1 + rel_step
+        values[2 * i + 1] *= 1 - rel_step
+        arguments[keyword] = values
+    y = np.broadcast_to(evaluate_arguments(arguments, cooling_type, rounded=False)[output], (count,))
+    y0 = y[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = (y[0:-1:2] - y[1:-1:2]) / (2 * rel_step * y0)
+    zero = np.array([float(base[keyword]) == 0 for keyword in keywords])
+    values = np.where(zero, np.nan, values)
+    return dict(zip(parameters, values.tolist()))
+
+
+def tornado(cooling_type, ranges, output="annual_cost", rack=None):
+    """Swing of ``output`` when each parameter moves across its (low, high) range.
+
+    Returns one dict per parameter, ranked by descending swing.
+    """
+    base = _local_arguments(cooling_type, rack)
+    names = list(ranges)
+    count = 2 * len(names)
+    arguments = dict(base)
+    for i, name in enumerate(names):
+        keyword = model_parameter(name, cooling_type)
+        values = np.full(count, float(base[keyword]))
+        values[2 * i], values[2 * i + 1] = ranges[name]
+        arguments[keyword] = values
+    y = np.broadcast_to(evaluate_arguments(arguments, cooling_type, rounded=False)[output], (count,))
+    rows = []
+    for i, name in enumerate(names):
+        low, high = ranges[name]
+        rows.append({
+            "parameter": name,
+            "low": low,
+            "high": high,
+            "output_low": float(y[2 * i]),
+            "output_high": float(y[2 * i + 1]),
+            "swing": float(abs(y[2 * i + 1] - y[2 * i])),
+        })
+    rows.sort(key=lambda row: row["swing"], reverse=True)
+    return rows
@@ -0,0 +1,237 @@
+"""Steady-state temperature field of the data hall floor.
+
+The floor is a grid of square cells. Every rack covers ``resolution`` x
+``resolution`` cells, the racks of a column stand side by side along y and
+columns are separated by aisles ``aisle`` cells wide (with another aisle all
+around the hall, whose walls are held at the room temperature). Each cell
+balances
+
+    sum_j G (T_i - T_j) + H_i (T_i - S_i) = Q_i
+
+over its four neighbours: G is the lateral ``conductance`` between cells
+(mixing of hall air), ``Q`` the rack heat ``server_count * load`` spread over
+the rack's cells and ``H`` the cooling that removes it. A rack's own cooling
+holds it at the server temperature of the single-rack model, so it sinks
+``H_rack = Q / (server_temp - inlet)`` towards its coolant or ambient inlet
+``S``; aisle cells are cooled by the room air handling, ``room_sink`` per
+cell, towards the room temperature.
+
+The system is symmetric positive definite and solved by conjugate gradients
+preconditioned with one multigrid V-cycle: 2 x 2 cell aggregation with
+Galerkin coarse operators, weighted Jacobi smoothing and a direct solve on
+the coarsest grid. Everything is array slicing, no Python loop over cells;
+a 1000 x 1000 grid takes a few seconds.
+"""
+import numpy as np
+
+from datacool.batch import evaluate_arguments, rack_arguments
+from datacool.coupling import rack_positions
+from datacool.instrument import count, span
+
+COARSEST_CELLS = 256
+JACOBI_WEIGHT = 0.8
+
+
+class _Level:
+    """Operator of one grid: edge conductances ``wx``/``wy`` and the diagonal sink ``sink``.
+
+    ``apply(u)`` is ``sum_j w_ij (u_i - u_j) + sink_i u_i``; boundary
+    conductances to the fixed walls are part of ``sink``.
+    """
+
+    def __init__(self, wx, wy, sink):
+        self.wx = wx
+        self.wy = wy
+        self.sink = sink
+        self.shape = sink.shape
+        diagonal = sink.copy()
+        diagonal[:, :-1] += wx
+        diagonal[:, 1:] += wx
+        diagonal[:-1, :] += wy
+        diagonal[1:, :] += wy
+        self.diagonal = diagonal
+        self.step = JACOBI_WEIGHT / diagonal
+
+    def apply(self, u):
+        out = self.sink * u
+        flux = self.wx * (u[:, :-1] - u[:, 1:])
+        out[:, :-1] += flux
+        out[:, 1:] -= flux
+        flux = self.wy * (u[:-1, :] - u[1:, :])
+        out[:-1, :] += flux
+        out[1:, :] -= flux
+        return out
+
+    def coarsen(self):
+        """Galerkin operator of the 2 x 2 aggregates (zero padded at odd edges)."""
+        ny, nx = self.shape
+        py, px = ny % 2, nx % 2
+        wx = np.pad(self.wx, ((0, py), (0, px)))
+        wy = np.pad(self.wy, ((0, py), (0, px)))
+        sink = np.pad(self.sink, ((0, py), (0, px)))
+        # Edges inside an aggregate cancel; those between aggregates add up.
+        wx = _sum_pairs(wx[:, 1::2], axis=0)
+        wy = _sum_pairs(wy[1::2, :], axis=1)
+        return _Level(wx, wy, _restrict(sink))
+
+    def dense(self):
+        ny, nx = self.shape
+        index = np.arange(ny * nx).reshape(ny, nx)
+        matrix = np.diag(self.diagonal.ravel())
+        for weights, left, right in ((self.wx, index[:, :-1], index[:, 1:]), (self.wy, index[:-1, :], index[1:, :])):
+            matrix[left.ravel(), right.ravel()] -= weights.ravel()
+            matrix[right.ravel(), left.ravel()] -= weights.ravel()
+        return matrix
+
+
+def _sum_pairs(a, axis):
+    shape = list(a.shape)
+    shape[axis:axis + 1] = [shape[axis] // 2, 2]
+    return a.reshape(shape).sum(axis=axis + 1)
+
+
+def _restrict(a):
+    ny, nx = a.shape
+    a = np.pad(a, ((0, ny % 2), (0, nx % 2)))
+    return a.reshape(a.shape[0] // 2, 2, a.shape[1] // 2, 2).sum(axis=(1, 3))
+
+
+def _prolong(a, shape):
+    return np.repeat(np.repeat(a, 2, axis=0), 2, axis=1)[:shape[0], :shape[1]]
+
+
+class Multigrid:
+    """Symmetric V-cycle preconditioner for a field operator.
+
+    ``smoothing`` Jacobi sweeps run before and after each coarse correction,
+    so the cycle stays symmetric and usable inside conjugate gradients.
+    """
+
+    def __init__(self, level, smoothing=1):
+        self.levels = [level]
+        while level.shape[0] * level.shape[1] > COARSEST_CELLS:
+            level = level.coarsen()
+            self.levels.append(level)
+        self.coarsest = np.linalg.inv(level.dense())
+        self.smoothing = smoothing
+
+    def __call__(self, r):
+        return self._cycle(0, r)
+
+    def _cycle(self, depth, r):
+        level = self.levels[depth]
+        if depth == len(self.levels) - 1:
+            return (self.coarsest @ r.ravel()).reshape(level.shape)
+        u = level.step * r
+        for _ in range(self.smoothing - 1):
+            u += level.step * (r - level.apply(u))
+        u += _prolong(self._cycle(depth + 1, _restrict(r - level.apply(u))), level.shape)
+        for _ in range(self.smoothing):
+            u += level.step * (r - level.apply(u))
+        return u
+
+
+def solve_field(source, sink, conductance=1.0, tolerance=1e-8, max_iterations=200, smoothing=1):
+    """Solve ``conductance * (4u - neighbours) + sink * u = source`` with ``u = 0`` beyond the edges.
+
+    ``source`` and ``sink`` are 2-D arrays over the cells. Returns
+    ``(u, iterations, residual)``, the residual relative to the source.
+    """
+    source = np.asarray(source, dtype=float)
+    sink = np.asarray(sink, dtype=float)
+    if source.ndim != 2 or sink.shape != source.shape:
+        raise ValueError("source and sink must be 2-D arrays of the same shape")
+    if conductance <= 0 or np.any(sink < 0):
+        raise ValueError("Conductance must be positive and sinks non-negative")
+    ny, nx = source.shape
+    wall = sink.copy()
+    wall[0, :] += conductance
+    wall[-1, :] += conductance
+    wall[:, 0] += conductance
+    wall[:, -1] += conductance
+    level = _Level(np.full((ny, nx - 1), float(conductance)), np.full((ny - 1, nx), float(conductance)), wall)
+
+    norm = np.linalg.norm(source)
+    u = np.zeros_like(source)
+    if norm == 0:
+        return u, 0, 0.0
+    with span("thermal.setup"):
+        precondition = Multigrid(level, smoothing)
+    r = source.copy()
+    z = precondition(r)
+    p = z.copy()
+    rz = np.vdot(r, z)
+    residual = 1.0
+    with span("thermal.solve"):
+        for iteration in range(1, max_iterations + 1):
+            q = level.apply(p)
+            alpha = rz / np.vdot(p, q)
+            u += alpha * p
+            r -= alpha * q
+            residual = np.linalg.norm(r) / norm
+            if residual <= tolerance:
+                break
+            z = precondition(r)
+            rz, previous = np.vdot(r, z), rz
+            p *= rz / previous
+            p += z
+    count("thermal_cells", source.size)
+    return u, iteration, residual
+
+
+def floor_grid(col, row, resolution=4, aisle=2):
+    """Grid shape and the top-left cell ``(y, x)`` of the racks at zero-based ``(col, row)``."""
+    col = np.asarray(col, dtype=np.int64)
+    row = np.asarray(row, dtype=np.int64)
+    columns = int(col.max()) + 1 if len(col) else 0
+    rows = int(row.max()) + 1 if len(row) else 0
+    shape = (rows * resolution + 2 * aisle, columns * (resolution + aisle) + aisle)
+    return shape, (aisle + row * resolution, aisle + col * (resolution + aisle))
+
+
+def thermal_field(racks, cooling_type, resolution=4, aisle=2, conductance=20.0, room_sink=5.0, room_temp=None,
+                  tolerance=1e-8):
+    """Steady temperature of every floor cell for ``racks`` under ``cooling_type``.
+
+    ``racks`` is a column dict as for ``evaluate_racks`` that locates each
+    rack by ``col``/``row`` or ``rack_id``, as in ``coupled_temperatures``.
+    ``conductance`` and ``room_sink`` are in W/K per cell; the room
+    temperature defaults to the mean inlet temperature. Invalid racks neither
+    heat nor cool the floor.
+
+    Returns a dict with the ``temperature`` grid (rows along y), each rack's
+    mean ``rack_temp``, its ``origin`` cell, ``valid``, and the solver's
+    ``iterations`` and ``residual``.
+    """
+    col, row, racks = rack_positions(racks, cooling_type)
+    size = len(col)
+    arguments = rack_arguments(racks, cooling_type)
+    inlet = arguments["tCoolant"] if cooling_type == "Immersion" else arguments["tAmbient"]
+    heat = np.asarray(arguments["n"], dtype=float) * (arguments["L"] if cooling_type == "Immersion" else arguments["l"])
+    results = evaluate_arguments(arguments, cooling_type, rounded=False)
+    inlet = np.broadcast_to(np.asarray(inlet, dtype=float), (size,))
+    heat = np.broadcast_to(heat, (size,))
+    rise = np.broadcast_to(results["server_temp"], (size,)) - inlet
+    valid = np.broadcast_to(results["valid"], (size,)) & (rise > 0) & (heat >= 0)
+    if room_temp is None:
+        room_temp = float(inlet[valid].mean()) if valid.any() else 25.0
+
+    shape, (y0, x0) = floor_grid(col, row, resolution, aisle)
+    cells = resolution * resolution
+    source = np.zeros(shape)
+    sink = np.full(shape, float(room_sink))
+    # Every rack cell is overwritten exactly once, so plain fancy indexing is enough.
+    offset = np.arange(resolution)
+    ys = (y0[valid, None, None] + offset[None, :, None]).repeat(resolution, axis=2)
+    xs = (x0[valid, None, None] + offset[None, None, :]).repeat(resolution, axis=1)
+    rack_sink = np.where(valid, heat / np.where(valid, rise, 1.0), 0.0)[valid] / cells
+    sink[ys, xs] = rack_sink[:, None, None]
+    source[ys, xs] = (heat[valid] / cells + rack_sink * (inlet[valid] - room_temp))[:, None, None]
+
+    with span("thermal.field"):
+        u, iterations, residual = solve_field(source, sink, conductance, tolerance)
+    temperature = u + room_temp
+    rack_temp = np.full(size, np.nan)
+    rack_temp[valid] = temperature[ys, xs].mean(axis=(1, 2))
+    return {"temperature": temperature, "rack_temp": rack_temp, "origin": np.stack([y0, x0], axis=1),
+            "valid": valid.copy(), "iterations": iterations, "residual": residual}
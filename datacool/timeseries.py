@@ -0,0 +1,197 @@
+"""Hourly annual simulation of the air and immersion models.
+
+Instead of multiplying one instantaneous power by ``24 * 365``, the models are
+evaluated for every rack and every hour in a single broadcast call: rack
+inputs have shape (racks, 1) and hourly profiles shape (1, hours).
+
+An hourly ``ambient_temp`` also sets the air model's chiller COP for each
+hour (see ``chiller_cop``), since the single-rack model uses a fixed COP
+that would make chiller power independent of the weather. The immersion
+model has no ambient-dependent term; its weather enters only through an
+hourly ``coolant_temp``.
+"""
+import csv
+
+import numpy as np
+
+from datacool.batch import AIR_CONSTANTS, evaluate_arguments, rack_arguments
+
+HOURS_PER_YEAR = 8760
+# Chiller rated at the model's fixed COP at this outdoor temperature.
+RATED_AMBIENT = 25.0
+CHILLED_WATER_TEMP = 7.0
+CONDENSER_APPROACH = 10.0
+MAX_CHILLER_COP = 8.0
+
+
+def read_hourly_csv(path, column=None):
+    """One hourly series from a CSV file; the last column unless ``column`` is given.
+
+    Blank lines are skipped. A first row whose last cell is not a number is
+    the header.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        rows = [(reader.line_num, row) for row in reader if any(cell.strip() for cell in row)]
+    header = rows.pop(0)[1] if rows and not _is_number(rows[0][1][-1]) else None
+    if not rows:
+        raise ValueError(f"{path} has no data rows")
+    if column is None:
+        index = len(rows[0][1]) - 1
+    elif header is None:
+        raise ValueError(f"{path} has no header row, so column {column!r} cannot be found")
+    elif column not in header:
+        raise ValueError(f"{path} has no column {column!r}; columns are {', '.join(header)}")
+    else:
+        index = header.index(column)
+    values = np.empty(len(rows))
+    for i, (line, row) in enumerate(rows):
+        try:
+            values[i] = float(row[index])
+        except (IndexError, ValueError):
+            raise ValueError(f"{path}, line {line}: expected a number in column {index + 1}") from None
+    return values
+
+
+def read_profiles_csv(path):
+    """Per-rack hourly profiles from a CSV with one column per rack id.
+
+    Returns ``(rack_ids, profiles)`` where profiles has shape (racks, hours).
+    An ``hour`` column, if present, is ignored.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        keep = [i for i, name in enumerate(header) if name.lower() != "hour"]
+        values = np.array([[float(row[i]) for i in keep] for row in reader])
+    return [header[i] for i in keep], values.T
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+class YearResult:
+    """Hourly results of simulate_year.
+
+    ``server_temp`` and ``power`` are (racks, hours) arrays; power is in the
+    same kW unit as total_cooling_energy.
+    """
+
+    def __init__(self, server_temp, power, price, valid):
+        self.server_temp = server_temp
+        self.power = power
+        self.valid = valid
+        self.facility_power = np.nansum(power, axis=0)
+        self.rack_kwh = np.nansum(power, axis=1)
+        self.rack_cost = np.nansum(power * price, axis=1)
+
+    @property
+    def peak_demand(self):
+        return float(self.facility_power.max())
+
+    @property
+    def peak_hour(self):
+        return int(self.facility_power.argmax())
+
+    @property
+    def annual_kwh(self):
+        return float(self.rack_kwh.sum())
+
+    @property
+    def annual_cost(self):
+        return float(self.rack_cost.sum())
+
+    def summary(self):
+        return {
+            "peak_demand": self.peak_demand,
+            "peak_hour": self.peak_hour,
+            "annual_kwh": self.annual_kwh,
+            "annual_cost": self.annual_cost,
+            "max_server_temp": float(np.nanmax(self.server_temp)),
+            "invalid_racks": int((~self.valid.all(axis=1)).sum()),
+        }
+
+
+def chiller_cop(ambient_temp, rated_cop=AIR_CONSTANTS["chiller_cop"], rated_ambient=RATED_AMBIENT):
+    """Chiller COP at outdoor temperature ``ambient_temp`` (°C).
+
+    A fixed fraction of the Carnot COP between the chilled water and a
+    condenser ``CONDENSER_APPROACH`` above ambient, scaled so it equals
+    ``rated_cop`` at ``rated_ambient`` and capped at ``MAX_CHILLER_COP``.
+    """
+    def carnot(ambient):
+        lift = np.maximum(np.asarray(ambient, dtype=float) + CONDENSER_APPROACH - CHILLED_WATER_TEMP, 1.0)
+        return (CHILLED_WATER_TEMP + 273.15) / lift
+
+    return np.minimum(rated_cop * carnot(ambient_temp) / carnot(rated_ambient), MAX_CHILLER_COP)
+
+
+def _hourly(values, hours):
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[np.newaxis, :]
+    if values.shape[-1] != hours:
+        raise ValueError(f"Expected {hours} hourly values, got {values.shape[-1]}")
+    return values
+
+
+def simulate_year(racks, cooling_type, ambient_temp=None, coolant_temp=None, load_profile=None,
+                  electricity_price=None, hours=None, age_servers=True, cop=None):
+    """Evaluate every rack for every hour of the year.
+
+    ``racks`` takes the same columns as evaluate_racks. ``ambient_temp`` drives
+    the air model and ``coolant_temp`` the immersion model; when omitted the
+    rack's own constant value is used. The immersion model has no ambient
+    input, so passing ``ambient_temp`` or ``cop`` with it is an error. ``load_profile`` scales each rack's load
+    per hour, either one shared (hours,) series or (racks, hours).
+    ``electricity_price`` may be a constant or an hourly tariff in $/kWh.
+    With ``age_servers`` the run time tau grows by one per simulated hour.
+    ``cop`` is the air chiller COP, a constant or hourly series; by default
+    it follows ``ambient_temp`` through ``chiller_cop``, or stays at the
+    model's constant when no ambient profile is given.
+    """
+    if cooling_type == "Immersion" and (ambient_temp is not None or cop is not None):
+        raise ValueError("ambient_temp and cop apply to the air model only; use coolant_temp for immersion")
+    profiles = [p for p in (ambient_temp, coolant_temp, load_profile, electricity_price) if np.ndim(p) >= 1]
+    if hours is None:
+        hours = np.shape(profiles[0])[-1] if profiles else HOURS_PER_YEAR
+    arguments = {}
+    for name, value in rack_arguments(racks, cooling_type).items():
+        value = np.asarray(value)
+        arguments[name] = value[:, np.newaxis] if value.ndim == 1 else value
+
+    load_key = "L" if cooling_type == "Immersion" else "l"
+    if load_profile is not None:
+        arguments[load_key] = arguments[load_key] * _hourly(load_profile, hours)
+    if cooling_type == "Immersion":
+        if coolant_temp is not None:
+            arguments["tCoolant"] = _hourly(coolant_temp, hours)
+        if age_servers:
+            arguments["tau"] = arguments["tau"] + np.arange(hours)[np.newaxis, :]
+    else:
+        if ambient_temp is not None:
+            arguments["tAmbient"] = _hourly(ambient_temp, hours)
+            if cop is None:
+                cop = chiller_cop(arguments["tAmbient"])
+        if cop is not None:
+            arguments["chiller_cop"] = _hourly(cop, hours) if np.ndim(cop) else cop
+
+    if electricity_price is None:
+        electricity_price = AIR_CONSTANTS["electricity_cost"]
+    price = np.asarray(electricity_price, dtype=float)
+    if price.ndim:
+        price = _hourly(price, hours)
+
+    results = evaluate_arguments(arguments, cooling_type, rounded=False)
+    shape = np.broadcast_shapes(np.shape(results["total_cooling_energy"]), (1, hours))
+    return YearResult(
+        np.broadcast_to(results["server_temp"], shape),
+        np.broadcast_to(results["total_cooling_energy"], shape),
+        price,
+        np.broadcast_to(results["valid"], shape),
+    )
@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+import pytest
+
+from datacool.batch import (AIR_OUTPUTS, IMMERSION_OUTPUTS, BatchCoolingCalculations, evaluate_racks, finish_results,
+                            rack_arguments, wrap_row)
+from datacool.calculations import CoolingCalculations
+
+IMMERSION_CASES = [
+    dict(tCoolant=25, n=20, SA=0.5, L=200, tau=0, D=5, insulation="Standard Fiberglass", fluidType="3M Novec 7000",
+         Q=0.05, Aflow=0.00785, Lchar=0.01, val=1, L_pipe=20),
+    dict(tCoolant=38.3, n=8, SA=0.7, L=450, tau=5000, D=0.05, insulation="Standard Fiberglass",
+         fluidType="3M Novec 7000", Q=0.001, Aflow=0.01, Lchar=0.01, val=13, L_pipe=35),
+    dict(tCoolant=17, n=40, SA=0.2, L=75, tau=100, D=2, insulation="Standard Fiberglass", fluidType="3M Novec 7000",
+         Q=0.2, Aflow=0.005, Lchar=0.02, val=24, L_pipe=5, safety_margin=False),
+]
+AIR_CASES = [
+    dict(tAmbient=25, n=20, l=200, fanAirflow=0.085, fanEfficiency=0.55, dustAmount=0.1, heatSinkEfficiency=0.75,
+         heatSinkSA=1.2, duct_length=20, duct_diameter=0.1),
+    dict(tAmbient=35.5, n=12, l=420, fanAirflow=0.2, fanEfficiency=0.8, dustAmount=0.3, heatSinkEfficiency=0.5,
+         heatSinkSA=2.0, duct_length=45, duct_diameter=0.3, chiller_cop=4.5),
+    dict(tAmbient=15, n=30, l=90, fanAirflow=0.001, fanEfficiency=0.4, dustAmount=0.0, heatSinkEfficiency=0.9,
+         heatSinkSA=0.8, duct_length=10, duct_diameter=0.2, safety_margin=False),
+]
+
+
+def columns(cases):
+    return {key: np.array([case.get(key, cases[0].get(key)) for case in cases]) for key in cases[0]}
+
+
+@pytest.mark.parametrize("case", IMMERSION_CASES)
+def test_immersion_matches_scalar(case):
+    expected = CoolingCalculations.calculateICoolingEnergy(**case)
+    result = BatchCoolingCalculations.calculateICoolingEnergy(**case)
+    for key in IMMERSION_OUTPUTS:
+        assert float(result[key]) == pytest.approx(expected[key], abs=1e-9)
+    assert result["valid"]
+
+
+@pytest.mark.parametrize("case", AIR_CASES)
+def test_air_matches_scalar(case):
+    expected = CoolingCalculations.calculateACoolingEnergy(**case)
+    result = BatchCoolingCalculations.calculateACoolingEnergy(**case)
+    for key in AIR_OUTPUTS:
+        assert float(result[key]) == pytest.approx(expected[key], abs=1e-9)
+
+
+@pytest.mark.parametrize("fluid", ["Mineral Oil", "Synthetic Oil"])
+def test_viscous_fluids_match_scalar(fluid):
+    case = {key: value for key, value in IMMERSION_CASES[0].items() if key != "L_pipe"}
+    case.update(fluidType=fluid, tCoolant=-50, n=100)
+    expected = CoolingCalculations.calculateServerTemp(**case)
+    assert float(BatchCoolingCalculations.calculateServerTemp(**case)) == pytest.approx(expected)
+
+
+def test_arrays_match_one_call_per_rack():
+    cases = [dict(case, safety_margin=True) for case in IMMERSION_CASES]
+    result = BatchCoolingCalculations.calculateICoolingEnergy(rounded=False, **columns(cases))
+    for i, case in enumerate(cases):
+        single = BatchCoolingCalculations.calculateICoolingEnergy(rounded=False, **case)
+        for key in IMMERSION_OUTPUTS:
+            assert result[key][i] == pytest.approx(float(single[key]), rel=1e-12)
+
+
+def test_zero_flow_is_invalid_not_an_error():
+    case = dict(IMMERSION_CASES[0], Q=0)
+    with pytest.raises(ArithmeticError):
+        CoolingCalculations.calculateICoolingEnergy(**case)
+    result = BatchCoolingCalculations.calculateICoolingEnergy(**case)
+    assert not result["valid"]
+    assert all(math.isnan(result[key]) for key in IMMERSION_OUTPUTS)
+
+
+def test_finish_results_masks_whole_rack():
+    results = {"server_temp": np.array([30.04, 31.0, 32.0]), "power": np.array([1.234, np.inf, 2.0])}
+    finished = finish_results(dict(results), ("server_temp", "power"), rounded=True)
+    np.testing.assert_array_equal(finished["valid"], [True, False, True])
+    np.testing.assert_array_equal(finished["server_temp"], [30.0, np.nan, 32.0])
+    np.testing.assert_array_equal(finished["power"], [1.23, np.nan, 2.0])
+    raw = finish_results(dict(results), ("server_temp", "power"), rounded=False)
+    assert raw["server_temp"][0] == 30.04
+
+
+def test_wrap_row():
+    np.testing.assert_array_equal(wrap_row([1, 12, 13, 24, 25]), [1, 12, 1, 12, 1])
+
+
+def test_rack_arguments_defaults_and_rows():
+    arguments = rack_arguments({"rack_id": np.array(["A1", "B13", "C24"]), "load": np.array([100.0, 200, 300])},
+                               "Immersion")
+    np.testing.assert_array_equal(arguments["val"], [1, 13, 24])
+    assert arguments["tCoolant"] == 25
+    with pytest.raises(ValueError):
+        rack_arguments({"load": [100.0]}, "Immersion")
+
+
+def test_unknown_fluid_is_invalid():
+    racks = {"val": np.array([1, 2]), "fluid_type": np.array(["3M Novec 7000", "Unobtainium"])}
+    np.testing.assert_array_equal(evaluate_racks(racks, "Immersion")["valid"], [True, False])
@@ -0,0 +1,39 @@
+import numpy as np
+
+from datacool.batch import evaluate_racks
+from datacool.cache import ResultCache, column_keys, evaluate_cached
+from datacool.store import RackStore
+
+
+def store_columns():
+    store = RackStore("Immersion")
+    store.fill({"load": 250}, 2, 13)
+    store["A2"] = {"load": 300}
+    return store.columns()
+
+
+def test_identical_racks_share_a_key():
+    keys = column_keys(store_columns(), "Immersion")
+    # Rows 1 and 13 of a column sit at the same position of the 12-rack loop.
+    assert keys[0] == keys[12] == keys[13]
+    assert keys[1] != keys[14]
+
+
+def test_cached_results_match_direct_evaluation():
+    columns = store_columns()
+    cache = ResultCache()
+    first = evaluate_cached(columns, "Immersion", cache)
+    assert cache.hits == 0 and len(cache) == 13
+    second = evaluate_cached(columns, "Immersion", cache)
+    assert cache.hits == len(first) and second == first
+    direct = evaluate_racks(columns, "Immersion")
+    np.testing.assert_array_equal([result["annual_cost"] for result in first], direct["annual_cost"])
+
+
+def test_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
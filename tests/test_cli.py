@@ -0,0 +1,81 @@
+import io
+import json
+
+import pytest
+
+from datacool import cli
+from datacool.batch import evaluate_racks
+
+
+def run_csv(text, cooling_type="Immersion", **kwargs):
+    output, errors = io.StringIO(), io.StringIO()
+    count = cli.run(io.StringIO(text), output, cooling_type, error_stream=errors, **kwargs)
+    return count, output.getvalue().splitlines(), errors.getvalue().splitlines()
+
+
+def test_run_matches_batch_engine():
+    count, lines, errors = run_csv("rack_id,load,server_count\nA1,200,20\nB3,350,10\n")
+    assert count == 2 and not errors
+    expected = evaluate_racks({"rack_id": ["A1", "B3"], "load": [200.0, 350.0], "server_count": [20.0, 10.0]},
+                              "Immersion")
+    assert lines[0].split(",")[:2] == ["rack_id", "server_temp"]
+    assert [float(line.split(",")[5]) for line in lines[1:]] == pytest.approx(expected["annual_cost"].tolist())
+
+
+def test_immersion_rows_without_rack_id_use_row_one():
+    count, lines, errors = run_csv("server_count,load\n10,500\n")
+    assert count == 1 and not errors
+    expected = evaluate_racks({"val": [1], "server_count": [10.0], "load": [500.0]}, "Immersion")
+    assert float(lines[1].split(",")[1]) == expected["server_temp"][0]
+
+
+def test_partial_rack_ids():
+    _, lines, errors = run_csv("rack_id,load\nA5,200\n,200\n")
+    assert not errors
+    assert [line.split(",")[1] for line in lines[1:]] == ["27.5", "25.5"]
+
+
+def test_bad_rows_are_reported_and_skipped():
+    count, lines, errors = run_csv("rack_id,load\nA1,200\nB2,abc\nC3,250\n", chunk_size=2)
+    assert count == 3
+    assert errors == ["line 3: load is not a number: 'abc'"]
+    assert lines[2] == "B2,,,,,"
+    assert lines[1].split(",")[1] and lines[3].split(",")[1]
+
+
+def test_jsonl_bad_lines():
+    text = '{"load": 200}\nnot json\n\n{"rack_id": "A3", "load": "x"}\n'
+    output, errors = io.StringIO(), io.StringIO()
+    assert cli.run(io.StringIO(text), output, in_format="jsonl", out_format="jsonl", error_stream=errors) == 3
+    assert errors.getvalue().splitlines() == ["line 2: not a JSON object", "line 4: load is not a number: 'x'"]
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert rows[0]["server_temp"] == 25.5 and rows[1]["server_temp"] is None
+
+
+def test_chunk_columns_names_bad_rack():
+    with pytest.raises(ValueError, match="Rack 2: load"):
+        cli.chunk_columns([{"load": 1}, {"load": "x"}], "Air")
+
+
+def test_chunk_size_must_be_positive():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["run", "racks.csv", "--chunk-size", "0"])
+
+
+def test_main_round_trip(tmp_path, capsys):
+    source = tmp_path / "racks.csv"
+    source.write_text("rack_id,load\nA1,200\nA2,300\n")
+    target = tmp_path / "results.jsonl"
+    assert cli.main(["run", str(source), "-o", str(target), "--cooling", "air"]) == 0
+    rows = [json.loads(line) for line in target.read_text().splitlines()]
+    assert [row["rack_id"] for row in rows] == ["A1", "A2"]
+    assert rows[0]["server_temp"] == 69.9
+    assert "Evaluated 2 racks" in capsys.readouterr().err
+
+
+def test_main_reports_unreadable_lines(tmp_path, capsys):
+    source = tmp_path / "racks.csv"
+    source.write_text("rack_id,load\nA1,200\n")
+    assert cli.main(["run", str(source), "-o", str(tmp_path / "out.txt"), "--output-format", "csv",
+                     "--input-format", "jsonl"]) == 0
+    assert "not a JSON object" in capsys.readouterr().err
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from datacool.batch import evaluate_racks
+from datacool.coupling import coupled_temperatures, coupling_matrix, solve_coupling
+from datacool.layout import rack_id
+
+
+def floor(columns=4, rows=12):
+    col, row = np.divmod(np.arange(columns * rows), rows)
+    return {"col": col, "row": row, "load": np.linspace(150, 350, columns * rows)}
+
+
+def test_solution_matches_dense_solve():
+    racks = floor()
+    matrix = coupling_matrix(racks["col"], racks["row"], neighbor=0.05, aisle=0.1, loop=0.2)
+    rise = np.linspace(1, 5, len(racks["col"]))
+    x, _ = solve_coupling(matrix, rise, tolerance=1e-12)
+    dense = np.zeros((matrix.size, matrix.size))
+    np.add.at(dense, (matrix.rows, matrix.cols), matrix.weights)
+    np.testing.assert_allclose(x, np.linalg.solve(np.eye(matrix.size) - dense, rise), rtol=1e-9)
+
+
+@pytest.mark.parametrize("cooling_type", ["Immersion", "Air"])
+def test_col_row_input_matches_rack_ids(cooling_type):
+    racks = floor()
+    by_id = {"rack_id": [rack_id(c, r) for c, r in zip(racks["col"], racks["row"])], "load": racks["load"]}
+    located = coupled_temperatures(racks, cooling_type, row_term=True)
+    named = coupled_temperatures(by_id, cooling_type, row_term=True)
+    np.testing.assert_array_equal(located["server_temp"], named["server_temp"])
+    uncoupled = evaluate_racks(by_id, cooling_type, rounded=False)["server_temp"]
+    np.testing.assert_allclose(located["uncoupled_temp"], uncoupled)
+    assert np.all(located["server_temp"] >= located["uncoupled_temp"])
+
+
+@pytest.mark.parametrize("cooling_type", ["Immersion", "Air"])
+def test_structured_array_input(cooling_type):
+    racks = floor()
+    table = np.zeros(len(racks["col"]), dtype=[("col", int), ("row", int), ("load", float)])
+    for key, column in racks.items():
+        table[key] = column
+    np.testing.assert_array_equal(coupled_temperatures(table, cooling_type)["server_temp"],
+                                  coupled_temperatures(racks, cooling_type)["server_temp"])
+
+
+def test_weights_must_sum_below_one():
+    racks = floor(2, 3)
+    with pytest.raises(ValueError):
+        coupled_temperatures(racks, "Air", neighbor=0.5, aisle=0.2)
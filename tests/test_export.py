@@ -0,0 +1,34 @@
+import csv
+import json
+
+import pytest
+
+from datacool.export import detect_format, write_chunks
+
+HEADER = ["rack_id", "server_temp"]
+CHUNKS = [{"rack_id": ["A1", "A2"], "server_temp": [30.5, None]}, {"rack_id": ["A3"], "server_temp": [31.0]}]
+
+
+def test_detect_format():
+    assert [detect_format(p) for p in ("r.csv", "r.jsonl", "r.ndjson", "r.parquet", "r.pq", "r")] == \
+        ["csv", "jsonl", "jsonl", "parquet", "parquet", "csv"]
+    assert detect_format("r.csv", "jsonl") == "jsonl"
+
+
+def test_csv_and_jsonl(tmp_path):
+    assert write_chunks(iter(CHUNKS), str(tmp_path / "r.csv"), HEADER) == 3
+    with open(tmp_path / "r.csv", newline="") as f:
+        assert list(csv.reader(f)) == [HEADER, ["A1", "30.5"], ["A2", ""], ["A3", "31.0"]]
+    assert write_chunks(iter(CHUNKS), str(tmp_path / "r.jsonl"), HEADER) == 3
+    with open(tmp_path / "r.jsonl") as f:
+        assert [json.loads(line) for line in f] == [{"rack_id": "A1", "server_temp": 30.5},
+                                                   {"rack_id": "A2", "server_temp": None},
+                                                   {"rack_id": "A3", "server_temp": 31.0}]
+
+
+def test_parquet_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "r.parquet")
+    assert write_chunks(iter(CHUNKS), path, HEADER) == 3
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert pq.read_table(path).to_pydict() == {"rack_id": ["A1", "A2", "A3"], "server_temp": [30.5, None, 31.0]}
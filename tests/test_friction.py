@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from datacool.friction import colebrook, friction_factor, pressure_drop
+
+
+def test_colebrook_satisfies_equation():
+    Re = np.array([5e3, 1e5, 1e7])
+    rr = np.array([1e-6, 1e-4, 1e-2])
+    f = colebrook(Re, rr)
+    residual = 1 / np.sqrt(f) + 2 * np.log10(rr / 3.7 + 2.51 / (Re * np.sqrt(f)))
+    np.testing.assert_allclose(residual, 0, atol=1e-10)
+
+
+def test_regimes():
+    assert friction_factor(1000.0, 1e-4) == pytest.approx(0.064)
+    turbulent = float(colebrook(4000.0, 1e-4))
+    assert friction_factor(3150.0, 1e-4) == pytest.approx(0.5 * 64 / 3150 + 0.5 * float(colebrook(3150.0, 1e-4)))
+    assert friction_factor(4000.0, 1e-4) == pytest.approx(turbulent)
+    assert friction_factor(-1000.0, 1e-4) == pytest.approx(0.064)
+    assert np.isnan(friction_factor([0.0, np.nan], 1e-4)).all()
+
+
+def test_table_matches_exact():
+    Re = np.logspace(3.7, 7.5, 200)
+    rr = np.logspace(-7, -2, 200)
+    np.testing.assert_allclose(friction_factor(Re, rr, method="table"), friction_factor(Re, rr), rtol=1e-4)
+
+
+def test_pressure_drop_sign_follows_flow():
+    forward, *_ = pressure_drop(0.01, 0.05, 10.0, 1000.0, 1e-3)
+    backward, *_ = pressure_drop(-0.01, 0.05, 10.0, 1000.0, 1e-3)
+    assert forward > 0 and backward == pytest.approx(-forward)
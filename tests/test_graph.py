@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from datacool.batch import evaluate_racks
+from datacool.graph import evaluate_graph
+
+
+def random_racks(cooling_type, size=500, seed=0):
+    rng = np.random.default_rng(seed)
+    racks = {"rack_id": [f"{'ABCDEFG'[i % 7]}{i % 30 + 1}" for i in range(size)],
+             "server_count": rng.integers(1, 40, size).astype(float), "load": rng.uniform(0, 800, size)}
+    if cooling_type == "Immersion":
+        racks.update(coolant_temp=rng.uniform(10, 60, size), flow_rate=rng.uniform(0.0, 0.3, size),
+                     flow_area=rng.uniform(0.002, 0.03, size), distance=rng.uniform(0.5, 20, size),
+                     run_time=rng.uniform(0, 8760, size),
+                     fluid_type=rng.choice(["3M Novec 7000", "Mineral Oil", "Synthetic Oil", "Unknown"], size))
+        racks["flow_rate"][::50] = 0.0
+    else:
+        racks.update(ambient_temp=rng.uniform(10, 45, size), fan_airflow=rng.uniform(0.0, 1.0, size),
+                     fan_efficiency=rng.uniform(0.2, 0.9, size), dust_amount=rng.uniform(0, 1, size))
+        racks["fan_airflow"][::50] = 0.0
+    return racks
+
+
+@pytest.mark.parametrize("cooling_type", ["Immersion", "Air"])
+@pytest.mark.parametrize("rounded", [False, True])
+def test_graph_matches_batch_engine(cooling_type, rounded):
+    racks = random_racks(cooling_type)
+    expected = evaluate_racks(racks, cooling_type, rounded=rounded)
+    results = evaluate_graph(racks, cooling_type).results(rounded=rounded)
+    assert not expected["valid"].all() and expected["valid"].any()
+    for key, value in expected.items():
+        np.testing.assert_array_equal(results[key], np.broadcast_to(value, results[key].shape), err_msg=key)
+
+
+def test_row_edits_recompute_only_dependents():
+    racks = random_racks("Immersion", size=100)
+    state = evaluate_graph(racks, "Immersion")
+    state.results()
+    before = dict(state.computed)
+    flow_rate = racks["flow_rate"].copy()
+    state.set("Q", [0.1, 0.2], rows=[3, 7])
+    np.testing.assert_array_equal(racks["flow_rate"], flow_rate)
+    racks["flow_rate"][[3, 7]] = [0.1, 0.2]
+    updated = state.results(rounded=False)
+    expected = evaluate_racks(racks, "Immersion", rounded=False)
+    np.testing.assert_array_equal(updated["annual_cost"], expected["annual_cost"])
+    delta = {name: state.computed[name] - before[name] for name in before}
+    assert delta["Re"] == 2 and delta["heat_exchanger_power"] == 0
+
+    state.set("electricity_cost", 0.3)
+    before = dict(state.computed)
+    cost = state["annual_cost"]
+    assert state.computed["annual_cost"] - before["annual_cost"] == 100
+    assert state.computed["total_cooling_energy"] == before["total_cooling_energy"]
+    np.testing.assert_array_equal(
+        cost, evaluate_racks(racks, "Immersion", rounded=False, electricity_cost=0.3)["annual_cost"])
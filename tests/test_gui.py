@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt, QThreadPool  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from datacool.batch import evaluate_racks  # noqa: E402
+from datacool.gui import DataCenterSimulator, RackFloorModel  # noqa: E402
+from datacool.results import ResultTable  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window(app):
+    window = DataCenterSimulator()
+    yield window
+    window.stop_worker()
+    QThreadPool.globalInstance().waitForDone()
+    window.close()
+
+
+def settle(app):
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+
+def result(temp, valid=True):
+    return {"server_temp": temp, "pump_power": 0.0, "heat_exchanger_power": 0.0, "total_cooling_energy": 0.0,
+            "annual_cost": 0.0, "valid": valid}
+
+
+def test_floor_model_repaints_only_updated_racks(app):
+    table = ResultTable("Immersion")
+    model = RackFloorModel(12, 5)
+    model.set_metric(table, "server_temp")
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append((first.row(), first.column(),
+                                                                  last.row(), last.column())))
+
+    model.update_rows(table.update({"A1": result(25.0), "B2": result(30.0)}))
+    assert (model.low, model.high) == (25.0, 30.0)
+    assert changed == [(0, 0, 11, 4)]
+
+    changed.clear()
+    model.update_rows(table.update({"C3": result(27.0), "D4": result(float("nan"), valid=False)}))
+    assert changed == [(2, 2, 2, 2)]
+    assert model.data(model.index(2, 2), Qt.ItemDataRole.ToolTipRole) == "C3: 27.0"
+    assert model.data(model.index(3, 3), Qt.ItemDataRole.BackgroundRole) is None
+
+    changed.clear()
+    model.update_rows(table.update({"E5": result(35.0)}))
+    assert model.high == 35.0 and changed == [(0, 0, 11, 4)]
+
+    model.set_metric(table, None)
+    assert model.data(model.index(0, 0), Qt.ItemDataRole.BackgroundRole) is None
+
+
+def test_background_calculation_matches_batch_engine(app, window):
+    window.rows_spin.setValue(12)
+    window.columns_spin.setValue(2)
+    window.resize_floor()
+    ids = [f"{col}{row}" for col in "AB" for row in range(1, 13)]
+    for i, rack_id in enumerate(ids):
+        window.rack_data[rack_id] = {"load": 100.0 + 10 * i, "coolant_temp": 20.0 + i % 5}
+    window.calculate_efficiency()
+    settle(app)
+    expected = evaluate_racks(window.rack_data.columns(ids), "Immersion")
+    temps = window.result_table.metric("server_temp")
+    np.testing.assert_array_equal([temps[rack_id] for rack_id in ids], expected["server_temp"])
+
+    # Only the edited rack is dirty on the next run.
+    misses = window.result_cache.misses
+    window.rack_data["A3"] = {"load": 999.0}
+    window.dirty_racks.add("A3")
+    window.calculate_efficiency()
+    settle(app)
+    assert window.result_cache.misses == misses + 1
+    assert window.result_table.metric("server_temp")["A3"] > temps["A3"]
+
+
+def test_scaled_image_is_cached(app, window):
+    window.update_image()
+    cached = dict(window.scaled_pixmaps)
+    window.update_image()
+    assert len(cached) == 1 and window.scaled_pixmaps == cached
+
+
+def test_compute_core_does_not_import_qt():
+    code = ("import sys, datacool.cli, datacool.batch, datacool.scenario, datacool.service; "
+            "sys.exit('PyQt6' in sys.modules)")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
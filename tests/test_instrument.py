@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from datacool import instrument
+from datacool.batch import evaluate_racks
+
+
+@pytest.fixture
+def recording():
+    instrument.enable()
+    yield
+    instrument.disable()
+
+
+def test_disabled_hooks_record_nothing():
+    instrument.disable()
+    assert instrument.span("x") is instrument.span("y")
+    instrument.count("racks")
+    assert instrument.summary() == {"enabled": False, "spans": {}, "counters": {}}
+
+
+def test_spans_and_counters(recording):
+    evaluate_racks({"val": [1, 2, 3]}, "Immersion")
+    summary = instrument.summary()
+    assert summary["counters"]["racks_evaluated"] == 3
+    assert summary["spans"]["batch.evaluate"]["count"] == 1
+
+
+def test_dump_chrome_trace(recording, tmp_path):
+    with instrument.span("stage", "gui"):
+        pass
+    path = tmp_path / "run.trace.json"
+    instrument.dump(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [(e["name"], e["cat"], e["ph"]) for e in events] == [("stage", "gui", "X")]
@@ -0,0 +1,17 @@
+import pytest
+
+from datacool.layout import column_label, parse_rack_id, rack_id
+
+
+@pytest.mark.parametrize("col, label", [(0, "A"), (25, "Z"), (26, "AA"), (27, "AB"), (701, "ZZ"), (702, "AAA")])
+def test_column_labels(col, label):
+    assert column_label(col) == label
+    assert parse_rack_id(f"{label}7") == (col, 6)
+
+
+def test_round_trip_and_errors():
+    assert parse_rack_id(rack_id(30, 11)) == (30, 11)
+    assert parse_rack_id("ab12") == (27, 11)
+    for bad in ("12", "A", "A-1", ""):
+        with pytest.raises(ValueError):
+            parse_rack_id(bad)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from datacool.montecarlo import Normal, QuantileSketch, StreamingStats, Uniform, run_monte_carlo
+
+
+def test_seeded_run_is_independent_of_workers():
+    distributions = {"load": Uniform(100, 300), "fan_efficiency": Normal(0.55, 0.05, low=0.3, high=0.9)}
+    serial = run_monte_carlo(distributions, "Air", 5000, seed=7, workers=1, batch_size=1000)
+    parallel = run_monte_carlo(distributions, "Air", 5000, seed=7, workers=2, batch_size=1000)
+    for key, stats in serial.items():
+        assert parallel[key].summary() == stats.summary()
+
+
+def test_streaming_stats_match_numpy():
+    values = np.random.default_rng(0).normal(10, 2, 20000)
+    stats, other = StreamingStats(), StreamingStats()
+    stats.update(values[:7000])
+    other.update(np.append(values[7000:], np.nan))
+    stats.merge(other)
+    assert stats.count == values.size and stats.invalid == 1
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+    assert stats.quantile(0.5) == pytest.approx(np.median(values), rel=0.01)
+
+
+def test_quantile_sketch_relative_error():
+    values = np.random.default_rng(1).lognormal(0, 1, 10000)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    sketch.update(values)
+    for q in (0.05, 0.5, 0.95):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q, method="lower"), rel=0.03)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from datacool.friction import pressure_drop
+from datacool.network import PipeNetwork, rack_loop
+
+
+def test_single_pipe_meets_its_pressure_drop():
+    network = PipeNetwork()
+    inlet = network.add_nodes(1, pressure=5000.0)[0]
+    outlet = network.add_nodes(1, pressure=0.0)[0]
+    network.add_pipes(inlet, outlet, length=10.0, diameter=0.02)
+    solution = network.solve()
+    drop, *_ = pressure_drop(solution.flows[0], 0.02, 10.0, network.rho, network.mu, method="exact")
+    assert drop == pytest.approx(5000.0, rel=1e-6)
+
+
+def test_fixed_flow_pump_splits_between_branches():
+    network = PipeNetwork()
+    low = network.add_nodes(1, pressure=0.0)[0]
+    high, a, b = network.add_nodes(3)
+    pump = network.add_pump(low, high, flow=0.002, efficiency=0.5)
+    network.add_pipes(high, [a, b], length=[5.0, 20.0], diameter=0.02)
+    network.add_pipes([a, b], low, length=1.0, diameter=0.02)
+    solution = network.solve()
+    flows = solution.flows
+    assert flows[pump] == 0.002
+    assert flows[1] + flows[2] == pytest.approx(0.002, rel=1e-9)
+    assert flows[1] > flows[2] > 0
+    assert solution.pump_power == pytest.approx(0.002 * solution.pressures[high] / 0.5)
+
+
+def test_rack_loop_feeds_every_rack():
+    racks = {"rack_id": ["A1", "A2", "A3", "B1", "B2"], "flow_rate": np.full(5, 0.01)}
+    loop = rack_loop(racks)
+    solution, results = loop.solve()
+    assert results["flow"].sum() == pytest.approx(0.05, rel=1e-6)
+    assert np.all(results["flow"] > 0)
+    assert results["pump_power_share"].sum() == pytest.approx(solution.pump_power)
+
+
+def test_rack_loop_by_position():
+    by_id = rack_loop({"rack_id": ["A1", "A2", "B1"]}).solve()[1]
+    by_position = rack_loop({"col": np.array([0, 0, 1]), "row": np.array([0, 1, 0])}).solve()[1]
+    np.testing.assert_allclose(by_position["flow"], by_id["flow"])
+
+
+def test_rack_loop_needs_one_fluid():
+    racks = {"rack_id": ["A1", "A2"], "fluid_type": ["3M Novec 7000", "Mineral Oil"]}
+    with pytest.raises(ValueError, match="one fluid"):
+        rack_loop(racks)
+
+
+def test_needs_a_fixed_pressure():
+    network = PipeNetwork()
+    a, b = network.add_nodes(2)
+    network.add_pipes(a, b, 1.0, 0.02)
+    with pytest.raises(ValueError):
+        network.solve()
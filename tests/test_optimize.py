@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from datacool.batch import evaluate_racks
+from datacool.optimize import optimize_racks
+
+
+def racks(count=40):
+    rng = np.random.default_rng(2)
+    return {"val": rng.integers(1, 13, count), "load": rng.uniform(100, 400, count),
+            "coolant_temp": rng.uniform(18, 30, count)}
+
+
+def test_designs_meet_the_limit_within_bounds():
+    result = optimize_racks(racks(), "Immersion", max_server_temp=45.0, workers=1)
+    feasible = result["feasible"]
+    assert feasible.any()
+    assert np.all(result["server_temp"][feasible] <= 45.0 + 1e-6)
+    assert np.all((result["flow_rate"] >= 0.005) & (result["flow_rate"] <= 0.5))
+    check = evaluate_racks(dict(racks(), flow_rate=result["flow_rate"], flow_area=result["flow_area"]),
+                           "Immersion", rounded=False)
+    np.testing.assert_allclose(check["annual_cost"], result["annual_cost"])
+
+
+def test_chunked_parallel_matches_serial():
+    serial = optimize_racks(racks(), "Immersion", 45.0, workers=1)
+    parallel = optimize_racks(racks(), "Immersion", 45.0, workers=2, chunk_size=15)
+    for key, values in serial.items():
+        np.testing.assert_allclose(parallel[key], values)
+
+
+def test_bounds_are_checked():
+    with pytest.raises(ValueError):
+        optimize_racks(racks(), "Air", 60.0, bounds={"fan_airflow": (0.0, 1.0)})
+    with pytest.raises(ValueError):
+        optimize_racks(racks(), "Air", 60.0, variables=["load"])
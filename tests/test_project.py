@@ -0,0 +1,73 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from datacool import store as store_module
+from datacool.project import Project, load_project, save_project
+from datacool.properties import DATA_FILE, PropertyRegistry
+
+
+def make_project():
+    project = Project("Air", rows=3, columns=2)
+    immersion = project.stores["Immersion"]
+    immersion.fill({"load": 250, "fluid_type": "Mineral Oil", "insulation_type": "Foam"}, 2, 3)
+    immersion["B2"] = {"load": 400, "fluid_type": "Synthetic Oil", "insulation_type": "Aerogel"}
+    immersion["D9"] = {"load": 100, "fluid_type": "Secret Fluid"}
+    project.stores["Air"]["A1"] = {"load": 300, "ambient_temp": 30}
+    project.results["Air"].update({"A1": {"server_temp": 70.1, "fan_power": 1.0, "chiller_power": 2.0,
+                                          "total_cooling_energy": 3.0, "annual_cost": 4.0, "valid": True},
+                                   "A2": {"server_temp": np.nan, "fan_power": np.nan, "chiller_power": np.nan,
+                                          "total_cooling_energy": np.nan, "annual_cost": np.nan, "valid": False}},
+                                  errors={"A2": "bad input"})
+    return project
+
+
+@pytest.mark.parametrize("name", ["facility.dcsim", "facility.json"])
+def test_round_trip(tmp_path, name):
+    project = make_project()
+    path = tmp_path / name
+    save_project(str(path), project)
+    loaded = load_project(str(path))
+    assert (loaded.cooling_type, loaded.rows, loaded.columns) == ("Air", 3, 2)
+    before, after = project.stores["Immersion"], loaded.stores["Immersion"]
+    assert list(after) == list(before)
+    assert all(after[rack_id] == before[rack_id] for rack_id in before)
+    for key, column in before.columns().items():
+        np.testing.assert_array_equal(after.columns()[key], column)
+    results = loaded.results["Air"]
+    assert results.metric("server_temp") == {"A1": 70.1}
+    assert results.errors == {1: "bad input"}
+
+
+def test_loading_remaps_categories_onto_current_registry(tmp_path, monkeypatch):
+    path = tmp_path / "facility.dcsim"
+    save_project(str(path), make_project())
+    expected = make_project().stores["Immersion"]
+
+    with open(DATA_FILE) as f:
+        data = json.load(f)
+    # The registry has since dropped one fluid and reordered the rest.
+    data["fluids"] = {name: data["fluids"][name] for name in reversed(data["fluids"]) if name != "3M Novec 7000"}
+    data["materials"] = dict(reversed(list(data["materials"].items())))
+    registry = PropertyRegistry(data)
+    monkeypatch.setattr(store_module, "get_registry", lambda: registry)
+
+    loaded = load_project(str(path)).stores["Immersion"]
+    for rack_id in expected:
+        assert loaded[rack_id] == expected[rack_id]
+    columns = loaded.columns(["A1", "B2", "D9"])
+    fluid_names = list(registry.fluid_names) + ["<unknown>"]
+    assert [fluid_names[code] for code in columns["fluid_type"]] == ["Mineral Oil", "Synthetic Oil", "<unknown>"]
+    materials = [registry.material_names[code] for code in columns["insulation_type"][:2]]
+    assert materials == ["Foam", "Aerogel"]
+
+
+def test_result_table_export(tmp_path):
+    path = tmp_path / "results.csv"
+    assert make_project().results["Air"].export(str(path)) == 2
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["rack_id"] == "A1" and float(rows[0]["server_temp"]) == 70.1
+    assert rows[1]["server_temp"] == "" and rows[1]["error"] == "bad input"
@@ -0,0 +1,35 @@
+import math
+
+import numpy as np
+import pytest
+
+from datacool.properties import CP, RHO, encode, fluid_properties, get_registry, material_property
+
+
+def test_lookup_hits_tabulated_points():
+    registry = get_registry()
+    air = registry.codes["Air"]
+    np.testing.assert_allclose(registry.lookup(air, [0.0, 25.0, 50.0], RHO), [1.2923, 1.1839, 1.0923])
+
+
+def test_lookup_clamps_and_propagates_nan():
+    registry = get_registry()
+    air = registry.codes["Air"]
+    low, high, missing = registry.lookup(air, [-1000.0, 1000.0, np.nan], CP)
+    assert low == registry.table[air, CP, 0] and high == registry.table[air, CP, -1]
+    assert math.isnan(missing)
+
+
+def test_unknown_names_map_to_nan_row():
+    registry = get_registry()
+    codes = encode(["Air", "Unobtainium", "Air"], registry.fluid_names)
+    assert codes.tolist() == [registry.codes["Air"], len(registry.fluid_names), registry.codes["Air"]]
+    assert math.isnan(registry.lookup(codes[1], 25.0, CP))
+
+
+def test_scalar_helpers():
+    assert fluid_properties("Air", 25.0)["rho"] == pytest.approx(1.1839)
+    with pytest.raises(ValueError):
+        fluid_properties("Unobtainium", 25.0)
+    assert material_property("Standard Fiberglass", "D0") == 7.0
+    assert material_property("None", "D0") is None
@@ -0,0 +1,91 @@
+import io
+import math
+
+import numpy as np
+import pytest
+
+from datacool import cli
+from datacool.batch import evaluate_racks
+from datacool.scenario import Scenario, run_scenarios
+
+RACKS = {"val": np.arange(1, 41) % 12 + 1, "load": np.linspace(100, 400, 40), "server_count": np.full(40, 20.0)}
+HALLS = ["North"] * 25 + ["South"] * 15
+
+
+def scenarios():
+    return [Scenario("air", "Air", RACKS), Scenario("immersion", "Immersion", RACKS, capital_cost=4000.0),
+            Scenario("oil", "Immersion", RACKS, {"fluid_type": "Mineral Oil"}, capital_cost=3000.0),
+            Scenario("air-peak", "Air", RACKS, {"electricity_cost": 0.3})]
+
+
+def test_parallel_matches_serial():
+    serial = run_scenarios(scenarios(), HALLS, workers=1)
+    parallel = run_scenarios(scenarios(), HALLS, workers=2, chunk_size=7)
+    np.testing.assert_array_equal(serial.values, parallel.values)
+    np.testing.assert_array_equal(serial.valid, parallel.valid)
+    expected = evaluate_racks(RACKS, "Immersion", rounded=False, fluidType="Mineral Oil")
+    np.testing.assert_allclose(serial["oil"]["annual_cost"], expected["annual_cost"])
+
+
+def test_delta_table():
+    results = run_scenarios(scenarios(), HALLS, workers=1)
+    table = results.delta_table()
+    assert [(row["scenario"], row["hall"]) for row in table][:3] == [
+        ("immersion", "North"), ("immersion", "South"), ("immersion", "site")]
+    site = table[2]
+    air, immersion = results["air"], results["immersion"]
+    assert site["racks"] == 40 and site["invalid_racks"] == 0
+    assert site["delta_annual_cost"] == pytest.approx(immersion["annual_cost"].sum() - air["annual_cost"].sum())
+    assert site["payback_years"] == pytest.approx(40 * 4000.0 / -site["delta_annual_cost"])
+    peak = [row for row in table if row["scenario"] == "air-peak"][-1]
+    # Same racks at a higher tariff: no extra capital, but it costs more every year.
+    assert peak["delta_server_temp"] == 0 and peak["delta_annual_cost"] > 0
+    assert peak["payback_years"] == math.inf
+
+
+def test_free_saving_pays_back_at_once():
+    cheap = Scenario("air-cheap", "Air", RACKS, {"electricity_cost": 0.1})
+    row = run_scenarios([Scenario("air", "Air", RACKS), cheap], workers=1).delta_table()[0]
+    assert row["delta_annual_cost"] < 0 and row["payback_years"] == 0.0
+
+
+def test_no_comparable_racks_gives_nan():
+    broken = Scenario("broken", "Immersion", RACKS, {"flow_rate": 0.0})
+    row = run_scenarios([Scenario("air", "Air", RACKS), broken], workers=1).delta_table()[0]
+    assert row["invalid_racks"] == 40
+    assert math.isnan(row["payback_years"]) and math.isnan(row["annual_cost"])
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"foo": 1}, "Unknown immersion setting 'foo'"),
+    ({"electricity_cost": ""}, "has no value"),
+    ({"fluid_type": "Bogus"}, "Unknown fluid_type 'Bogus'"),
+])
+def test_bad_overrides(overrides, message):
+    with pytest.raises(ValueError, match=message):
+        Scenario("imm", "Immersion", RACKS, overrides)
+
+
+@pytest.mark.parametrize("spec", ["imm:water", "imm:immersion,electricity_cost", "imm:immersion,capital_cost=x"])
+def test_parse_scenario_rejects(spec):
+    with pytest.raises(ValueError):
+        cli.parse_scenario(spec)
+
+
+def test_compare_cli():
+    source = io.StringIO("rack_id,hall,load\nA1,h1,200\nA2,h1,300\nB1,h2,250\n")
+    output = io.StringIO()
+    assert cli.compare(source, output, ["air:air", "imm:immersion,capital_cost=1000"]) == 3
+    lines = output.getvalue().splitlines()
+    assert lines[0].startswith("scenario,baseline,hall,racks")
+    assert [line.split(",")[2] for line in lines[1:]] == ["h1", "h2", "site"]
+
+
+def test_compare_rejects_scenarios_without_valid_racks():
+    with pytest.raises(ValueError, match="no rack valid"):
+        cli.compare(io.StringIO("rack_id,load\nA1,200\n"), io.StringIO(), ["air:air", "imm:immersion,flow_rate=0"])
+
+
+def test_compare_reports_bad_line():
+    with pytest.raises(ValueError, match="line 3: load"):
+        cli.compare(io.StringIO("load\n200\nabc\n"), io.StringIO())
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import numpy as np
+
+from datacool.batch import evaluate_racks
+from datacool.service import SimulationService
+
+
+async def post(port, path, document, method="POST", length=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(document).encode()
+    length = len(body) if length is None else length
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {length}\r\nConnection: close\r\n\r\n".encode()
+                 + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    response = await reader.read()
+    writer.close()
+    return status, json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+def run(test):
+    async def main():
+        service = await SimulationService(port=0, workers=0, max_delay=0.01).start()
+        try:
+            return await test(service.port)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_are_batched_and_match_the_engine():
+    racks = [{"rack_id": f"A{i + 1}", "load": 100 + 10 * i} for i in range(20)]
+
+    async def test(port):
+        responses = await asyncio.gather(*(post(port, "/v1/immersion", rack) for rack in racks))
+        _, metrics = await post(port, "/v1/metrics", {}, method="GET")
+        return responses, metrics
+
+    responses, metrics = run(test)
+    expected = evaluate_racks({"rack_id": [r["rack_id"] for r in racks], "load": [r["load"] for r in racks]},
+                              "Immersion")
+    assert [status for status, _ in responses] == [200] * 20
+    np.testing.assert_array_equal([result["annual_cost"] for _, result in responses], expected["annual_cost"])
+    assert metrics["requests"] == 20 and metrics["batches"] < 20
+
+
+def test_rack_lists_and_errors():
+    async def test(port):
+        return (await post(port, "/v1/air", {"racks": [{"load": 200}, {"load": 300, "ambient_temp": 30}]}),
+                await post(port, "/v1/air", {"load": "lots"}),
+                await post(port, "/v1/nowhere", {}),
+                await post(port, "/v1/air", {}, method="GET"))
+
+    listed, bad, missing, wrong_method = run(test)
+    assert listed[0] == 200 and len(listed[1]["results"]) == 2 and listed[1]["results"][1]["valid"]
+    assert bad[0] == 400 and "error" in bad[1]
+    assert missing[0] == 404 and wrong_method[0] == 405
+
+
+def test_bad_content_length():
+    async def test(port):
+        return [await post(port, "/v1/air", {"load": 200}, length=length) for length in ("-5", "lots")]
+
+    for status, document in run(test):
+        assert status == 400 and document == {"error": "Invalid Content-Length"}
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from datacool.batch import evaluate_racks
+from datacool.store import RackStore
+
+
+def test_fill_then_override():
+    store = RackStore("Immersion")
+    store.fill({"load": 250, "fluid_type": "Mineral Oil"}, 2, 3)
+    store["B2"] = {"load": 400}
+    assert len(store) == 6
+    assert list(store) == ["A1", "A2", "A3", "B1", "B2", "B3"]
+    assert store["A1"]["load"] == 250 and store["A1"]["fluid_type"] == "Mineral Oil"
+    assert store["B2"]["load"] == 400 and store["B2"]["fluid_type"] == "3M Novec 7000"
+    assert "C1" not in store and store.get("C1") is None
+
+
+def test_smaller_fill_keeps_racks_outside():
+    store = RackStore("Air")
+    store.fill({"load": 100}, 3, 3)
+    store["A1"] = {"load": 500}
+    store["C3"] = {"load": 300}
+    store.fill({"load": 200}, 2, 2)
+    assert len(store) == 9
+    assert store["A1"]["load"] == 200
+    assert store["C3"]["load"] == 300
+    assert store["C1"]["load"] == 100
+
+
+def test_columns_match_per_rack_dicts():
+    store = RackStore("Immersion")
+    store.fill({"load": 250, "coolant_temp": 30}, 2, 13)
+    store["B13"] = {"load": 400, "fluid_type": "Unobtainium"}
+    store["D1"] = {"load": 120}
+    ids = list(store)
+    columns = store.columns()
+    assert columns["val"].tolist() == [int(rack_id[1:]) for rack_id in ids]
+    rows = {key: [store[rack_id][key] for rack_id in ids] for key in ("load", "coolant_temp", "fluid_type")}
+    rows["rack_id"] = ids
+    from_dicts = evaluate_racks(rows, "Immersion")
+    from_columns = evaluate_racks(columns, "Immersion")
+    for key, values in from_dicts.items():
+        np.testing.assert_array_equal(from_columns[key], values)
+    assert not from_columns["valid"][ids.index("B13")]
+
+
+def test_columns_in_requested_order():
+    store = RackStore("Air")
+    store["B1"] = {"load": 1}
+    store["A1"] = {"load": 2}
+    assert store.columns(["A1", "B1"])["load"].tolist() == [2, 1]
+    with pytest.raises(KeyError):
+        store.columns(["C1"])
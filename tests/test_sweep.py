@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from datacool.batch import default_arguments, evaluate_arguments
+from datacool.sweep import GridSweep, LatinHypercubeSweep, OneAtATimeSweep, elasticities, run_sweep, tornado
+
+
+def test_grid_sweep_matches_direct_evaluation():
+    sweep = GridSweep({"flow_rate": [0.02, 0.05, 0.1], "coolant_temp": [20, 30]})
+    result = run_sweep(sweep, "Immersion", workers=1, chunk_size=4)
+    arguments = default_arguments("Immersion")
+    arguments.update(Q=np.repeat([0.02, 0.05, 0.1], 2), tCoolant=np.tile([20.0, 30.0], 3))
+    expected = evaluate_arguments(arguments, "Immersion", rounded=False)
+    np.testing.assert_allclose(result.outputs["annual_cost"], expected["annual_cost"])
+    assert result.outputs["valid"].all()
+
+
+def test_parallel_sweep_matches_serial():
+    sweep = LatinHypercubeSweep({"load": (50, 500), "ambient_temp": (15, 40)}, size=2000, seed=3)
+    serial = run_sweep(sweep, "Air", workers=1, chunk_size=300)
+    parallel = run_sweep(sweep, "Air", workers=2, chunk_size=300)
+    for key, values in serial.outputs.items():
+        np.testing.assert_array_equal(parallel.outputs[key], values)
+
+
+def test_latin_hypercube_fills_every_stratum():
+    sweep = LatinHypercubeSweep({"load": (0, 100)}, size=1000, seed=1)
+    points = sweep.points(0, 1000)["load"]
+    np.testing.assert_array_equal(np.sort(np.floor(points / 0.1)), np.arange(1000))
+    np.testing.assert_array_equal(sweep.points(250, 750)["load"], points[250:750])
+
+
+def test_one_at_a_time_holds_others_at_center():
+    sweep = OneAtATimeSweep({"load": (100, 300), "flow_rate": (0.01, 0.1)}, center={"load": 200}, steps=5)
+    points = sweep.points(0, sweep.size)
+    np.testing.assert_array_equal(points["load"][:5], np.linspace(100, 300, 5))
+    assert np.all(points["load"][5:] == 200)
+    assert np.all(points["flow_rate"][:5] == pytest.approx(0.055))
+
+
+def test_elasticity_of_linear_term():
+    # Chiller power is proportional to load and dominates annual cost.
+    values = elasticities("Air", "annual_cost", parameters=["load"])
+    assert 0.9 < values["load"] <= 1.0
+
+
+def test_tornado_ranks_by_swing():
+    rows = tornado("Air", {"load": (100, 300), "fan_efficiency": (0.5, 0.6)})
+    assert [row["parameter"] for row in rows] == ["load", "fan_efficiency"]
+    assert rows[0]["swing"] > rows[1]["swing"]
+
+
+def test_immersion_model_keywords_have_base_values():
+    rows = tornado("Immersion", {"electricity_cost": (0.1, 0.2)})
+    assert rows[0]["output_high"] == pytest.approx(2 * rows[0]["output_low"])
+    assert elasticities("Immersion", parameters=["electricity_cost"])["electricity_cost"] == pytest.approx(1.0)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from datacool.layout import rack_id
+from datacool.thermal import _Level, solve_field, thermal_field
+
+
+def test_solution_matches_dense_solve():
+    rng = np.random.default_rng(0)
+    source = rng.uniform(0, 10, (37, 41))
+    sink = rng.uniform(0, 2, (37, 41))
+    u, _, residual = solve_field(source, sink, conductance=3.0, tolerance=1e-10)
+    assert residual <= 1e-10
+    wall = sink.copy()
+    wall[[0, -1], :] += 3.0
+    wall[:, [0, -1]] += 3.0
+    level = _Level(np.full((37, 40), 3.0), np.full((36, 41), 3.0), wall)
+    np.testing.assert_allclose(u.ravel(), np.linalg.solve(level.dense(), source.ravel()), rtol=1e-7, atol=1e-9)
+
+
+def test_hall_field():
+    col, row = np.divmod(np.arange(24), 8)
+    racks = {"col": col, "row": row, "load": np.full(24, 250.0)}
+    result = thermal_field(racks, "Air")
+    assert result["valid"].all()
+    room = result["temperature"][0, 0]
+    assert np.all(result["rack_temp"] > room)
+    assert result["temperature"].shape == (8 * 4 + 4, 3 * 6 + 2)
+    # Racks in the middle of a column are boxed in by neighbours and run hotter than the ends.
+    assert result["rack_temp"][4] > result["rack_temp"][0]
+
+
+def test_immersion_racks_located_by_position():
+    col, row = np.divmod(np.arange(30), 15)
+    located = thermal_field({"col": col, "row": row, "load": np.full(30, 250.0)}, "Immersion")
+    named = thermal_field({"rack_id": [rack_id(c, r) for c, r in zip(col, row)], "load": np.full(30, 250.0)},
+                          "Immersion")
+    assert located["valid"].all()
+    np.testing.assert_array_equal(located["rack_temp"], named["rack_temp"])
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from datacool.batch import AIR_CONSTANTS, evaluate_racks
+from datacool.timeseries import RATED_AMBIENT, chiller_cop, read_hourly_csv, simulate_year
+
+RACKS = {"rack_id": ["A1", "A2", "B1"], "load": [200.0, 250.0, 300.0]}
+
+
+def test_read_hourly_csv_columns(tmp_path):
+    path = tmp_path / "weather.csv"
+    path.write_text("hour,temp,price\n0,20,0.1\n1,21,0.2\n")
+    np.testing.assert_array_equal(read_hourly_csv(path), [0.1, 0.2])
+    np.testing.assert_array_equal(read_hourly_csv(path, column="temp"), [20.0, 21.0])
+    with pytest.raises(ValueError, match="no column 'humidity'"):
+        read_hourly_csv(path, column="humidity")
+
+
+def test_read_hourly_csv_column_needs_header(tmp_path):
+    path = tmp_path / "bare.csv"
+    path.write_text("0,20\n1,21\n")
+    np.testing.assert_array_equal(read_hourly_csv(path), [20.0, 21.0])
+    with pytest.raises(ValueError, match="no header row"):
+        read_hourly_csv(path, column="temp")
+
+
+def test_read_hourly_csv_skips_blank_lines_and_reports_bad_ones(tmp_path):
+    path = tmp_path / "gaps.csv"
+    path.write_text("hour,temp\n0,20\n\n1,21\n2,warm\n")
+    with pytest.raises(ValueError, match="line 5: expected a number in column 2"):
+        read_hourly_csv(path)
+    path.write_text("hour,temp\n0,20\n\n1,21\n")
+    np.testing.assert_array_equal(read_hourly_csv(path), [20.0, 21.0])
+
+
+@pytest.mark.parametrize("text", ["", "hour,temp\n", "\n\n"])
+def test_read_hourly_csv_without_data(tmp_path, text):
+    path = tmp_path / "empty.csv"
+    path.write_text(text)
+    with pytest.raises(ValueError, match="no data rows"):
+        read_hourly_csv(path)
+
+
+def test_chiller_cop_falls_with_ambient():
+    cop = chiller_cop(np.array([0.0, 15.0, RATED_AMBIENT, 35.0]))
+    assert cop[2] == pytest.approx(AIR_CONSTANTS["chiller_cop"])
+    assert np.all(np.diff(cop) < 0)
+
+
+def test_constant_year_matches_single_evaluation():
+    result = simulate_year(RACKS, "Air", ambient_temp=np.full(48, RATED_AMBIENT))
+    single = evaluate_racks(dict(RACKS, ambient_temp=RATED_AMBIENT), "Air", rounded=False)
+    np.testing.assert_allclose(result.rack_kwh, single["total_cooling_energy"] * 48, rtol=1e-9)
+
+
+def test_air_energy_depends_on_ambient():
+    cool, warm = (simulate_year(RACKS, "Air", ambient_temp=np.full(24, t)) for t in (10.0, 30.0))
+    assert cool.annual_kwh < warm.annual_kwh
+    flat = [simulate_year(RACKS, "Air", ambient_temp=np.full(24, t), cop=3.0) for t in (10.0, 30.0)]
+    assert warm.annual_kwh > flat[1].annual_kwh
+
+
+def test_immersion_rejects_ambient_inputs():
+    with pytest.raises(ValueError, match="air model only"):
+        simulate_year(RACKS, "Immersion", ambient_temp=np.full(24, 20.0))